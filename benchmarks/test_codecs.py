@@ -0,0 +1,80 @@
+import pytest
+from measurement import measures
+
+from django_measurement.codecs import BinaryCodec, CompactCodec, TextCodec
+from django_measurement.utils import get_measurement
+
+VALUES = 2000
+
+MEASURES = {
+    "distance": (measures.Distance, "mi"),
+    "speed": (measures.Speed, "mi__hr"),
+    "temperature": (measures.Temperature, "c"),
+}
+
+codecs = pytest.mark.parametrize(
+    "codec",
+    [TextCodec(), CompactCodec(), BinaryCodec()],
+    ids=lambda c: c.__class__.__name__,
+)
+measure_names = pytest.mark.parametrize("name", list(MEASURES))
+
+
+def make_values(name):
+    measure, unit = MEASURES[name]
+    return [measure(**{unit: i / 10.0}) for i in range(VALUES)]
+
+
+def split_decode(measure, s):
+    # The parsing MeasurementField used before codecs were added.
+    parts = s.split(":", 1)
+    if len(parts) != 2:
+        return None
+    value, unit = float(parts[0]), parts[1]
+    return get_measurement(measure, value=value, unit=unit)
+
+
+@pytest.mark.benchmark(group="codec-encode")
+@codecs
+@measure_names
+def test_encode(benchmark, codec, name):
+    values = make_values(name)
+
+    result = benchmark(lambda: list(codec.encode_many(values)))
+
+    assert len(result) == VALUES
+
+
+@pytest.mark.benchmark(group="codec-decode")
+@codecs
+@measure_names
+def test_decode(benchmark, codec, name):
+    measure = MEASURES[name][0]
+    payloads = list(codec.encode_many(make_values(name)))
+
+    result = benchmark(lambda: list(codec.decode_many(measure, payloads)))
+
+    assert len(result) == VALUES
+
+
+@pytest.mark.benchmark(group="codec-decode")
+@measure_names
+def test_decode_split(benchmark, name):
+    measure = MEASURES[name][0]
+    payloads = list(TextCodec().encode_many(make_values(name)))
+
+    result = benchmark(lambda: [split_decode(measure, s) for s in payloads])
+
+    assert len(result) == VALUES
+
+
+@pytest.mark.benchmark(group="codec-decode")
+@measure_names
+def test_binary_loads(benchmark, name):
+    codec = BinaryCodec()
+    measure = MEASURES[name][0]
+    data = codec.dumps(make_values(name))
+
+    result = benchmark(lambda: list(codec.loads(measure, data)))
+
+    assert len(result) == VALUES
@@ -0,0 +1,80 @@
+"""
+Exporting a measurement column as ``"value:unit"`` text, as ``dumpdata``
+does through ``value_to_string``, against a binary column file.
+"""
+
+import pytest
+from measurement import measures
+
+from django_measurement.codecs import TextCodec
+from django_measurement.columns import ColumnReader, dump_columns
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 20000
+FIELD = "measurement_distance"
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(measurement_distance=measures.Distance(m=i))
+        for i in range(ROWS)
+    )
+    return MeasurementTestModel.objects.order_by("pk")
+
+
+def dump_text(queryset, path):
+    field = MeasurementTestModel._meta.get_field(FIELD)
+    with open(path, "w") as file:
+        for obj in queryset.only(FIELD).iterator(chunk_size=2000):
+            file.write("%s\n" % field.value_to_string(obj))
+
+
+def load_text(path):
+    codec = TextCodec()
+    with open(path) as file:
+        return [codec.decode(measures.Distance, line.rstrip()).km for line in file]
+
+
+def load_column(path):
+    with ColumnReader(path) as reader:
+        return list(reader.in_unit("km"))
+
+
+@pytest.mark.benchmark(group="column-export")
+def test_export_text(benchmark, rows, tmp_path):
+    path = str(tmp_path / "distance.txt")
+
+    benchmark(dump_text, rows, path)
+
+    benchmark.extra_info["bytes"] = (tmp_path / "distance.txt").stat().st_size
+
+
+@pytest.mark.benchmark(group="column-export")
+def test_export_column(benchmark, rows, tmp_path):
+    (path,) = benchmark(dump_columns, rows, str(tmp_path), [FIELD])
+
+    benchmark.extra_info["bytes"] = (tmp_path / path).stat().st_size
+
+
+@pytest.mark.benchmark(group="column-import")
+def test_read_text(benchmark, rows, tmp_path):
+    path = str(tmp_path / "distance.txt")
+    dump_text(rows, path)
+
+    result = benchmark(load_text, path)
+
+    assert len(result) == ROWS
+
+
+@pytest.mark.benchmark(group="column-import")
+def test_read_column(benchmark, rows, tmp_path):
+    (path,) = dump_columns(rows, str(tmp_path), [FIELD])
+
+    result = benchmark(load_column, path)
+
+    assert len(result) == ROWS
@@ -0,0 +1,39 @@
+"""
+Conversions of plain numbers, including the affine Temperature units that
+python-measurement evaluates with sympy.
+"""
+
+import pytest
+from measurement import measures
+
+from django_measurement.utils import convert_many, get_measurement
+from tests.custom_measure_base import Temperature
+
+VALUES = [float(i % 200) for i in range(2000)]
+
+units = pytest.mark.parametrize(
+    "measure, unit",
+    [
+        (measures.Distance, "km"),
+        (measures.Temperature, "c"),
+        (measures.Temperature, "f"),
+        (Temperature, "c"),
+    ],
+    ids=["distance-km", "temperature-c", "temperature-f", "custom-temperature-c"],
+)
+
+
+@pytest.mark.benchmark(group="get-measurement")
+@units
+def test_get_measurement(benchmark, measure, unit):
+    result = benchmark(lambda: [get_measurement(measure, v, unit) for v in VALUES])
+
+    assert len(result) == len(VALUES)
+
+
+@pytest.mark.benchmark(group="convert-many")
+@units
+def test_convert_many(benchmark, measure, unit):
+    result = benchmark(convert_many, measure, VALUES, from_unit=unit)
+
+    assert len(result) == len(VALUES)
@@ -0,0 +1,192 @@
+"""
+Load, save and form benchmarks for every measurement field of the test model.
+
+Values of the custom ``Time`` and ``DegreePerTime`` measures cannot be built
+(``Time`` has no standard unit), so those fields are only covered by the
+rendering of empty forms.
+"""
+
+import pytest
+from django import forms
+from django.core import serializers
+from measurement import measures
+
+from tests.custom_measure_base import Temperature
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 1000
+FORM_ROWS = 100
+
+
+def magnitude(i):
+    return 1.0 + (i % 200) / 100.0
+
+
+def zero(i):
+    return 0.0
+
+
+# Field name -> (measure, unit values are created and entered in, magnitude
+# of the i-th value). Values are kept within the validators of the test
+# model; its Temperature validators are built from a positional value, which
+# python-measurement ignores, so they only admit 0 K.
+FIELDS = {
+    "measurement_distance": (measures.Distance, "mi", magnitude),
+    "measurement_distance_km": (measures.Distance, "km", magnitude),
+    "measurement_weight": (measures.Weight, "kg", magnitude),
+    "measurement_speed": (measures.Speed, "mi__hr", magnitude),
+    "measurement_temperature": (measures.Temperature, "k", zero),
+    "measurement_temperature2": (measures.Temperature, "k", zero),
+    "measurement_speed_mph": (measures.Speed, "mi__hr", magnitude),
+    "measurement_custom_temperature": (Temperature, "c", magnitude),
+    "measurement_distance_lazy": (measures.Distance, "m", magnitude),
+    "measurement_speed_lazy": (measures.Speed, "mi__hr", magnitude),
+    "measurement_distance_compact": (measures.Distance, "km", magnitude),
+    "measurement_speed_compact": (measures.Speed, "mi__hr", magnitude),
+    "measurement_distance_stored": (measures.Distance, "mi", magnitude),
+    "measurement_speed_stored": (measures.Speed, "km__hr", magnitude),
+}
+
+UNBUILDABLE_FIELDS = [
+    "measurement_custom_time",
+    "measurement_custom_degree_per_time",
+]
+
+fieldnames = pytest.mark.parametrize("fieldname", list(FIELDS))
+
+
+def make_values(fieldname, count):
+    measure, unit, magnitude = FIELDS[fieldname]
+    return [measure(**{unit: magnitude(i)}) for i in range(count)]
+
+
+def make_objects(fieldname, count=ROWS):
+    return [
+        MeasurementTestModel(**{fieldname: value})
+        for value in make_values(fieldname, count)
+    ]
+
+
+def formset_class(fieldname):
+    form_class = forms.modelform_factory(MeasurementTestModel, fields=[fieldname])
+    return forms.formset_factory(form_class, extra=0)
+
+
+@pytest.fixture
+def rows(fieldname):
+    MeasurementTestModel.objects.bulk_create(make_objects(fieldname))
+
+
+@pytest.mark.benchmark(group="bulk-create")
+@fieldnames
+def test_bulk_create(benchmark, fieldname):
+    def setup():
+        MeasurementTestModel.objects.all().delete()
+        return (make_objects(fieldname),), {}
+
+    benchmark.pedantic(MeasurementTestModel.objects.bulk_create, setup=setup, rounds=5)
+
+    assert MeasurementTestModel.objects.count() == ROWS
+
+
+@pytest.mark.benchmark(group="iteration")
+@fieldnames
+def test_iteration(benchmark, rows, fieldname):
+    queryset = MeasurementTestModel.objects.only("pk", fieldname)
+
+    result = benchmark(lambda: [getattr(obj, fieldname) for obj in queryset.all()])
+
+    assert len(result) == ROWS
+
+
+@pytest.mark.benchmark(group="serialization")
+@fieldnames
+def test_serialize(benchmark, rows, fieldname):
+    queryset = MeasurementTestModel.objects.all()
+
+    data = benchmark(serializers.serialize, "json", queryset, fields=[fieldname])
+
+    assert data.count('"%s"' % fieldname) == ROWS
+
+
+@pytest.mark.benchmark(group="deserialization")
+@fieldnames
+def test_deserialize(benchmark, rows, fieldname):
+    data = serializers.serialize(
+        "json", MeasurementTestModel.objects.all(), fields=[fieldname]
+    )
+
+    result = benchmark(lambda: list(serializers.deserialize("json", data)))
+
+    assert len(result) == ROWS
+
+
+@pytest.mark.benchmark(group="form-validation")
+@fieldnames
+def test_form_validation(benchmark, fieldname):
+    measure, unit, magnitude = FIELDS[fieldname]
+    data = {"form-TOTAL_FORMS": FORM_ROWS, "form-INITIAL_FORMS": 0}
+    for i in range(FORM_ROWS):
+        data["form-%d-%s_0" % (i, fieldname)] = str(magnitude(i))
+        data["form-%d-%s_1" % (i, fieldname)] = unit
+    formset = formset_class(fieldname)
+
+    def validate():
+        bound = formset(data)
+        return bound.is_valid(), bound.errors
+
+    is_valid, errors = benchmark(validate)
+
+    assert is_valid, errors
+
+
+@pytest.mark.benchmark(group="formset-rendering")
+@fieldnames
+def test_formset_rendering(benchmark, fieldname):
+    initial = [{fieldname: value} for value in make_values(fieldname, FORM_ROWS)]
+    formset = formset_class(fieldname)
+
+    html = benchmark(lambda: str(formset(initial=initial)))
+
+    assert html.count('name="form-%d-%s_0"' % (FORM_ROWS - 1, fieldname)) == 1
+
+
+@pytest.mark.benchmark(group="formset-rendering")
+@pytest.mark.parametrize("fieldname", UNBUILDABLE_FIELDS)
+def test_empty_formset_rendering(benchmark, fieldname):
+    formset = forms.formset_factory(
+        forms.modelform_factory(MeasurementTestModel, fields=[fieldname]),
+        extra=FORM_ROWS,
+    )
+
+    html = benchmark(lambda: str(formset()))
+
+    assert html.count('name="form-%d-%s_0"' % (FORM_ROWS - 1, fieldname)) == 1
+
+
+@pytest.mark.benchmark(group="from-db-value")
+@fieldnames
+def test_from_db_value(benchmark, fieldname):
+    field = MeasurementTestModel._meta.get_field(fieldname)
+    column = [field.get_prep_value(value) for value in make_values(fieldname, ROWS)]
+    from_db_value = field.from_db_value
+
+    result = benchmark(lambda: [from_db_value(value, None, None) for value in column])
+
+    assert len(result) == ROWS
+
+
+@pytest.mark.benchmark(group="get-prep-value")
+@fieldnames
+def test_get_prep_value(benchmark, fieldname):
+    field = MeasurementTestModel._meta.get_field(fieldname)
+    values = make_values(fieldname, ROWS)
+    get_prep_value = field.get_prep_value
+
+    result = benchmark(lambda: [get_prep_value(value) for value in values])
+
+    assert len(result) == ROWS
@@ -0,0 +1,69 @@
+import pytest
+from django import forms
+from measurement import measures
+
+from django_measurement.forms import MeasurementField
+
+ROWS = 1000
+
+
+class DistanceForm(forms.Form):
+    distance = MeasurementField(
+        measures.Distance, unit_choices=(("km", "km"), ("mi", "mi"))
+    )
+    weight = MeasurementField(
+        measures.Weight, unit_choices=(("kg", "kg"), ("lb", "lb"))
+    )
+
+
+DistanceFormSet = forms.formset_factory(DistanceForm, extra=0)
+
+
+@pytest.fixture
+def initial():
+    return [
+        {"distance": measures.Distance(km=i), "weight": measures.Weight(kg=i)}
+        for i in range(ROWS)
+    ]
+
+
+@pytest.mark.benchmark(group="formset-rendering")
+def test_render_formset(benchmark, initial):
+    html = benchmark(lambda: str(DistanceFormSet(initial=initial)))
+
+    assert html.count('name="form-999-distance_0"') == 1
+
+
+@pytest.mark.benchmark(group="formset-rendering")
+def test_render_formset_decompress_many(benchmark, initial):
+    form = DistanceForm()
+    widgets = {name: field.widget for name, field in form.fields.items()}
+
+    def render():
+        columns = {
+            name: widget.decompress_many([row[name] for row in initial])
+            for name, widget in widgets.items()
+        }
+        rows = [
+            {name: columns[name][index] for name in widgets}
+            for index in range(len(initial))
+        ]
+        return str(DistanceFormSet(initial=rows))
+
+    html = benchmark(render)
+
+    assert html.count('name="form-999-distance_0"') == 1
+
+
+@pytest.mark.benchmark(group="decompress")
+@pytest.mark.parametrize("batch", [False, True], ids=["decompress", "decompress_many"])
+def test_decompress(benchmark, initial, batch):
+    widget = DistanceForm().fields["distance"].widget
+    values = [row["distance"] for row in initial]
+
+    if batch:
+        result = benchmark(widget.decompress_many, values)
+    else:
+        result = benchmark(lambda: [widget.decompress(value) for value in values])
+
+    assert len(result) == ROWS
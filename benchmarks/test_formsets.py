@@ -0,0 +1,82 @@
+"""Validation of a large bulk-edit formset of measurement fields."""
+
+import pytest
+from django import forms
+from measurement import measures
+
+from django_measurement.forms import BaseMeasurementFormSet, MeasurementField
+
+ROWS = 5000
+UNITS = ("km", "mi", "m")
+
+
+class ReadingForm(forms.Form):
+    distance = MeasurementField(
+        measures.Distance,
+        min_value=measures.Distance(m=0),
+        max_value=measures.Distance(km=100),
+        unit_choices=[(unit, unit) for unit in UNITS],
+    )
+    temperature = MeasurementField(
+        measures.Temperature,
+        unit_choices=(("c", "°C"), ("f", "°F")),
+        required=False,
+    )
+
+
+def formset_data():
+    data = {"form-TOTAL_FORMS": ROWS, "form-INITIAL_FORMS": 0}
+    for i in range(ROWS):
+        data["form-%d-distance_0" % i] = str(1 + i % 50)
+        data["form-%d-distance_1" % i] = UNITS[i % 3]
+        data["form-%d-temperature_0" % i] = str(i % 40)
+        data["form-%d-temperature_1" % i] = "c"
+    return data
+
+
+class LazyMeasurementFormSet(BaseMeasurementFormSet):
+    lazy_measurements = True
+
+
+FORMSETS = pytest.mark.parametrize(
+    "formset",
+    [forms.BaseFormSet, BaseMeasurementFormSet, LazyMeasurementFormSet],
+    ids=["per-row", "batched", "batched-lazy"],
+)
+
+
+def bound_formset(formset):
+    formset_class = forms.formset_factory(
+        ReadingForm, formset=formset, max_num=ROWS, absolute_max=ROWS
+    )
+    return formset_class(formset_data())
+
+
+@pytest.mark.benchmark(group="formset-validation")
+@FORMSETS
+def test_formset_validation(benchmark, formset):
+    """Validate forms that are already built."""
+
+    def setup():
+        bound = bound_formset(formset)
+        bound.forms
+        return (bound,), {}
+
+    def validate(bound):
+        return bound.is_valid(), bound.errors
+
+    is_valid, errors = benchmark.pedantic(validate, setup=setup, rounds=5)
+
+    assert is_valid, [error for error in errors if error][:1]
+
+
+@pytest.mark.benchmark(group="formset-construction-and-validation")
+@FORMSETS
+def test_formset(benchmark, formset):
+    def validate():
+        bound = bound_formset(formset)
+        return bound.is_valid(), bound.errors
+
+    is_valid, errors = benchmark.pedantic(validate, rounds=3)
+
+    assert is_valid, [error for error in errors if error][:1]
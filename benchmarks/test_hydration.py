@@ -0,0 +1,41 @@
+import pytest
+from measurement import measures
+
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 2000
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(
+            measurement_distance=measures.Distance(m=i),
+            measurement_distance_lazy=measures.Distance(m=i),
+            measurement_speed_mph=measures.Speed(mph=i),
+            measurement_speed_lazy=measures.Speed(mph=i),
+        )
+        for i in range(ROWS)
+    )
+
+
+@pytest.mark.benchmark(group="hydration")
+@pytest.mark.parametrize(
+    "fieldname",
+    [
+        "measurement_distance",
+        "measurement_distance_lazy",
+        "measurement_speed_mph",
+        "measurement_speed_lazy",
+    ],
+)
+def test_queryset_hydration(benchmark, rows, fieldname):
+    queryset = MeasurementTestModel.objects.only("pk", fieldname)
+
+    result = benchmark(lambda: list(queryset.all()))
+
+    assert len(result) == ROWS
@@ -0,0 +1,77 @@
+import tracemalloc
+
+import pytest
+from measurement import measures
+
+from django_measurement.importers import bulk_import
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def rows(count):
+    for i in range(count):
+        yield {
+            "measurement_distance": ("%s" % i, "mi"),
+            "measurement_speed_mph": "%s" % i,
+            "measurement_weight": ("%s" % i, "lb"),
+        }
+
+
+def clear():
+    MeasurementTestModel.objects.all().delete()
+
+
+def import_measures(count):
+    # What an import looks like without the importer.
+    MeasurementTestModel.objects.bulk_create(
+        (
+            MeasurementTestModel(
+                measurement_distance=measures.Distance(mi=float(row[0][0])),
+                measurement_speed_mph=measures.Speed(mph=float(row[1])),
+                measurement_weight=measures.Weight(lb=float(row[2][0])),
+            )
+            for row in (
+                (
+                    row["measurement_distance"],
+                    row["measurement_speed_mph"],
+                    row["measurement_weight"],
+                )
+                for row in rows(count)
+            )
+        ),
+        batch_size=1000,
+    )
+
+
+@pytest.mark.benchmark(group="import")
+@pytest.mark.parametrize("importer", ["bulk_import", "measures"])
+def test_import(benchmark, importer):
+    def run():
+        if importer == "bulk_import":
+            bulk_import(MeasurementTestModel, rows(10000))
+        else:
+            import_measures(10000)
+
+    benchmark.pedantic(run, setup=clear, rounds=3)
+
+    assert MeasurementTestModel.objects.count() == 10000
+
+
+@pytest.mark.benchmark(group="import-memory")
+@pytest.mark.parametrize("count", [10000, 50000])
+def test_import_peak_memory(benchmark, count):
+    def run():
+        tracemalloc.start()
+        try:
+            bulk_import(MeasurementTestModel, rows(count), batch_size=1000)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peak = benchmark.pedantic(run, setup=clear, rounds=1)
+
+    benchmark.extra_info["peak_bytes"] = peak
+    assert MeasurementTestModel.objects.count() == count
@@ -0,0 +1,25 @@
+"""
+Import times of the app, measured with ``python -X importtime`` in a new
+interpreter per round. The benchmark time includes the interpreter start;
+the cumulative import time of the module itself is kept in ``extra_info``.
+"""
+import pytest
+
+from tests.importtime import import_times
+
+
+@pytest.mark.benchmark(group="import-time")
+@pytest.mark.parametrize(
+    "module",
+    [
+        "django_measurement.models",
+        "django_measurement.querysets",
+        "django_measurement.forms",
+        "measurement.measures",
+    ],
+)
+def test_import_time(benchmark, module):
+    times = benchmark.pedantic(import_times, args=(module,), rounds=5)
+
+    benchmark.extra_info["import_us"] = times[module]
+    assert module in times
@@ -0,0 +1,33 @@
+import pytest
+from measurement import measures
+
+from django_measurement import instrumentation
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 2000
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(measurement_distance=measures.Distance(m=i))
+        for i in range(ROWS)
+    )
+
+
+@pytest.mark.benchmark(group="instrumentation")
+@pytest.mark.parametrize("enabled", [False, True], ids=["disabled", "enabled"])
+def test_iteration(benchmark, rows, enabled):
+    queryset = MeasurementTestModel.objects.only("pk", "measurement_distance")
+    if enabled:
+        instrumentation.enable()
+    try:
+        result = benchmark(lambda: [obj.measurement_distance for obj in queryset.all()])
+    finally:
+        instrumentation.disable()
+
+    assert len(result) == ROWS
@@ -0,0 +1,87 @@
+import tracemalloc
+
+import pytest
+from measurement import measures
+
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 5000
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(
+            measurement_speed_mph=measures.Speed(mph=i),
+            measurement_speed_lazy=measures.Speed(mph=i),
+            measurement_speed_compact=measures.Speed(mph=i),
+        )
+        for i in range(ROWS)
+    )
+
+
+@pytest.mark.benchmark(group="memory")
+@pytest.mark.parametrize(
+    "fieldname",
+    [
+        "measurement_speed_mph",
+        "measurement_speed_lazy",
+        "measurement_speed_compact",
+    ],
+)
+def test_loaded_values_memory(benchmark, rows, fieldname):
+    values = MeasurementTestModel.objects.values_list(fieldname, flat=True)
+
+    def load():
+        tracemalloc.start()
+        try:
+            result = list(values.all())
+            size, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, size, peak
+
+    result, size, peak = benchmark.pedantic(load, rounds=3)
+
+    benchmark.extra_info["bytes_per_row"] = size / ROWS
+    benchmark.extra_info["peak_bytes"] = peak
+    assert len(result) == ROWS
+
+
+@pytest.fixture
+def low_cardinality_rows():
+    # Telemetry-like columns that only hold a few distinct values.
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(
+            measurement_distance_km=measures.Distance(km=i % 10),
+            measurement_distance_interned=measures.Distance(km=i % 10),
+        )
+        for i in range(ROWS)
+    )
+
+
+@pytest.mark.benchmark(group="memory-low-cardinality")
+@pytest.mark.parametrize(
+    "fieldname", ["measurement_distance_km", "measurement_distance_interned"]
+)
+def test_low_cardinality_memory(benchmark, low_cardinality_rows, fieldname):
+    values = MeasurementTestModel.objects.values_list(fieldname, flat=True)
+
+    def load():
+        tracemalloc.start()
+        try:
+            result = list(values.all())
+            size, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        return result, size, peak
+
+    result, size, peak = benchmark.pedantic(load, rounds=3)
+
+    benchmark.extra_info["bytes_per_row"] = size / ROWS
+    benchmark.extra_info["peak_bytes"] = peak
+    assert len(result) == ROWS
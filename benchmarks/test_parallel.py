@@ -0,0 +1,55 @@
+"""
+Scaling of :func:`convert_parallel` with the number of worker processes,
+against :func:`convert_many` in the current process.
+
+NumPy makes linear conversions memory bound, so the pure Python conversion
+is benchmarked as well; it is the one that scales with cores.
+"""
+
+import os
+from array import array
+
+import pytest
+from measurement import measures
+
+from django_measurement import utils
+from django_measurement.parallel import convert_parallel
+from django_measurement.utils import convert_many
+
+VALUES = array("d", (float(i % 1000) for i in range(2000000)))
+WORKERS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+implementations = pytest.mark.parametrize(
+    "numpy", [True, False], ids=["numpy", "python"], indirect=True
+)
+
+
+@pytest.fixture
+def numpy(request, monkeypatch):
+    if not request.param:
+        monkeypatch.setattr(utils, "np", None)
+    return request.param
+
+
+@pytest.mark.benchmark(group="parallel-conversion")
+@implementations
+def test_convert_many(benchmark, numpy):
+    result = benchmark.pedantic(
+        convert_many, args=(measures.Distance, VALUES, "km", "mi"), rounds=3
+    )
+
+    assert len(result) == len(VALUES)
+
+
+@pytest.mark.benchmark(group="parallel-conversion")
+@pytest.mark.parametrize("workers", WORKERS)
+@implementations
+def test_convert_parallel(benchmark, numpy, workers):
+    result = benchmark.pedantic(
+        convert_parallel,
+        args=(measures.Distance, VALUES, "km", "mi"),
+        kwargs={"workers": workers},
+        rounds=3,
+    )
+
+    assert len(result) == len(VALUES)
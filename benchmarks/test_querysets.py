@@ -0,0 +1,86 @@
+import pytest
+from asgiref.sync import async_to_sync
+from measurement import measures
+
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+ROWS = 20000
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(
+            measurement_distance=measures.Distance(m=i),
+            measurement_speed_mph=measures.Speed(mph=i),
+        )
+        for i in range(ROWS)
+    )
+
+
+def iterate_objects(queryset):
+    return [
+        (obj.measurement_distance.km, obj.measurement_speed_mph.kph)
+        for obj in queryset.only(
+            "measurement_distance", "measurement_speed_mph"
+        ).iterator(chunk_size=2000)
+    ]
+
+
+def iterate_values_list(queryset):
+    return [
+        (distance.km, speed.kph)
+        for distance, speed in queryset.values_list(
+            "measurement_distance", "measurement_speed_mph"
+        ).iterator(chunk_size=2000)
+    ]
+
+
+def iterate_as_units(queryset):
+    return list(
+        queryset.as_units(
+            measurement_distance="km", measurement_speed_mph="kph", chunk_size=2000
+        )
+    )
+
+
+def iterate_raw_measurements(queryset):
+    return list(
+        queryset.raw_measurements(
+            "measurement_distance", "measurement_speed_mph", chunk_size=2000
+        )
+    )
+
+
+def iterate_aas_units(queryset):
+    async def collect():
+        return [
+            row
+            async for row in queryset.aas_units(
+                measurement_distance="km", measurement_speed_mph="kph", chunk_size=2000
+            )
+        ]
+
+    return async_to_sync(collect)()
+
+
+@pytest.mark.benchmark(group="iteration")
+@pytest.mark.parametrize(
+    "iterate",
+    [
+        iterate_objects,
+        iterate_values_list,
+        iterate_as_units,
+        iterate_aas_units,
+        iterate_raw_measurements,
+    ],
+    ids=lambda f: f.__name__,
+)
+def test_iteration(benchmark, rows, iterate):
+    result = benchmark(iterate, MeasurementTestModel.objects.all())
+
+    assert len(result) == ROWS
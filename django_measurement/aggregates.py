@@ -0,0 +1,80 @@
+from django.core.exceptions import FieldError
+from django.db.models import aggregates
+
+from django_measurement.utils import get_measurement
+
+__all__ = (
+    "Avg",
+    "Max",
+    "Min",
+    "StdDev",
+    "Sum",
+)
+
+
+class MeasurementAggregateMixin:
+    """
+    Aggregate over a ``MeasurementField`` that returns a measure.
+
+    The reduction runs in the database on the stored standard values; the
+    result is returned in the field's default unit, or in ``unit`` if given.
+    """
+
+    def __init__(self, expression, unit=None, **extra):
+        super(MeasurementAggregateMixin, self).__init__(expression, **extra)
+        self.unit = unit
+
+    def _resolve_output_field(self):
+        source_field = self.get_source_fields()[0]
+        if getattr(source_field, "measurement", None) is None:
+            raise FieldError(
+                "%s requires a MeasurementField, got %s."
+                % (self.name, type(source_field).__name__)
+            )
+        return source_field
+
+    def get_db_converters(self, connection):
+        if self.unit is not None:
+            return [self.convert_to_unit]
+        # Skip the cast to the field's internal type: the average of a
+        # fixed-point column is not an integer.
+        return [self.convert_to_float] + self.output_field.get_db_converters(connection)
+
+    def convert_to_float(self, value, expression, connection):
+        if value is None:
+            return None
+        return float(value)
+
+    def convert_to_unit(self, value, expression, connection):
+        if value is None:
+            return None
+        return get_measurement(
+            measure=self.output_field.measurement,
+            value=float(value) / self.output_field.storage_scale,
+            original_unit=self.unit,
+        )
+
+
+class Avg(MeasurementAggregateMixin, aggregates.Avg):
+    pass
+
+
+class Max(MeasurementAggregateMixin, aggregates.Max):
+    pass
+
+
+class Min(MeasurementAggregateMixin, aggregates.Min):
+    pass
+
+
+class StdDev(MeasurementAggregateMixin, aggregates.StdDev):
+    """
+    Standard deviation as a measure.
+
+    The result is a spread, so it is only meaningful for measures whose units
+    do not have an offset (unlike e.g. ``Temperature`` in Celsius).
+    """
+
+
+class Sum(MeasurementAggregateMixin, aggregates.Sum):
+    pass
@@ -0,0 +1,28 @@
+from django.apps import AppConfig, apps
+
+
+class DjangoMeasurementConfig(AppConfig):
+    name = "django_measurement"
+    verbose_name = "Django Measurement"
+
+    def ready(self):
+        from django_measurement import instrumentation
+        from django_measurement.conf import settings
+        from django_measurement.models import MeasurementField
+
+        if settings.MEASUREMENT_INSTRUMENTATION:
+            instrumentation.enable()
+
+        # Warm the unit choices cache for every measurement field, so the
+        # first form rendered per process does not pay for it. Measures given
+        # by name and the forms module are left to be imported on first use.
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if (
+                    isinstance(field, MeasurementField)
+                    and not field.unit_choices
+                    and "measurement" in field.__dict__
+                ):
+                    from django_measurement.forms import get_unit_choices
+
+                    get_unit_choices(field.measurement)
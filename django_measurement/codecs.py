@@ -0,0 +1,175 @@
+"""
+Codecs turning measures into plain payloads and back.
+
+:class:`TextCodec` is the ``"<value>:<unit>"`` format used by
+:meth:`.MeasurementField.value_to_string`. :class:`CompactCodec` encodes a
+measure as a ``(standard value, unit id)`` pair that msgpack, JSON or pickle
+can store as is, and :class:`BinaryCodec` packs the same pair into 10 bytes.
+Unit ids index the sorted units of the measure class (see :func:`unit_table`),
+not the per process ids of :func:`django_measurement.utils.intern_unit`. They
+shift when python-measurement adds or removes units, so compact and binary
+payloads must be decoded with the python-measurement version that encoded
+them; use :class:`TextCodec` for payloads that outlive an upgrade.
+"""
+import math
+import struct
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from django_measurement import utils
+from django_measurement.conf import settings
+from django_measurement.utils import unit_table
+
+__all__ = (
+    "Codec",
+    "TextCodec",
+    "CompactCodec",
+    "BinaryCodec",
+    "get_codec",
+    "unit_table",
+)
+
+
+class Codec:
+    """
+    Base class of all codecs.
+
+    Subclasses implement :meth:`encode` and :meth:`decode`; the ``*_many``
+    methods are generators, so any iterable can be streamed through them.
+    """
+
+    def encode(self, value):
+        raise NotImplementedError
+
+    def decode(self, measure, payload):
+        raise NotImplementedError
+
+    def encode_many(self, values):
+        encode = self.encode
+        for value in values:
+            yield None if value is None else encode(value)
+
+    def decode_many(self, measure, payloads):
+        decode = self.decode
+        for payload in payloads:
+            yield None if payload is None else decode(measure, payload)
+
+
+class TextCodec(Codec):
+    """
+    Encode measures as ``"<value>:<unit>"`` strings.
+
+    Units are resolved once per measure class and spelling, so aliases like
+    ``mile`` cost a single dictionary lookup after their first use.
+    """
+
+    separator = ":"
+
+    def __init__(self):
+        self._units = {}
+
+    def encode(self, value):
+        return "%s%s%s" % (value.value, self.separator, value.unit)
+
+    def get_conversion(self, measure, unit):
+        try:
+            return self._units[measure, unit]
+        except KeyError:
+            conversion = utils.get_conversion(measure, unit)
+            self._units[measure, unit] = conversion
+            return conversion
+
+    def decode(self, measure, payload):
+        """
+        Return the measure ``payload`` stands for.
+
+        Returns ``None`` if ``payload`` has no unit.
+        """
+        value, separator, unit = payload.partition(self.separator)
+        if not separator:
+            return None
+        value = float(value)
+        conversion = self.get_conversion(measure, unit)
+        if conversion.is_linear:
+            return utils._fast_measurement(conversion, conversion, value)
+        return utils.get_measurement(measure, value, conversion.unit)
+
+
+class CompactCodec(Codec):
+    """Encode measures as ``(standard value, unit id)`` pairs."""
+
+    def encode(self, value):
+        measure = value.__class__
+        unit = utils.get_conversion(measure, value.unit).unit
+        return float(value.standard), utils.get_unit_ids(measure)[unit]
+
+    def decode(self, measure, payload):
+        standard, unit_id = payload
+        return utils.get_measurement(
+            measure, standard, original_unit=unit_table(measure)[unit_id]
+        )
+
+
+class BinaryCodec(CompactCodec):
+    """
+    Pack measures into 10 bytes.
+
+    A record is a little-endian double holding the standard value and an
+    unsigned short holding the unit id. :meth:`dumps` writes ``None`` as NaN
+    with the unit id :attr:`null_unit_id`, which :meth:`loads` reads back as
+    ``None``.
+    """
+
+    record = struct.Struct("<dH")
+    null_unit_id = 0xFFFF
+
+    def encode(self, value):
+        return self.record.pack(*super(BinaryCodec, self).encode(value))
+
+    def decode(self, measure, payload):
+        return super(BinaryCodec, self).decode(measure, self.record.unpack(payload))
+
+    def dumps(self, values):
+        """Pack an iterable of measures or ``None`` into one bytes object."""
+        null = self.record.pack(math.nan, self.null_unit_id)
+        return b"".join(
+            null if payload is None else payload for payload in self.encode_many(values)
+        )
+
+    def loads(self, measure, data):
+        """Unpack the measures of a bytes-like object made by :meth:`dumps`."""
+        decode = super(BinaryCodec, self).decode
+        null_unit_id = self.null_unit_id
+        for payload in self.record.iter_unpack(data):
+            if payload[1] == null_unit_id:
+                yield None
+            else:
+                yield decode(measure, payload)
+
+
+@lru_cache(maxsize=None)
+def _load_codec(path):
+    return import_string(path)()
+
+
+def get_codec(codec=None):
+    """
+    Return a codec instance.
+
+    ``codec`` may be a codec, a dotted path to a codec class or ``None`` for
+    the ``MEASUREMENT_CODEC`` setting. Codecs loaded by path are shared.
+    """
+    if codec is None:
+        codec = settings.MEASUREMENT_CODEC
+    if isinstance(codec, str):
+        return _load_codec(codec)
+    return codec
+
+
+@receiver(setting_changed)
+def _reset_codecs(setting, **kwargs):
+    if setting == "MEASUREMENT_CODEC":
+        _load_codec.cache_clear()
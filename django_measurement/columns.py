@@ -0,0 +1,309 @@
+"""
+Columnar binary files of measurement values.
+
+A column file holds the values of one measurement field as little-endian
+float64 in the standard unit of its measure, after a small header::
+
+    magic (8 bytes) | version (uint16) | metadata length (uint16) | rows (uint64)
+    metadata: JSON with the measure class path, unit and field name
+    values: rows * float64, starting at a multiple of 8 bytes
+
+``NULL`` is stored as NaN. :class:`ColumnWriter` writes a column in chunks
+and :class:`ColumnReader` memory-maps it, so neither holds more than a chunk
+of values in memory. The ``dumpcolumns`` and ``loadcolumns`` management
+commands export and import model columns in this format.
+"""
+
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from contextlib import ExitStack
+from itertools import islice
+
+from django.apps import apps
+from django.utils.module_loading import import_string
+
+from django_measurement import utils
+from django_measurement.importers import BulkImporter
+from django_measurement.models import MeasurementField
+
+__all__ = (
+    "ColumnWriter",
+    "ColumnReader",
+    "ConvertedColumn",
+    "dump_columns",
+    "load_columns",
+)
+
+MAGIC = b"DMCOLUMN"
+VERSION = 1
+HEADER = struct.Struct("<8sHHQ")
+
+
+def _measure_path(measure):
+    return "%s.%s" % (measure.__module__, measure.__qualname__)
+
+
+def _little_endian(values):
+    if sys.byteorder != "little":  # pragma: no cover
+        values.byteswap()
+    return values
+
+
+class ColumnWriter:
+    """
+    Write a column file to the binary file object ``file``.
+
+    Values are given in the standard unit of ``measure``; ``None`` is written
+    as NaN. ``field`` and ``model`` (a model label) are recorded in the
+    header for :func:`load_columns`. The row count in the header is filled in
+    by :meth:`close`, so ``file`` must be seekable. Also a context manager.
+    """
+
+    def __init__(self, file, measure, field=None, model=None):
+        self.file = file
+        self.measure = measure
+        self.count = 0
+        metadata = json.dumps(
+            {
+                "measure": _measure_path(measure),
+                "unit": utils.get_measure_info(measure).standard_unit,
+                "field": field,
+                "model": model,
+            }
+        ).encode()
+        # Pad the metadata so that the values are aligned for memory maps.
+        padding = -(HEADER.size + len(metadata)) % 8
+        self.metadata = metadata + b" " * padding
+        self._start = file.tell()
+        file.write(HEADER.pack(MAGIC, VERSION, len(self.metadata), 0))
+        file.write(self.metadata)
+
+    def write(self, values):
+        """Append an iterable of standard values."""
+        chunk = array("d", (math.nan if value is None else value for value in values))
+        self.file.write(_little_endian(chunk).tobytes())
+        self.count += len(chunk)
+
+    def write_measures(self, values):
+        """Append an iterable of measures or ``None``."""
+        self.write(None if value is None else value.standard for value in values)
+
+    def close(self):
+        end = self.file.tell()
+        self.file.seek(self._start)
+        self.file.write(HEADER.pack(MAGIC, VERSION, len(self.metadata), self.count))
+        self.file.seek(end)
+        self.file.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ColumnReader:
+    """
+    Memory-map the column file at ``path``.
+
+    :attr:`values` is a zero-copy ``memoryview`` of the standard values and
+    :meth:`numpy` a zero-copy NumPy array of them. :meth:`in_unit` converts
+    lazily. Views must be released before :meth:`close`. Also a context
+    manager.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, length, count = HEADER.unpack_from(self._mmap)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError("%s is not a measurement column file." % path)
+            metadata = json.loads(self._mmap[HEADER.size : HEADER.size + length])
+        except (struct.error, ValueError):
+            self._mmap.close()
+            raise
+        self.count = count
+        self.unit = metadata["unit"]
+        self.field = metadata.get("field")
+        self.model = metadata.get("model")
+        self.measure = import_string(metadata["measure"])
+        self.offset = HEADER.size + length
+        self._view = memoryview(self._mmap)
+        data = self._view[self.offset : self.offset + count * 8]
+        if sys.byteorder == "little":
+            self.values = data.cast("d")
+        else:  # pragma: no cover
+            self.values = memoryview(_little_endian(array("d", data.tobytes())))
+
+    def __len__(self):
+        return self.count
+
+    def numpy(self):
+        """Return the standard values as a read-only NumPy array."""
+        np = utils._numpy()
+        if np is None:  # pragma: no cover
+            raise ImportError("NumPy is not installed.")
+        return np.frombuffer(
+            self._mmap, dtype="<f8", count=self.count, offset=self.offset
+        )
+
+    def chunks(self, chunk_size=10000):
+        """Yield the standard values as ``memoryview`` slices."""
+        for start in range(0, self.count, chunk_size):
+            yield self.values[start : start + chunk_size]
+
+    def in_unit(self, unit, chunk_size=10000):
+        """Return a :class:`ConvertedColumn` of the values in ``unit``."""
+        return ConvertedColumn(self, unit, chunk_size)
+
+    def close(self):
+        self.values.release()
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class ConvertedColumn:
+    """
+    Values of a :class:`ColumnReader` in another unit.
+
+    Nothing is converted up front: indexing converts one value, slicing and
+    iterating convert chunks with :func:`django_measurement.utils.convert_many`.
+    NaN stays NaN.
+    """
+
+    def __init__(self, reader, unit, chunk_size=10000):
+        self.reader = reader
+        self.unit = unit
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return len(self.reader)
+
+    def _convert(self, values):
+        return utils.convert_many(self.reader.measure, values, to_unit=self.unit)
+
+    def __getitem__(self, index):
+        values = self.reader.values[index]
+        if isinstance(index, slice):
+            return self._convert(values)
+        return self._convert((values,))[0]
+
+    def __iter__(self):
+        for chunk in self.reader.chunks(self.chunk_size):
+            yield from self._convert(chunk)
+
+    def chunks(self):
+        """Yield ``array('d')`` chunks of converted values."""
+        for chunk in self.reader.chunks(self.chunk_size):
+            yield self._convert(chunk)
+
+
+def column_filename(model, field):
+    """Return the file name :func:`dump_columns` uses for ``field``."""
+    return "%s.%s.col" % (model._meta.label_lower, field)
+
+
+def dump_columns(queryset, directory, fields=None, chunk_size=2000):
+    """
+    Write the measurement columns of ``queryset`` to ``directory``.
+
+    ``fields`` are field names and default to all measurement fields. Rows
+    are fetched ``chunk_size`` at a time. Returns the written paths.
+    """
+    model = queryset.model
+    if fields is None:
+        fields = [
+            field
+            for field in model._meta.concrete_fields
+            if isinstance(field, MeasurementField)
+        ]
+    else:
+        fields = [model._meta.get_field(name) for name in fields]
+    for field in fields:
+        if not isinstance(field, MeasurementField):
+            raise ValueError("%s is not a measurement field." % field.name)
+
+    paths = [os.path.join(directory, column_filename(model, f.name)) for f in fields]
+    with ExitStack() as stack:
+        writers = []
+        for path, field in zip(paths, fields):
+            file = stack.enter_context(open(path, "wb"))
+            writers.append(
+                stack.enter_context(
+                    ColumnWriter(
+                        file,
+                        field.measurement,
+                        field=field.name,
+                        model=model._meta.label,
+                    )
+                )
+            )
+
+        rows = queryset.values_list(
+            *[field.get_standard_expression() for field in fields]
+        ).iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            for writer, column in zip(writers, zip(*chunk)):
+                writer.write(column)
+    return paths
+
+
+def load_columns(paths, model=None, batch_size=1000, using=None):
+    """
+    Create a model instance for every row of the column files at ``paths``.
+
+    Every file fills the field recorded in its header; all files must have
+    the same number of rows. ``model`` defaults to the model recorded in the
+    headers. Rows are saved ``batch_size`` at a time. Returns the number of
+    created instances.
+    """
+    with ExitStack() as stack:
+        readers = [stack.enter_context(ColumnReader(path)) for path in paths]
+        if len({len(reader) for reader in readers}) > 1:
+            raise ValueError("Column files have different numbers of rows.")
+        if model is None:
+            labels = {reader.model for reader in readers}
+            if len(labels) != 1 or None in labels:
+                raise ValueError("Column files do not record a single model.")
+            model = apps.get_model(labels.pop())
+        for reader in readers:
+            field = model._meta.get_field(reader.field)
+            if not isinstance(field, MeasurementField) or not issubclass(
+                reader.measure, field.measurement
+            ):
+                raise ValueError(
+                    "%s does not hold %s values."
+                    % (field.name, reader.measure.__name__)
+                )
+
+        importer = BulkImporter(
+            model,
+            units={reader.field: reader.unit for reader in readers},
+            batch_size=batch_size,
+            using=using,
+        )
+        names = [reader.field for reader in readers]
+        columns = [reader.values for reader in readers]
+        rows = (
+            {
+                name: None if value != value else value
+                for name, value in zip(names, values)
+            }
+            for values in zip(*columns)
+        )
+        return importer.run(rows)
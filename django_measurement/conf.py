@@ -13,5 +13,52 @@ class DjangoMeasurementConf(AppConf):
     For measurement classes subclassing a BidimensionalMeasure, this .
     """
 
+    LAZY = False
+    """
+    Return measures from the database as :class:`.LazyMeasurement` proxies
+    that are only built when first used. Can be overridden per field with
+    the ``lazy`` keyword argument.
+    """
+
+    CONVERSION_CACHE_SIZE = 256
+    """
+    Maximum number of resolved (measure class, unit) pairs kept by
+    :func:`django_measurement.utils.get_conversion`.
+    """
+
+    CODEC = "django_measurement.codecs.TextCodec"
+    """
+    Dotted path of the codec :class:`.MeasurementField` uses to turn values
+    into strings for serialization and to parse strings assigned to it. It
+    must encode to strings, see :mod:`django_measurement.codecs`.
+    """
+
+    INSTRUMENTATION = False
+    """
+    Count and time conversions, ``from_db_value``, ``to_python`` and form
+    ``compress`` calls per field and measure class into
+    :data:`django_measurement.instrumentation.stats`. Off by default; the
+    instrumented methods are only wrapped while it is on.
+    """
+
+    INTERN_CACHE_SIZE = 1024
+    """
+    Maximum number of read-only measures kept per field with
+    ``interned=True``, see :meth:`.MeasurementField.get_interned`.
+    """
+
+    ASYNC_EXECUTOR = None
+    """
+    Executor, or dotted path to a callable returning one, that async helpers
+    like :func:`django_measurement.utils.aconvert_many` hand large chunks to.
+    ``None`` uses the default executor of the event loop.
+    """
+
+    ASYNC_OFFLOAD_SIZE = 1000
+    """
+    Smallest chunk, in values or rows, that async helpers convert in the
+    executor instead of in the event loop.
+    """
+
     class Meta:
         prefix = "measurement"
@@ -0,0 +1,50 @@
+from django.core.exceptions import FieldError
+from django.db.models import FloatField, Transform
+
+from django_measurement.utils import get_linear_converter
+
+
+class UnitConversion(Transform):
+    """
+    Convert a ``MeasurementField`` to ``unit`` inside the database.
+
+    Compiles to ``column * scale + shift`` and evaluates to a plain float,
+    so it can be used in ``annotate``, ``aggregate``, ``order_by`` and
+    ``filter``. Registered on ``MeasurementField`` for every linear unit,
+    e.g. ``measurement_distance__mi__gte=1``.
+    """
+
+    lookup_name = "unit_conversion"
+    output_field = FloatField()
+
+    def __init__(self, expression, unit, **extra):
+        super(UnitConversion, self).__init__(expression, **extra)
+        self.unit = unit
+
+    def get_converter(self):
+        field = self.lhs.output_field
+        measure = getattr(field, "measurement", None)
+        if measure is None:
+            raise FieldError(
+                "UnitConversion requires a MeasurementField, got %s."
+                % type(field).__name__
+            )
+        converter = get_linear_converter(measure, to_unit=self.unit)
+        if converter is None:
+            raise FieldError(
+                'Unit "%s" of %s cannot be converted in the database.'
+                % (self.unit, measure.__name__)
+            )
+        scale, shift = converter
+        return scale / getattr(field, "storage_scale", 1), shift
+
+    def as_sql(self, compiler, connection):
+        scale, shift = self.get_converter()
+        lhs, params = compiler.compile(self.lhs)
+        params = list(params)
+        sql = "%s * %%s" % lhs
+        params.append(scale)
+        if shift:
+            sql = "%s + %%s" % sql
+            params.append(shift)
+        return "(%s)" % sql, params
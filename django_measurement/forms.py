@@ -1,12 +1,82 @@
+import math
 from itertools import product
 
 from django import forms
+from django.core.signals import setting_changed
 from django.core.validators import MaxValueValidator, MinValueValidator
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+from django.utils.translation import get_language
 from measurement.base import BidimensionalMeasure, MeasureBase
 
 from django_measurement import utils
 from django_measurement.conf import settings
 
+_unit_choices_cache = {}
+
+
+def _build_unit_choices(measurement, bidimensional_separator):
+    if issubclass(measurement, BidimensionalMeasure):
+        return tuple(
+            (
+                (
+                    "{0}__{1}".format(primary, reference),
+                    "{0}{1}{2}".format(
+                        getattr(measurement.PRIMARY_DIMENSION, "LABELS", {}).get(
+                            primary, primary
+                        ),
+                        bidimensional_separator,
+                        getattr(measurement.REFERENCE_DIMENSION, "LABELS", {}).get(
+                            reference, reference
+                        ),
+                    ),
+                )
+                for primary, reference in product(
+                    measurement.PRIMARY_DIMENSION.get_units(),
+                    measurement.REFERENCE_DIMENSION.get_units(),
+                )
+            )
+        )
+    return tuple(
+        (
+            (u, getattr(measurement, "LABELS", {}).get(u, u))
+            for u in measurement.get_units()
+        )
+    )
+
+
+def get_unit_choices(
+    measurement, bidimensional_separator=settings.MEASUREMENT_BIDIMENSIONAL_SEPARATOR
+):
+    """
+    Return the default unit choices for ``measurement``.
+
+    Choices are cached per measure class, separator and active language.
+    """
+    key = (measurement, bidimensional_separator, get_language())
+    try:
+        return _unit_choices_cache[key]
+    except KeyError:
+        choices = _build_unit_choices(measurement, bidimensional_separator)
+        _unit_choices_cache[key] = choices
+        return choices
+
+
+def clear_unit_choices_cache():
+    _unit_choices_cache.clear()
+
+
+@receiver(setting_changed)
+def _clear_unit_choices_on_setting_changed(setting, **kwargs):
+    if setting in ("LANGUAGES", "LANGUAGE_CODE", "LOCALE_PATHS", "USE_I18N"):
+        clear_unit_choices_cache()
+
+
+@receiver(file_changed)
+def _clear_unit_choices_on_translation_changed(file_path, **kwargs):
+    if file_path.suffix == ".mo":
+        clear_unit_choices_cache()
+
 
 class MeasurementWidget(forms.MultiWidget):
     def __init__(
@@ -30,18 +100,63 @@ class MeasurementWidget(forms.MultiWidget):
         widgets = (float_widget, unit_choices_widget)
         super(MeasurementWidget, self).__init__(widgets, attrs)
 
+    @property
+    def unit_choices(self):
+        return self._unit_choices
+
+    @unit_choices.setter
+    def unit_choices(self, unit_choices):
+        self._unit_choices = unit_choices
+        self.choice_units = frozenset(u for u, n in unit_choices or ())
+        # The first choice is used when the standard unit is not offered.
+        self.fallback_unit = unit_choices[0][0] if unit_choices else None
+
+    def get_unit(self, value):
+        unit = value.__class__.STANDARD_UNIT
+        if unit not in self.choice_units:
+            unit = self.fallback_unit
+        return unit
+
+    def get_magnitude(self, value, unit):
+        if isinstance(value, BidimensionalMeasure):
+            return getattr(value, unit)
+        conversion = utils.get_conversion(value.__class__, unit)
+        if not conversion.is_linear:
+            return getattr(value, unit)
+        return conversion.from_standard(value.standard)
+
     def decompress(self, value):
         if value:
-            choice_units = set([u for u, n in self.unit_choices])
+            unit = self.get_unit(value)
+            return [self.get_magnitude(value, unit), unit]
 
-            unit = value.STANDARD_UNIT
-            if unit not in choice_units:
-                unit = choice_units.pop()
+        return [None, None]
 
-            magnitude = getattr(value, unit)
-            return [magnitude, unit]
+    def decompress_many(self, values):
+        """
+        Decompress many values at once, e.g. for all rows of a formset.
 
-        return [None, None]
+        Values of linear units are converted in one batch per unit; the
+        result is the same as calling :meth:`decompress` for each value.
+        """
+        decompressed = [[None, None] for value in values]
+        batches = {}
+        for index, value in enumerate(values):
+            if not value:
+                continue
+            unit = self.get_unit(value)
+            if isinstance(value, BidimensionalMeasure):
+                decompressed[index] = [getattr(value, unit), unit]
+                continue
+            batches.setdefault((value.__class__, unit), []).append(index)
+
+        for (measure, unit), indexes in batches.items():
+            magnitudes = utils.convert_many(
+                measure, [values[index].standard for index in indexes], to_unit=unit
+            )
+            for index, magnitude in zip(indexes, magnitudes):
+                decompressed[index] = [magnitude, unit]
+        return decompressed
 
 
 class MeasurementField(forms.MultiValueField):
@@ -69,48 +184,31 @@ class MeasurementField(forms.MultiValueField):
                     measurement,
                     str(type(bidimensional_separator)),
                 )
-                unit_choices = tuple(
-                    (
-                        (
-                            "{0}__{1}".format(primary, reference),
-                            "{0}{1}{2}".format(
-                                getattr(
-                                    measurement.PRIMARY_DIMENSION, "LABELS", {}
-                                ).get(primary, primary),
-                                bidimensional_separator,
-                                getattr(
-                                    measurement.REFERENCE_DIMENSION, "LABELS", {}
-                                ).get(reference, reference),
-                            ),
-                        )
-                        for primary, reference in product(
-                            measurement.PRIMARY_DIMENSION.get_units(),
-                            measurement.REFERENCE_DIMENSION.get_units(),
-                        )
-                    )
-                )
-            else:
-                unit_choices = tuple(
-                    (
-                        (u, getattr(measurement, "LABELS", {}).get(u, u))
-                        for u in measurement.get_units()
-                    )
-                )
+            unit_choices = get_unit_choices(measurement, bidimensional_separator)
 
         if validators is None:
             validators = []
 
+        # Bounds in the standard unit, for validating many values at once.
+        self.standard_bounds = (None, None)
+        bound_validators = []
+
         if min_value is not None:
             if not isinstance(min_value, MeasureBase):
                 msg = '"min_value" must be a measure, got %s' % type(min_value)
                 raise ValueError(msg)
-            validators += [MinValueValidator(min_value)]
+            bound_validators.append(MinValueValidator(min_value))
+            self.standard_bounds = (float(min_value.standard), None)
 
         if max_value is not None:
             if not isinstance(max_value, MeasureBase):
                 msg = '"max_value" must be a measure, got %s' % type(max_value)
                 raise ValueError(msg)
-            validators += [MaxValueValidator(max_value)]
+            bound_validators.append(MaxValueValidator(max_value))
+            self.standard_bounds = (self.standard_bounds[0], float(max_value.standard))
+
+        validators += bound_validators
+        self._bound_validators = bound_validators
 
         float_field = forms.FloatField(*args, **kwargs)
         choice_field = forms.ChoiceField(choices=unit_choices)
@@ -126,6 +224,24 @@ class MeasurementField(forms.MultiValueField):
         super(MeasurementField, self).__init__(
             fields, validators=validators, *args, **defaults
         )
+        self._units = frozenset(
+            str(unit)
+            for unit, label in choice_field.choices
+            if not isinstance(label, (list, tuple))
+        )
+
+    def __deepcopy__(self, memo):
+        # Every form copies its fields; the unit choices are immutable pairs,
+        # so copy the list holding them instead of every pair.
+        choices = self.fields[1]._choices
+        memo.setdefault(id(choices), list(choices))
+        return super(MeasurementField, self).__deepcopy__(memo)
+
+    def clean(self, value):
+        prepared = self.__dict__.pop("_prepared", None)
+        if prepared is not None and prepared[0] == value:
+            return prepared[1]
+        return super(MeasurementField, self).clean(value)
 
     def compress(self, data_list):
         if not data_list:
@@ -136,3 +252,133 @@ class MeasurementField(forms.MultiValueField):
             return None
 
         return utils.get_measurement(self.measurement_class, value, unit)
+
+    def parse(self, value):
+        """
+        Return ``(magnitude, unit)`` for a submitted ``[value, unit]`` list.
+
+        Return ``None`` for an empty list, or raise ``ValueError`` if the list
+        has to go through :meth:`clean` to be validated.
+        """
+        float_field = self.fields[0]
+        if (
+            self.disabled
+            or float_field.localize
+            or float_field.validators
+            or any(
+                validator not in self._bound_validators for validator in self.validators
+            )
+            or not isinstance(value, (list, tuple))
+            or len(value) != 2
+        ):
+            raise ValueError(value)
+        magnitude, unit = value
+        if magnitude in self.empty_values and unit in self.empty_values:
+            if self.required:
+                raise ValueError(value)
+            return None
+        if not isinstance(magnitude, str) or unit not in self._units:
+            raise ValueError(value)
+        magnitude = float(magnitude)
+        if not math.isfinite(magnitude):
+            raise ValueError(value)
+        return magnitude, unit
+
+    def in_bounds(self, standard):
+        """Return whether the standard value ``standard`` passes min/max."""
+        minimum, maximum = self.standard_bounds
+        return not (
+            (minimum is not None and standard < minimum)
+            or (maximum is not None and standard > maximum)
+        )
+
+    def prepare(self, value, cleaned):
+        """Make the next :meth:`clean` of ``value`` return ``cleaned``."""
+        self._prepared = (value, cleaned)
+
+
+def clean_many(fields, values, lazy=False):
+    """
+    Validate many submitted ``[value, unit]`` lists of measurement fields.
+
+    ``fields`` and ``values`` are parallel sequences, e.g. the same field of
+    every form of a formset. All values are converted to the standard unit
+    in one batch per measure and unit and checked against the bounds of
+    their field. Returns ``{index: cleaned value}`` for every value that is
+    valid; anything else is left for :meth:`MeasurementField.clean`, which
+    produces the usual errors. Cleaned values are measures, or
+    :class:`.LazyMeasurement` proxies if ``lazy`` is true.
+    """
+    from django_measurement.values import LazyMeasurement
+
+    cleaned = {}
+    batches = {}
+    for index, (field, value) in enumerate(zip(fields, values)):
+        try:
+            parsed = field.parse(value)
+        except ValueError:
+            continue
+        if parsed is None:
+            cleaned[index] = None
+            continue
+        magnitude, unit = parsed
+        batch = batches.setdefault((field.measurement_class, unit), ([], []))
+        batch[0].append(index)
+        batch[1].append(magnitude)
+
+    for (measure, unit), (indexes, magnitudes) in batches.items():
+        standards = utils.convert_many(measure, magnitudes, from_unit=unit)
+        for index, magnitude, standard in zip(indexes, magnitudes, standards):
+            if not fields[index].in_bounds(standard):
+                continue
+            if lazy:
+                cleaned[index] = LazyMeasurement(measure, standard, unit=unit)
+            else:
+                cleaned[index] = utils.get_measurement(measure, magnitude, unit)
+    return cleaned
+
+
+class MeasurementFormSetMixin:
+    """
+    Validate the measurement fields of all forms of a formset in batches.
+
+    Before the forms are cleaned, the submitted values of every measurement
+    field are converted and checked against their bounds with
+    :func:`clean_many`; the fields of valid rows then skip their own
+    cleaning. Rows that fail are cleaned as usual, so errors are unchanged.
+    Set ``lazy_measurements`` to get :class:`.LazyMeasurement` proxies in
+    ``cleaned_data``.
+    """
+
+    lazy_measurements = False
+
+    def full_clean(self):
+        if self.is_bound:
+            self.prepare_measurements()
+        super(MeasurementFormSetMixin, self).full_clean()
+
+    def prepare_measurements(self):
+        forms = self.forms
+        if not forms:
+            return
+        for name, field in forms[0].fields.items():
+            if not isinstance(field, MeasurementField):
+                continue
+            fields = [form.fields[name] for form in forms]
+            values = [
+                form.fields[name].widget.value_from_datadict(
+                    form.data, form.files, form.add_prefix(name)
+                )
+                for form in forms
+            ]
+            cleaned = clean_many(fields, values, lazy=self.lazy_measurements)
+            for index, value in cleaned.items():
+                fields[index].prepare(values[index], value)
+
+
+class BaseMeasurementFormSet(MeasurementFormSetMixin, forms.BaseFormSet):
+    pass
+
+
+class BaseMeasurementModelFormSet(MeasurementFormSetMixin, forms.BaseModelFormSet):
+    pass
@@ -0,0 +1,134 @@
+"""Stream rows of plain numbers into models with measurement fields."""
+from itertools import islice
+
+from django_measurement.models import MeasurementField
+from django_measurement.utils import get_conversion, get_measurement
+from django_measurement.values import StandardValue
+
+__all__ = ("BulkImporter", "bulk_import")
+
+
+class BulkImporter:
+    """
+    Create model instances from an iterable of rows in batches.
+
+    Rows are mappings of field names to values. A measurement field value may
+    be a number (or numeric string) in the field's import unit, a
+    ``(value, unit)`` pair or a measure. Numbers are normalized straight to
+    the standard unit with cached conversion factors, so no measure objects
+    are built for linear units. Other values are passed to the model as is.
+
+    The import unit of a field is, in order: the unit found in the row under
+    ``unit_columns[name]``, ``units[name]``, the field's ``bare_unit`` and
+    the field's default unit.
+
+    Only one batch of rows is held in memory at a time.
+    """
+
+    def __init__(
+        self, model, units=None, unit_columns=None, batch_size=1000, using=None
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.using = using
+        self.unit_columns = dict(unit_columns or {})
+        self.fields = {}
+        self.units = {}
+        for field in model._meta.concrete_fields:
+            if isinstance(field, MeasurementField):
+                self.fields[field.name] = field
+                self.units[field.name] = (
+                    (units or {}).get(field.name)
+                    or field.bare_unit
+                    or field.get_default_unit()
+                )
+        self._converters = {}
+
+    def get_converter(self, field, unit):
+        """Return a function converting numbers in ``unit`` to ``field``'s floats."""
+        key = (field.measurement, unit)
+        try:
+            return self._converters[key]
+        except KeyError:
+            pass
+
+        conversion = get_conversion(field.measurement, unit)
+        if conversion.is_affine:
+            to_standard = conversion.to_standard
+
+            def converter(value):
+                return to_standard(float(value))
+
+        elif conversion.is_linear:
+            factor = conversion.factor
+
+            def converter(value):
+                return factor * float(value)
+
+        else:
+            measure, unit = field.measurement, conversion.unit
+
+            def converter(value):
+                return float(get_measurement(measure, float(value), unit).standard)
+
+        self._converters[key] = converter
+        return converter
+
+    def normalize(self, row):
+        """Return the keyword arguments of the model instance for ``row``."""
+        kwargs = {}
+        unit_columns = self.unit_columns
+        for name, value in row.items():
+            field = self.fields.get(name)
+            if field is None:
+                if name not in unit_columns.values():
+                    kwargs[name] = value
+                continue
+            if isinstance(value, field.MEASURE_BASES):
+                kwargs[field.attname] = StandardValue(value.standard)
+                continue
+            if isinstance(value, tuple):
+                value, unit = value
+            elif name in unit_columns:
+                unit = row[unit_columns[name]]
+            else:
+                unit = self.units[name]
+            if value is None or value == "":
+                kwargs[field.attname] = None
+            else:
+                kwargs[field.attname] = StandardValue(
+                    self.get_converter(field, unit)(value)
+                )
+        return kwargs
+
+    def batches(self, rows):
+        """Yield lists of unsaved model instances of at most ``batch_size``."""
+        model = self.model
+        normalize = self.normalize
+        rows = iter(rows)
+        while True:
+            batch = [model(**normalize(row)) for row in islice(rows, self.batch_size)]
+            if not batch:
+                return
+            yield batch
+
+    def run(self, rows):
+        """Save all ``rows`` and return the number of created instances."""
+        manager = self.model._default_manager
+        if self.using:
+            manager = manager.db_manager(self.using)
+        count = 0
+        for batch in self.batches(rows):
+            manager.bulk_create(batch, batch_size=self.batch_size)
+            count += len(batch)
+        return count
+
+
+def bulk_import(model, rows, **kwargs):
+    """
+    Import ``rows`` into ``model`` with a :class:`BulkImporter`.
+
+    Returns the number of created instances. Keyword arguments are passed to
+    :class:`BulkImporter`.
+    """
+    return BulkImporter(model, **kwargs).run(rows)
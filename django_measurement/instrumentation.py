@@ -0,0 +1,262 @@
+"""
+Count and time conversions and hydration of measures.
+
+Instrumented calls are :func:`django_measurement.utils.get_measurement`,
+``from_db_value`` and ``to_python`` of model fields and ``compress`` of form
+fields. They are recorded per field (``"<module>.<model>.<field>"``) and per
+measure class.
+
+Set ``MEASUREMENT_INSTRUMENTATION = True`` or call :func:`enable` to collect
+into :data:`stats`, or profile a block of code with :func:`profile`. The
+methods are only wrapped while something is collecting, so instrumentation
+costs nothing when it is off.
+"""
+
+import sys
+import threading
+import time
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import wraps
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from django_measurement.conf import settings
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # pragma: no cover
+
+    class ContextVar(threading.local):
+        """Per-thread stand-in for ``contextvars.ContextVar`` on Python 3.6."""
+
+        def __init__(self, name, default):
+            self.value = default
+
+        def get(self):
+            return self.value
+
+        def set(self, value):
+            token, self.value = self.value, value
+            return token
+
+        def reset(self, token):
+            self.value = token
+
+
+__all__ = (
+    "Timing",
+    "Stats",
+    "stats",
+    "enable",
+    "disable",
+    "is_enabled",
+    "profile",
+)
+
+Timing = namedtuple("Timing", ("count", "seconds"))
+
+
+class Stats:
+    """Number and cumulative duration of instrumented calls."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fields = defaultdict(lambda: [0, 0.0])
+        self._measures = defaultdict(lambda: [0, 0.0])
+
+    def add(self, operation, measure, field, seconds):
+        with self._lock:
+            if field is not None:
+                entry = self._fields[field, operation]
+                entry[0] += 1
+                entry[1] += seconds
+            entry = self._measures[measure, operation]
+            entry[0] += 1
+            entry[1] += seconds
+
+    @staticmethod
+    def _group(entries):
+        grouped = defaultdict(dict)
+        for (key, operation), (count, seconds) in entries.items():
+            grouped[key][operation] = Timing(count, seconds)
+        return dict(grouped)
+
+    def by_field(self):
+        """Return ``{field label: {operation: Timing}}``."""
+        with self._lock:
+            return self._group(self._fields)
+
+    def by_measure(self):
+        """Return ``{measure class: {operation: Timing}}``."""
+        with self._lock:
+            return self._group(self._measures)
+
+    def reset(self):
+        with self._lock:
+            self._fields.clear()
+            self._measures.clear()
+
+
+stats = Stats()
+"""Calls recorded while instrumentation is enabled."""
+
+_collectors = []
+_originals = []
+_profiles = ContextVar("django_measurement_profiles", default=())
+_active = threading.local()
+_switch_lock = threading.Lock()
+
+
+def _field_label(field):
+    model = getattr(field, "model", None)
+    if model is None:
+        return field.name
+    return "%s.%s.%s" % (model.__module__, model.__name__, field.name)
+
+
+def _timed(operation, function, get_measure, get_field=None):
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        # Only time the outermost call, not overridden methods calling super.
+        if getattr(_active, operation, False):
+            return function(*args, **kwargs)
+        setattr(_active, operation, True)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            setattr(_active, operation, False)
+            measure = get_measure(*args, **kwargs)
+            field = get_field(*args) if get_field else None
+            profiles = _profiles.get()
+            for collector in list(_collectors):
+                if collector is stats or collector in profiles:
+                    collector.add(operation, measure, field, seconds)
+
+    return wrapper
+
+
+def _measure_argument(measure=None, *args, **kwargs):
+    return measure
+
+
+def _model_field_measure(field, *args, **kwargs):
+    return field.measurement
+
+
+def _form_field_measure(field, *args, **kwargs):
+    return field.measurement_class
+
+
+def _model_field_label(field, *args):
+    return _field_label(field)
+
+
+def _subclasses(cls):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _subclasses(subclass)
+
+
+def _wrap_methods(base, names, get_measure, get_field=None):
+    for cls in _subclasses(base):
+        for name in names:
+            if name in cls.__dict__:
+                method = cls.__dict__[name]
+                _originals.append((cls, name, method))
+                setattr(cls, name, _timed(name, method, get_measure, get_field))
+
+
+def _install():
+    from django_measurement import forms, models, utils
+
+    _wrap_methods(
+        models.MeasurementField,
+        ("from_db_value", "to_python"),
+        _model_field_measure,
+        _model_field_label,
+    )
+    _wrap_methods(forms.MeasurementField, ("compress",), _form_field_measure)
+
+    # Modules imported get_measurement by name; replace it everywhere.
+    original = utils.get_measurement
+    timed = _timed("get_measurement", original, _measure_argument)
+    for name, module in list(sys.modules.items()):
+        if name.startswith("django_measurement") and (
+            getattr(module, "get_measurement", None) is original
+        ):
+            _originals.append((module, "get_measurement", original))
+            setattr(module, "get_measurement", timed)
+
+
+def _uninstall():
+    while _originals:
+        owner, name, original = _originals.pop()
+        setattr(owner, name, original)
+
+
+def _add_collector(collector):
+    with _switch_lock:
+        if collector in _collectors:
+            return
+        if not _collectors:
+            _install()
+        _collectors.append(collector)
+
+
+def _remove_collector(collector):
+    with _switch_lock:
+        if collector not in _collectors:
+            return
+        _collectors.remove(collector)
+        if not _collectors:
+            _uninstall()
+
+
+def enable():
+    """Start recording calls into :data:`stats`."""
+    _add_collector(stats)
+
+
+def disable():
+    """Stop recording calls into :data:`stats`; the recorded calls are kept."""
+    _remove_collector(stats)
+
+
+def is_enabled():
+    return stats in _collectors
+
+
+@contextmanager
+def profile():
+    """
+    Record the calls made inside the ``with`` block into a new :class:`Stats`.
+
+    Only calls made in the current context are recorded, i.e. by the thread
+    or asyncio task running the block and the tasks it starts (only the
+    thread on Python 3.6); :data:`stats` is not affected::
+
+        with profile() as result:
+            list(Reading.objects.all())
+        result.by_field()
+    """
+    collector = Stats()
+    token = _profiles.set(_profiles.get() + (collector,))
+    _add_collector(collector)
+    try:
+        yield collector
+    finally:
+        _remove_collector(collector)
+        _profiles.reset(token)
+
+
+@receiver(setting_changed)
+def _toggle_on_setting_changed(setting, **kwargs):
+    if setting == "MEASUREMENT_INSTRUMENTATION":
+        if settings.MEASUREMENT_INSTRUMENTATION:
+            enable()
+        else:
+            disable()
@@ -0,0 +1,131 @@
+from functools import lru_cache
+
+from django.db.models import lookups
+
+from django_measurement.utils import convert_many, get_conversion
+from django_measurement.values import StandardValue
+
+
+class MeasurementLookupMixin:
+    """
+    Normalize the right hand side to the standard unit when building lookups.
+
+    Measures are reduced to their standard value; plain numbers are taken to
+    be in ``unit`` (the field's ``bare_unit`` or standard unit if not set) and
+    converted together in a single batch. The database only ever compares
+    against the stored float column.
+    """
+
+    unit = None
+
+    def normalize(self, values):
+        field = self.lhs.output_field
+        measures = field.VALUE_TYPES
+
+        def is_number(value):
+            return not (
+                value is None
+                or hasattr(value, "resolve_expression")
+                or isinstance(value, measures)
+            )
+
+        converted = iter(
+            convert_many(
+                field.measurement,
+                [float(value) for value in values if is_number(value)],
+                from_unit=self.unit or field.bare_unit,
+            )
+        )
+        normalized = []
+        for value in values:
+            if is_number(value):
+                value = field.get_prep_value(StandardValue(next(converted)))
+            elif value is not None and not hasattr(value, "resolve_expression"):
+                value = field.get_prep_value(value)
+            normalized.append(value)
+        return normalized
+
+
+class MeasurementSingleValueLookupMixin(MeasurementLookupMixin):
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, "resolve_expression"):
+            return super().get_prep_lookup()
+        return self.normalize([self.rhs])[0]
+
+
+class MeasurementIterableLookupMixin(MeasurementLookupMixin):
+    def get_prep_lookup(self):
+        if hasattr(self.rhs, "resolve_expression"):
+            # Let Django prepare subqueries and expressions.
+            return super().get_prep_lookup()
+        return self.normalize(list(self.rhs))
+
+
+class MeasurementIn(MeasurementIterableLookupMixin, lookups.In):
+    def get_prep_lookup(self):
+        prepared = super().get_prep_lookup()
+        if hasattr(prepared, "resolve_expression"):
+            return prepared
+        # NULL is never equal to anything; not every Django version drops it.
+        return [value for value in prepared if value is not None]
+
+
+class MeasurementRange(MeasurementIterableLookupMixin, lookups.Range):
+    pass
+
+
+class Between(MeasurementRange):
+    lookup_name = "between"
+
+
+UNIT_LOOKUPS = {
+    "exact": type(
+        "MeasurementExact", (MeasurementSingleValueLookupMixin, lookups.Exact), {}
+    ),
+    "gt": type(
+        "MeasurementGreaterThan",
+        (MeasurementSingleValueLookupMixin, lookups.GreaterThan),
+        {},
+    ),
+    "gte": type(
+        "MeasurementGreaterThanOrEqual",
+        (MeasurementSingleValueLookupMixin, lookups.GreaterThanOrEqual),
+        {},
+    ),
+    "lt": type(
+        "MeasurementLessThan",
+        (MeasurementSingleValueLookupMixin, lookups.LessThan),
+        {},
+    ),
+    "lte": type(
+        "MeasurementLessThanOrEqual",
+        (MeasurementSingleValueLookupMixin, lookups.LessThanOrEqual),
+        {},
+    ),
+    "in": MeasurementIn,
+    "range": MeasurementRange,
+    "between": Between,
+}
+
+
+@lru_cache(maxsize=None)
+def _unit_lookup(lookup_class, unit):
+    # lookup_name stays the plain operator; the backend maps it to SQL.
+    return type(lookup_class.__name__, (lookup_class,), {"unit": unit})
+
+
+def get_unit_lookup(measure, lookup_name):
+    """
+    Return the lookup class for unit suffixed lookups like ``gte_km``.
+
+    Returns ``None`` if ``lookup_name`` is not one.
+    """
+    operator, _, unit = lookup_name.partition("_")
+    lookup_class = UNIT_LOOKUPS.get(operator)
+    if lookup_class is None or not unit:
+        return None
+    try:
+        unit = get_conversion(measure, unit).unit
+    except (AttributeError, ValueError):
+        return None
+    return _unit_lookup(lookup_class, unit)
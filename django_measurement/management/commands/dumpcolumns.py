@@ -0,0 +1,57 @@
+import os
+
+from django.apps import apps
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_measurement.columns import dump_columns
+
+
+class Command(BaseCommand):
+    help = (
+        "Write the measurement columns of a model to binary column files, one "
+        "per field, in the standard unit of their measure."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("model", help="Model label, e.g. shop.Reading.")
+        parser.add_argument(
+            "fields", nargs="*", help="Measurement fields; all if none are given."
+        )
+        parser.add_argument(
+            "-o",
+            "--output",
+            default=".",
+            help="Directory the column files are written to.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Nominates a specific database to dump columns from.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options["model"])
+        except (LookupError, ValueError) as e:
+            raise CommandError(str(e))
+        os.makedirs(options["output"], exist_ok=True)
+        queryset = model._default_manager.using(options["database"]).order_by("pk")
+        try:
+            paths = dump_columns(
+                queryset,
+                options["output"],
+                fields=options["fields"] or None,
+                chunk_size=options["chunk_size"],
+            )
+        except (FieldDoesNotExist, OSError, ValueError) as e:
+            raise CommandError(str(e))
+        for path in paths:
+            self.stdout.write(path)
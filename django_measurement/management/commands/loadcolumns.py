@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from django_measurement.columns import load_columns
+
+
+class Command(BaseCommand):
+    help = (
+        "Create a model instance for every row of binary column files written "
+        "by dumpcolumns."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Column files, one per field.")
+        parser.add_argument(
+            "--model",
+            help="Model label; defaults to the model recorded in the files.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of instances created at a time.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Nominates a specific database to load columns into.",
+        )
+
+    def handle(self, *args, **options):
+        model = None
+        try:
+            if options["model"]:
+                model = apps.get_model(options["model"])
+            count = load_columns(
+                options["paths"],
+                model=model,
+                batch_size=options["batch_size"],
+                using=options["database"],
+            )
+        except (LookupError, OSError, ValueError) as e:
+            raise CommandError(str(e))
+        self.stdout.write("Created %d %s." % (count, "row" if count == 1 else "rows"))
@@ -1,24 +1,195 @@
 import logging
+import math
 import warnings
+from collections import Counter, namedtuple
+from decimal import Decimal
+from functools import lru_cache, partial
+from itertools import islice
 
-from django.db.models import FloatField
+from django.db.models import CharField, ExpressionWrapper, F, FloatField, Value
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
-from measurement import measures
-from measurement.base import BidimensionalMeasure, MeasureBase
 
-from . import forms
-from .utils import get_measurement
+from .codecs import get_codec
+from .conf import settings
+from .expressions import UnitConversion
+from .lookups import Between, MeasurementIn, get_unit_lookup
+from .utils import (
+    convert_many,
+    get_conversion,
+    get_linear_converter,
+    get_measure_info,
+    get_measurement,
+    intern_unit,
+    to_fixed_point,
+)
+from .values import CompactMeasurement, LazyMeasurement, StandardValue, freeze
 
 logger = logging.getLogger("django_measurement")
 
+_guessed_unit_counts = Counter()
+
+
+def guessed_unit_counts():
+    """
+    Return how many bare numbers had their unit guessed, per field.
+
+    Keys are ``"<module>.<model>.<field>"`` labels. Only the first guess of
+    each field is logged.
+    """
+    return dict(_guessed_unit_counts)
+
+
+def reset_guessed_unit_counts():
+    """Reset the counters, so the next guess of every field is logged again."""
+    _guessed_unit_counts.clear()
+
+
+class InternCacheInfo(
+    namedtuple("InternCacheInfo", ("hits", "misses", "maxsize", "currsize"))
+):
+    """Statistics of the cache of a field with ``interned=True``."""
+
+    __slots__ = ()
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class _LazyClassAttribute:
+    """
+    Class attribute computed by ``factory(owner)`` on first access.
+
+    The value then replaces the descriptor on the class it was defined on.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, cls=None):
+        value = self.factory(self.owner)
+        setattr(self.owner, self.name, value)
+        return value
+
+
+def _measure_bases(cls):
+    # python-measurement imports sympy; only load it once a measure is used.
+    from measurement.base import BidimensionalMeasure, MeasureBase
+
+    return (BidimensionalMeasure, MeasureBase)
+
+
+def _value_types(cls):
+    return (LazyMeasurement,) + cls.MEASURE_BASES
+
+
+class MeasurementDescriptor:
+    """
+    Combine the stored value of a ``store_unit`` field with its unit column.
+
+    Values are loaded in the default unit and shown in the stored unit once,
+    on first access. Assigning a measure updates the unit column.
+    """
+
+    def __init__(self, field):
+        self.field = field
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        field = self.field
+        data = instance.__dict__
+        deferred = [
+            attname
+            for attname in (field.attname, field.unit_attname)
+            if attname not in data
+        ]
+        if deferred:
+            instance.refresh_from_db(fields=deferred)
+        value = data[field.attname]
+        unit = data[field.unit_attname]
+        if (
+            unit is not None
+            and isinstance(value, field.VALUE_TYPES)
+            and unit != field.get_unit_name(value)
+        ):
+            value = field.build_value(value.standard, unit)
+            data[field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        field = self.field
+        data = instance.__dict__
+        data[field.attname] = value
+        # While a model is loaded, its unit column is set after this field.
+        if field.unit_attname in data or not instance._state.adding:
+            if isinstance(value, field.VALUE_TYPES):
+                data[field.unit_attname] = field.get_unit_name(value)
+            else:
+                data[field.unit_attname] = None
+
+
+class MeasurementUnitField(CharField):
+    """
+    Unit column of a ``MeasurementField(store_unit=True)``.
+
+    Holds the canonical name of the unit of the saved measure and is filled
+    in from the measure when the instance is saved.
+    """
+
+    def __init__(self, *args, measurement_field=None, **kwargs):
+        self.measurement_field = measurement_field
+        kwargs.setdefault("max_length", 64)
+        kwargs.setdefault("null", True)
+        kwargs.setdefault("blank", True)
+        kwargs.setdefault("editable", False)
+        super(MeasurementUnitField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(MeasurementUnitField, self).deconstruct()
+        kwargs["measurement_field"] = self.measurement_field
+        for key in ("null", "blank", "editable"):
+            kwargs.pop(key, None)
+        if kwargs.get("max_length") == 64:
+            del kwargs["max_length"]
+        return name, path, args, kwargs
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        # The measurement field adds this field itself; migration states
+        # add it again.
+        if name in {field.name for field in cls._meta.local_fields}:
+            return
+        super(MeasurementUnitField, self).contribute_to_class(
+            cls, name, *args, **kwargs
+        )
+
+    def pre_save(self, model_instance, add):
+        field = model_instance._meta.get_field(self.measurement_field)
+        data = model_instance.__dict__
+        value = data.get(field.attname)
+        unit = None
+        if value is not None:
+            # Loaded values that were never accessed keep the stored unit.
+            unit = data.get(self.attname)
+            if unit is None and isinstance(value, field.VALUE_TYPES):
+                unit = field.get_unit_name(value)
+        data[self.attname] = unit
+        return unit
+
 
 class MeasurementField(FloatField):
     description = "Easily store, retrieve, and convert python measures."
     empty_strings_allowed = False
-    MEASURE_BASES = (
-        BidimensionalMeasure,
-        MeasureBase,
-    )
+    # The database holds the standard value times this.
+    storage_scale = 1
+    MEASURE_BASES = _LazyClassAttribute(_measure_bases)
+    VALUE_TYPES = _LazyClassAttribute(_value_types)
     default_error_messages = {
         "invalid_type": _(
             "'%(value)s' (%(type_given)s) value" " must be of type %(type_wanted)s."
@@ -32,6 +203,11 @@ class MeasurementField(FloatField):
         measurement=None,
         measurement_class=None,
         unit_choices=None,
+        lazy=None,
+        compact=False,
+        interned=False,
+        bare_unit=None,
+        store_unit=False,
         *args,
         **kwargs
     ):
@@ -40,82 +216,292 @@ class MeasurementField(FloatField):
             warnings.warn(
                 '"measurement_class" will be removed in version 4.0', DeprecationWarning
             )
-            measurement = getattr(measures, measurement_class)
+            # Looked up in measurement.measures on first use.
+            self._measurement_class = measurement_class
 
-        if not measurement:
+        elif not measurement:
             raise TypeError(
                 "MeasurementField() takes a measurement"
                 " keyword argument. None given."
             )
 
+        if lazy and compact:
+            raise TypeError(
+                "MeasurementField() takes either a lazy or a compact"
+                " keyword argument, not both."
+            )
+
+        if interned and (lazy or compact):
+            raise TypeError(
+                "MeasurementField() takes either an interned or a lazy or"
+                " compact keyword argument, not both."
+            )
+
+        self.unit_choices = unit_choices
+        self.lazy = lazy
+        self.compact = compact
+        self.interned = interned
+        self.bare_unit = bare_unit
+        self.store_unit = store_unit
+        if measurement:
+            self.measurement = self._check_measurement(measurement)
+
+        super(MeasurementField, self).__init__(verbose_name, name, *args, **kwargs)
+
+    def _check_measurement(self, measurement):
         if not issubclass(measurement, self.MEASURE_BASES):
             raise TypeError(
                 "MeasurementField() takes a measurement keyword argument."
                 " It has to be a valid MeasureBase subclass."
             )
+        if self.bare_unit is not None:
+            self.bare_unit = get_conversion(measurement, self.bare_unit).unit
+        return measurement
 
-        self.measurement = measurement
-        self.widget_args = {
-            "measurement": measurement,
-            "unit_choices": unit_choices,
-        }
+    @cached_property
+    def measurement(self):
+        from measurement import measures
 
-        super(MeasurementField, self).__init__(verbose_name, name, *args, **kwargs)
+        return self._check_measurement(getattr(measures, self._measurement_class))
+
+    @property
+    def widget_args(self):
+        return {"measurement": self.measurement, "unit_choices": self.unit_choices}
 
     def deconstruct(self):
         name, path, args, kwargs = super(MeasurementField, self).deconstruct()
         kwargs["measurement"] = self.measurement
+        if self.lazy is not None:
+            kwargs["lazy"] = self.lazy
+        if self.compact:
+            kwargs["compact"] = True
+        if self.interned:
+            kwargs["interned"] = self.interned
+        if self.bare_unit is not None:
+            kwargs["bare_unit"] = self.bare_unit
+        if self.store_unit:
+            kwargs["store_unit"] = True
         return name, path, args, kwargs
 
     def get_prep_value(self, value):
         if value is None:
             return None
 
-        elif isinstance(value, self.MEASURE_BASES):
+        elif isinstance(value, self.VALUE_TYPES):
             # sometimes we get sympy.core.numbers.Float, which the
             # database does not understand, so explicitely convert to
             # float
 
             return float(value.standard)
 
+        elif self.bare_unit is not None and not (
+            isinstance(value, StandardValue) or hasattr(value, "resolve_expression")
+        ):
+            return float(
+                get_measurement(
+                    measure=self.measurement,
+                    value=super(MeasurementField, self).get_prep_value(value),
+                    unit=self.bare_unit,
+                ).standard
+            )
+
         else:
             return super(MeasurementField, self).get_prep_value(value)
 
+    @cached_property
+    def measure_info(self):
+        """
+        The :class:`~django_measurement.utils.MeasureInfo` of this field.
+
+        Resolved when the field is added to its model, so loading and saving
+        values does not inspect the measure class again.
+        """
+        unit_choices = self.unit_choices
+        return get_measure_info(
+            self.measurement, unit_choices[0][0] if unit_choices else None
+        )
+
+    @cached_property
+    def _default_unit_id(self):
+        return intern_unit(self.measurement, self.measure_info.default_unit)
+
     def get_default_unit(self):
-        unit_choices = self.widget_args["unit_choices"]
-        if unit_choices:
-            return unit_choices[0][0]
-        return self.measurement.STANDARD_UNIT
+        return self.measure_info.default_unit
 
-    def from_db_value(self, value, *args, **kwargs):
+    def is_lazy(self):
+        if self.lazy is None:
+            return settings.MEASUREMENT_LAZY
+        return self.lazy
+
+    def contribute_to_class(self, cls, name, *args, **kwargs):
+        super(MeasurementField, self).contribute_to_class(cls, name, *args, **kwargs)
+        if "measurement" in self.__dict__:
+            self.measure_info
+        if not self.store_unit or cls._meta.abstract:
+            return
+        if self.unit_attname not in {field.name for field in cls._meta.local_fields}:
+            cls.add_to_class(
+                self.unit_attname, MeasurementUnitField(measurement_field=self.name)
+            )
+        setattr(cls, self.attname, MeasurementDescriptor(self))
+
+    @property
+    def unit_attname(self):
+        return "%s_unit" % self.name
+
+    def get_unit_name(self, value):
+        """Return the canonical name of the unit of the measure ``value``."""
+        if isinstance(value, LazyMeasurement) and not value.is_materialized:
+            unit = value._unit or self.measure_info.standard_unit
+        else:
+            unit = value.unit
+        return get_conversion(self.measurement, unit).unit
+
+    @cached_property
+    def _interned_measure(self):
+        if self.interned is True:
+            maxsize = settings.MEASUREMENT_INTERN_CACHE_SIZE
+        else:
+            maxsize = self.interned
+        info = self.measure_info
+
+        @lru_cache(maxsize=maxsize)
+        def interned_measure(standard, unit):
+            if unit == info.default_unit:
+                return freeze(info.from_standard(standard))
+            return freeze(
+                get_measurement(
+                    measure=info.measure, value=standard, original_unit=unit
+                )
+            )
+
+        return interned_measure
+
+    def get_interned(self, standard, unit=None):
+        """
+        Return the shared, read-only measure for ``standard`` in ``unit``.
+
+        ``unit`` defaults to the default unit. Measures are cached per
+        (standard value, unit) with LRU eviction, see :meth:`intern_cache_info`.
+        """
+        unit = unit or self.measure_info.default_unit
+        if not standard and math.copysign(1.0, standard) < 0:
+            # -0.0 equals 0.0 as a cache key; keep its sign.
+            return self._interned_measure.__wrapped__(standard, unit)
+        return self._interned_measure(standard, unit)
+
+    def intern_cache_info(self):
+        """Return the :class:`InternCacheInfo` of this field."""
+        return InternCacheInfo(*self._interned_measure.cache_info())
+
+    def clear_intern_cache(self):
+        self._interned_measure.cache_clear()
+
+    def build_value(self, standard, unit):
+        """Return the value of this field for ``standard`` shown in ``unit``."""
+        if self.interned:
+            return self.get_interned(standard, unit)
+        if self.compact:
+            return CompactMeasurement(standard, intern_unit(self.measurement, unit))
+        if self.is_lazy():
+            return LazyMeasurement(self.measurement, standard, unit=unit)
+        if unit == self.measure_info.default_unit:
+            return self.measure_info.from_standard(standard)
+        return get_measurement(
+            measure=self.measurement, value=standard, original_unit=unit
+        )
+
+    def from_db_value(self, value, expression=None, *args, **kwargs):
         if value is None:
             return None
 
-        return get_measurement(
-            measure=self.measurement,
-            value=value,
-            original_unit=self.get_default_unit(),
+        info = self.measure_info
+        if self.interned:
+            return self.get_interned(value, info.default_unit)
+
+        if self.compact:
+            return CompactMeasurement(value, self._default_unit_id)
+
+        if self.is_lazy():
+            return LazyMeasurement(info.measure, value, unit=info.default_unit)
+
+        return info.from_standard(value)
+
+    def get_lookup(self, lookup_name):
+        lookup = super(MeasurementField, self).get_lookup(lookup_name)
+        if lookup is not None:
+            return lookup
+        return get_unit_lookup(self.measurement, lookup_name)
+
+    def get_transform(self, name):
+        transform = super(MeasurementField, self).get_transform(name)
+        if transform is not None:
+            return transform
+        try:
+            converter = get_linear_converter(self.measurement, to_unit=name)
+        except (AttributeError, ValueError):
+            return None
+        if converter is None:
+            return None
+        return partial(UnitConversion, unit=name)
+
+    def get_standard_expression(self):
+        """Return an expression selecting the standard value as a float."""
+        expression = F(self.attname)
+        if self.storage_scale != 1:
+            expression = expression / Value(
+                float(self.storage_scale), output_field=FloatField()
+            )
+        return ExpressionWrapper(expression, output_field=FloatField())
+
+    def iter_values(self, unit=None, queryset=None, chunk_size=2000):
+        """
+        Stream the stored values of this field converted to ``unit``.
+
+        Yields plain floats (or ``None``) without building measure objects.
+        ``unit`` defaults to the field's default unit and ``queryset`` to all
+        rows of the model.
+        """
+        if queryset is None:
+            queryset = self.model._default_manager.all()
+        unit = unit or self.get_default_unit()
+
+        rows = queryset.values_list(self.get_standard_expression(), flat=True).iterator(
+            chunk_size=chunk_size
         )
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            converted = iter(
+                convert_many(
+                    self.measurement,
+                    [value for value in chunk if value is not None],
+                    to_unit=unit,
+                )
+            )
+            for value in chunk:
+                yield None if value is None else next(converted)
 
     def value_to_string(self, obj):
         value = self.value_from_object(obj)
         if not isinstance(value, self.MEASURE_BASES):
             return value
-        return "%s:%s" % (value.value, value.unit)
+        return get_codec().encode(value)
 
     def deserialize_value_from_string(self, s: str):
-        parts = s.split(":", 1)
-        if len(parts) != 2:
-            return None
-        value, unit = float(parts[0]), parts[1]
-        measure = get_measurement(self.measurement, value=value, unit=unit)
-        return measure
+        return get_codec().decode(self.measurement, s)
+
+    @cached_property
+    def _label(self):
+        # Key of guessed_unit_counts().
+        return "%s.%s.%s" % (self.model.__module__, self.model.__name__, self.name)
 
     def to_python(self, value):
 
         if value is None:
             return value
-        elif isinstance(value, self.MEASURE_BASES):
+        elif isinstance(value, self.VALUE_TYPES):
             return value
         elif isinstance(value, str):
             parsed = self.deserialize_value_from_string(value)
@@ -123,20 +509,25 @@ class MeasurementField(FloatField):
                 return parsed
         value = super(MeasurementField, self).to_python(value)
 
+        if self.bare_unit is not None:
+            return get_measurement(
+                measure=self.measurement,
+                value=value,
+                unit=self.bare_unit,
+            )
+
         return_unit = self.get_default_unit()
 
-        msg = (
-            'You assigned a %s instead of %s to %s.%s.%s, unit was guessed to be "%s".'
-            % (
+        label = self._label
+        _guessed_unit_counts[label] += 1
+        if _guessed_unit_counts[label] == 1:
+            logger.warning(
+                'You assigned a %s instead of %s to %s, unit was guessed to be "%s".',
                 type(value).__name__,
-                str(self.measurement.__name__),
-                self.model.__module__,
-                self.model.__name__,
-                self.name,
+                self.measurement.__name__,
+                label,
                 return_unit,
             )
-        )
-        logger.warning(msg)
         return get_measurement(
             measure=self.measurement,
             value=value,
@@ -144,7 +535,66 @@ class MeasurementField(FloatField):
         )
 
     def formfield(self, **kwargs):
+        from . import forms
+
         defaults = {"form_class": forms.MeasurementField}
         defaults.update(kwargs)
         defaults.update(self.widget_args)
         return super(MeasurementField, self).formfield(**defaults)
+
+
+class FixedPointMeasurementField(MeasurementField):
+    """
+    Measurement field stored as an integer in a ``BigIntegerField``.
+
+    The integer counts ``10 ** -decimal_places`` standard units. Values are
+    written exactly: numbers are converted with pre-scaled integer factors
+    (see :func:`django_measurement.utils.to_fixed_point`) and rounded half to
+    even. Measures are loaded like any other measurement field; use
+    :meth:`to_decimal` for the exact stored value.
+    """
+
+    description = "Store measures as fixed-point numbers."
+
+    def __init__(self, *args, decimal_places=6, **kwargs):
+        self.decimal_places = decimal_places
+        self.storage_scale = 10**decimal_places
+        super(FixedPointMeasurementField, self).__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super(FixedPointMeasurementField, self).deconstruct()
+        if self.decimal_places != 6:
+            kwargs["decimal_places"] = self.decimal_places
+        return name, path, args, kwargs
+
+    def get_internal_type(self):
+        return "BigIntegerField"
+
+    def get_prep_value(self, value):
+        if value is None or hasattr(value, "resolve_expression"):
+            return value
+        unit = None
+        if isinstance(value, self.VALUE_TYPES):
+            value = float(value.standard)
+        elif not isinstance(value, StandardValue):
+            unit = self.bare_unit
+        return to_fixed_point(
+            self.measurement, value, unit=unit, decimal_places=self.decimal_places
+        )
+
+    def from_db_value(self, value, *args, **kwargs):
+        if value is None:
+            return None
+        return super(FixedPointMeasurementField, self).from_db_value(
+            value / self.storage_scale, *args, **kwargs
+        )
+
+    def to_decimal(self, value):
+        """Return the exact stored standard value of ``value`` as a Decimal."""
+        if value is None:
+            return None
+        return Decimal(self.get_prep_value(value)).scaleb(-self.decimal_places)
+
+
+MeasurementField.register_lookup(MeasurementIn)
+MeasurementField.register_lookup(Between)
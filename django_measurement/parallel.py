@@ -0,0 +1,159 @@
+"""
+Convert very large arrays of numbers in worker processes.
+
+:func:`convert_parallel` converts the same way as
+:func:`django_measurement.utils.convert_many`, but splits the values into
+shards that a :class:`~concurrent.futures.ProcessPoolExecutor` converts in
+place. Workers only receive a :class:`ConversionPlan` and the location of
+their shard in a memory-mapped temporary file, never measure objects or the
+numbers themselves.
+"""
+import math
+import mmap
+import os
+import tempfile
+from array import array
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django_measurement import utils
+
+__all__ = ("ConversionPlan", "get_conversion_plan", "convert_parallel")
+
+MIN_SHARD_SIZE = 1 << 16
+"""Smallest number of values worth sending to a worker."""
+
+
+class ConversionPlan(
+    namedtuple(
+        "ConversionPlan",
+        ("factor", "offset", "divisor", "measure", "from_unit", "to_unit"),
+    )
+):
+    """
+    Precomputed conversion between two units of a measure.
+
+    Linear plans map a value to ``(value * factor + offset) / divisor`` and
+    only hold these numbers. Plans involving affine or other units fall back
+    to :func:`django_measurement.utils.convert_many` and hold the measure
+    class and the units instead.
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_linear(self):
+        return self.factor is not None
+
+    def apply(self, values):
+        """Convert a writable buffer of doubles in place."""
+        if not self.is_linear:
+            values[:] = utils.convert_many(
+                self.measure, values, self.from_unit, self.to_unit
+            )
+            return
+
+        factor, offset, divisor = self.factor, self.offset, self.divisor
+        np = utils._numpy()
+        if np is None:
+            values[:] = array(
+                "d", ((value * factor + offset) / divisor for value in values)
+            )
+            return
+        # Same operations, in the same order, as convert_many.
+        result = np.frombuffer(values, dtype="d")
+        result *= factor
+        if offset:
+            result += offset
+        if divisor != 1.0:
+            result /= divisor
+
+
+def get_conversion_plan(measure, from_unit=None, to_unit=None):
+    """Return the :class:`ConversionPlan` from ``from_unit`` to ``to_unit``."""
+    source = utils.get_conversion(measure, from_unit or measure.STANDARD_UNIT)
+    target = utils.get_conversion(measure, to_unit or measure.STANDARD_UNIT)
+    if source.is_linear and target.is_linear and not (
+        source.is_affine or target.is_affine
+    ):
+        return ConversionPlan(
+            source.factor,
+            0.0,
+            target.factor,
+            None,
+            None,
+            None,
+        )
+    return ConversionPlan(None, None, None, measure, source.unit, target.unit)
+
+
+def _convert_shard(path, plan, start, stop):
+    with open(path, "r+b") as file, mmap.mmap(file.fileno(), 0) as buffer:
+        with memoryview(buffer) as view, view.cast("d") as values:
+            with values[start:stop] as shard:
+                plan.apply(shard)
+
+
+def convert_parallel(
+    measure,
+    values,
+    from_unit=None,
+    to_unit=None,
+    workers=None,
+    shard_size=None,
+    executor=None,
+):
+    """
+    Convert many numbers from ``from_unit`` to ``to_unit`` in parallel.
+
+    ``values`` may be any iterable of numbers or a buffer of doubles. They
+    are copied into a memory-mapped temporary file, split into shards of
+    ``shard_size`` values (by default about four per worker, and at least
+    :data:`MIN_SHARD_SIZE`) and converted in place by ``executor``, or by a
+    new pool of ``workers`` processes. Returns an ``array('d')``, or a NumPy
+    array when given one, with the same values :func:`convert_many` returns.
+    """
+    np = utils._numpy()
+    is_ndarray = np is not None and isinstance(values, np.ndarray)
+    if is_ndarray:
+        data = np.ascontiguousarray(values, dtype="d")
+    elif isinstance(values, array) and values.typecode == "d":
+        data = values
+    else:
+        data = array("d", values)
+    count = len(data)
+
+    workers = workers or os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = max(math.ceil(count / (workers * 4)), MIN_SHARD_SIZE)
+    if count <= shard_size:
+        return utils.convert_many(measure, data, from_unit, to_unit)
+    plan = get_conversion_plan(measure, from_unit, to_unit)
+
+    with tempfile.NamedTemporaryFile(prefix="measurement-") as file:
+        file.write(memoryview(data).cast("B"))
+        file.flush()
+
+        shards = [
+            (file.name, plan, start, min(start + shard_size, count))
+            for start in range(0, count, shard_size)
+        ]
+        if executor is None:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                _wait(pool, shards)
+        else:
+            _wait(executor, shards)
+
+        file.seek(0)
+        result = array("d")
+        result.fromfile(file, count)
+
+    if is_ndarray:
+        return np.frombuffer(result, dtype="d")
+    return result
+
+
+def _wait(executor, shards):
+    futures = [executor.submit(_convert_shard, *shard) for shard in shards]
+    for future in futures:
+        future.result()
@@ -0,0 +1,157 @@
+from collections import namedtuple
+from functools import partial
+from itertools import islice
+
+from django.db import models
+
+from django_measurement.models import MeasurementField
+from django_measurement.utils import convert_many, run_chunk
+
+__all__ = ("MeasurementQuerySet", "MeasurementManager")
+
+
+class MeasurementQuerySet(models.QuerySet):
+    """QuerySet that can stream measurement columns as plain floats."""
+
+    def _measurement_fields(self):
+        return [
+            field.name
+            for field in self.model._meta.concrete_fields
+            if isinstance(field, MeasurementField)
+        ]
+
+    def as_units(self, *fields, chunk_size=2000, flat=False, named=False, **units):
+        """
+        Stream rows of ``fields`` with measurement columns as plain floats.
+
+        Measurement fields are converted to the unit given as keyword
+        argument, e.g. ``as_units("name", distance="km")``, or to their
+        default unit. Fields only given as keyword arguments are appended in
+        order. Without any fields, all measurement fields are returned.
+
+        Rows are fetched ``chunk_size`` at a time and every measurement column
+        of a chunk is converted in one batch; no measure objects are built.
+        Yields tuples like ``values_list``, single values with ``flat=True``
+        or named tuples with ``named=True``.
+        """
+        names, columns, conversions = self._as_units_plan(fields, units, flat, named)
+        rows = self._converted_rows(columns, conversions, chunk_size)
+        if flat:
+            return (row[0] for row in rows)
+        if named:
+            row_class = namedtuple("Row", names)
+            return (row_class._make(row) for row in rows)
+        return rows
+
+    def aas_units(
+        self, *fields, chunk_size=2000, flat=False, named=False, executor=None, **units
+    ):
+        """
+        Asynchronous :meth:`as_units`, for ``async for`` loops.
+
+        Chunks are fetched with ``sync_to_async`` and converted with
+        :func:`django_measurement.utils.run_chunk`: chunks of at least
+        ``MEASUREMENT_ASYNC_OFFLOAD_SIZE`` rows are converted in ``executor``
+        (see :func:`django_measurement.utils.get_executor`), so the event
+        loop keeps running while a large export streams.
+        """
+        names, columns, conversions = self._as_units_plan(fields, units, flat, named)
+        rows = self._aconverted_rows(columns, conversions, chunk_size, executor)
+        if flat:
+            return _amap(lambda row: row[0], rows)
+        if named:
+            return _amap(namedtuple("Row", names)._make, rows)
+        return rows
+
+    def _as_units_plan(self, fields, units, flat, named):
+        names = list(fields) + [name for name in units if name not in fields]
+        if not names:
+            names = self._measurement_fields()
+        if flat and len(names) != 1:
+            raise TypeError(
+                "'flat' is not valid when as_units is called with more than one field."
+            )
+        if flat and named:
+            raise TypeError("'flat' and 'named' can't be used together.")
+
+        columns = []
+        conversions = []
+        for index, name in enumerate(names):
+            field = self.model._meta.get_field(name)
+            if isinstance(field, MeasurementField):
+                columns.append(field.get_standard_expression())
+                unit = units.get(name, field.get_default_unit())
+                conversions.append((index, field.measurement, unit))
+            else:
+                columns.append(name)
+        return names, columns, conversions
+
+    def raw_measurements(self, *fields, chunk_size=2000, flat=False, named=False):
+        """
+        Stream rows of ``fields`` with measurement columns as stored.
+
+        Like :meth:`as_units`, but measurement columns are yielded in the
+        standard unit of their measure, without any conversion.
+        """
+        return self.as_units(
+            *fields,
+            chunk_size=chunk_size,
+            flat=flat,
+            named=named,
+            **{
+                name: None
+                for name in (fields or self._measurement_fields())
+                if isinstance(self.model._meta.get_field(name), MeasurementField)
+            }
+        )
+
+    def _converted_rows(self, columns, conversions, chunk_size):
+        rows = self.values_list(*columns).iterator(chunk_size=chunk_size)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield from _convert_rows(chunk, conversions)
+
+    async def _aconverted_rows(self, columns, conversions, chunk_size, executor):
+        # asgiref ships with Django 3.0 and later only.
+        from asgiref.sync import sync_to_async
+
+        rows = self.values_list(*columns).iterator(chunk_size=chunk_size)
+        fetch = sync_to_async(lambda: list(islice(rows, chunk_size)))
+        while True:
+            chunk = await fetch()
+            if not chunk:
+                return
+            converted = await run_chunk(
+                partial(_convert_rows, chunk, conversions), len(chunk), executor
+            )
+            for row in converted:
+                yield row
+
+
+def _convert_rows(chunk, conversions):
+    """Return the rows of ``chunk`` with the columns of ``conversions`` converted."""
+    values = [list(column) for column in zip(*chunk)]
+    for index, measure, unit in conversions:
+        if unit is None:
+            continue
+        column = values[index]
+        present = [i for i, value in enumerate(column) if value is not None]
+        if not present:
+            continue
+        if len(present) == len(column):
+            values[index] = convert_many(measure, column, to_unit=unit)
+            continue
+        converted = convert_many(measure, [column[i] for i in present], to_unit=unit)
+        for i, value in zip(present, converted):
+            column[i] = value
+    return list(zip(*values))
+
+
+async def _amap(function, rows):
+    async for row in rows:
+        yield function(row)
+
+
+MeasurementManager = models.Manager.from_queryset(MeasurementQuerySet)
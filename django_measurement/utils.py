@@ -1,12 +1,591 @@
-from measurement.base import BidimensionalMeasure
+import threading
+from array import array
+from collections import namedtuple
+from fractions import Fraction
+from functools import lru_cache, partial
+from itertools import islice, product
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from django_measurement.conf import settings
+
+# NumPy is optional and only imported by the first batch conversion.
+_unloaded = object()
+np = _unloaded
+
+
+def _numpy():
+    global np
+    if np is _unloaded:
+        try:
+            import numpy as np
+        except ImportError:  # pragma: no cover
+            np = None
+    return np
+
+
+class Conversion(
+    namedtuple(
+        "Conversion",
+        (
+            "measure",
+            "unit",
+            "factor",
+            "offset",
+            "primary",
+            "reference",
+            "scale",
+            "shift",
+        ),
+    )
+):
+    """
+    Resolved unit of a measure class.
+
+    ``unit`` is the canonical unit name the alias resolved to. For linear
+    units a value in ``unit`` maps to the standard unit as
+    ``factor * value + offset``; this includes affine sympy units like
+    degrees Celsius. ``factor`` is ``None`` for units that need
+    python-measurement to convert. Bidimensional measures carry the
+    conversions of their dimensions in ``primary`` and ``reference``.
+
+    Affine units also keep the coefficients of their sympy expression,
+    ``value = scale * standard + shift``. Converting with them takes the
+    same steps as python-measurement, so round values like 20 °C come back
+    as 68.0 °F rather than 67.99999999999999.
+    """
+
+    __slots__ = ()
+
+    @property
+    def is_linear(self):
+        return self.factor is not None
+
+    @property
+    def is_affine(self):
+        return self.scale is not None
+
+    def to_standard(self, value):
+        if self.scale is not None:
+            return (value - self.shift) / self.scale
+        return self.factor * value + self.offset
+
+    def from_standard(self, value):
+        if self.scale is not None:
+            return value * self.scale + self.shift
+        return (value - self.offset) / self.factor
+
+
+def _is_plain_measure(measure):
+    from measurement.base import MeasureBase
+
+    # Only skip __init__ for measures that are built exactly the way
+    # MeasureBase builds them.
+    if measure.__init__ is not MeasureBase.__init__:
+        return False
+    probe = measure(**{measure.STANDARD_UNIT: 1.0})
+    return set(vars(probe)) == {measure.STANDARD_UNIT, "_default_unit"}
+
+
+def _affine_coefficients(measure, expression):
+    """
+    Return the coefficients of the sympy unit ``expression``.
+
+    ``(scale, shift)`` map a standard value to the unit as
+    ``scale * standard + shift``. Returns ``(None, 0.0)`` if the unit is not
+    affine.
+    """
+    import sympy
+
+    symbol = getattr(measure, "SU", None)
+    if not isinstance(symbol, sympy.Symbol) or expression.free_symbols != {symbol}:
+        return None, 0.0
+    try:
+        polynomial = sympy.Poly(expression, symbol)
+    except sympy.PolynomialError:
+        return None, 0.0
+    if polynomial.degree() != 1:
+        return None, 0.0
+    return float(polynomial.coeff_monomial(symbol)), float(polynomial.coeff_monomial(1))
+
+
+def _build_conversion(measure, unit):
+    if is_bidimensional(measure):
+        probe = measure(**{unit: 1.0})
+        primary = get_conversion(measure.PRIMARY_DIMENSION, probe.primary.unit)
+        reference = get_conversion(measure.REFERENCE_DIMENSION, probe.reference.unit)
+        factor = None
+        if (
+            primary.is_linear
+            and reference.is_linear
+            and not (primary.offset or reference.offset)
+        ):
+            factor = primary.factor / reference.factor
+        return Conversion(
+            measure,
+            "%s__%s" % (primary.unit, reference.unit),
+            factor,
+            0.0,
+            primary,
+            reference,
+            None,
+            0.0,
+        )
+
+    probe = measure(**{unit: 1.0})
+    factor = measure.get_units()[probe.unit]
+    offset = 0.0
+    scale, shift = None, 0.0
+    if not _is_plain_measure(measure):
+        factor = None
+    elif isinstance(factor, (int, float)):
+        factor = float(factor)
+    else:
+        scale, shift = _affine_coefficients(measure, factor)
+        factor = None
+        if scale is not None:
+            factor, offset = 1.0 / scale, -shift / scale
+    return Conversion(measure, probe.unit, factor, offset, None, None, scale, shift)
+
+
+@lru_cache(maxsize=None)
+def is_bidimensional(measure):
+    """Return whether the measure class ``measure`` has two dimensions."""
+    # python-measurement imports sympy, so it is only loaded once a measure
+    # is actually used.
+    from measurement.base import BidimensionalMeasure
+
+    return issubclass(measure, BidimensionalMeasure)
+
+
+# Created on first use, so MEASUREMENT_CONVERSION_CACHE_SIZE is read once
+# settings are configured and can be overridden.
+_conversion_cache = None
+
+
+def _get_conversion_cache():
+    global _conversion_cache
+    if _conversion_cache is None:
+        _conversion_cache = lru_cache(
+            maxsize=settings.MEASUREMENT_CONVERSION_CACHE_SIZE
+        )(_build_conversion)
+    return _conversion_cache
+
+
+def get_conversion(measure, unit):
+    """Return the cached :class:`Conversion` of ``unit`` for ``measure``."""
+    return (_conversion_cache or _get_conversion_cache())(measure, unit)
+
+
+def conversion_cache_info():
+    """Return hits, misses, maxsize and currsize of the conversion cache."""
+    return _get_conversion_cache().cache_info()
+
+
+def clear_conversion_cache():
+    _get_conversion_cache().cache_clear()
+
+
+@receiver(setting_changed)
+def _reset_conversion_cache(setting, **kwargs):
+    global _conversion_cache
+    if setting == "MEASUREMENT_CONVERSION_CACHE_SIZE":
+        _conversion_cache = None
+
+
+@lru_cache(maxsize=None)
+def unit_table(measure):
+    """
+    Return the canonical unit names of ``measure`` in a deterministic order.
+
+    Units are sorted by name; bidimensional measures list every
+    ``primary__reference`` combination. The position of a unit in the table
+    is its unit id in :mod:`django_measurement.codecs`.
+    """
+    if is_bidimensional(measure):
+        return tuple(
+            "%s__%s" % (primary, reference)
+            for primary, reference in product(
+                unit_table(measure.PRIMARY_DIMENSION),
+                unit_table(measure.REFERENCE_DIMENSION),
+            )
+        )
+    return tuple(sorted(measure.get_units()))
+
+
+@lru_cache(maxsize=None)
+def get_unit_ids(measure):
+    """Return a mapping of the units in :func:`unit_table` to their position."""
+    return {unit: unit_id for unit_id, unit in enumerate(unit_table(measure))}
+
+
+_interned_units = []
+_interned_unit_ids = {}
+_intern_lock = threading.Lock()
+
+
+def intern_unit(measure, unit=None):
+    """
+    Return a small integer identifying ``unit`` of ``measure`` in this process.
+
+    Ids are handed out in first-use order and are not stable across
+    processes; use :func:`get_interned_unit` to get the conversion back.
+    """
+    conversion = get_conversion(measure, unit or measure.STANDARD_UNIT)
+    key = (measure, conversion.unit)
+    try:
+        return _interned_unit_ids[key]
+    except KeyError:
+        with _intern_lock:
+            if key not in _interned_unit_ids:
+                _interned_units.append(conversion)
+                _interned_unit_ids[key] = len(_interned_units) - 1
+            return _interned_unit_ids[key]
+
+
+def get_interned_unit(unit_id):
+    """Return the :class:`Conversion` interned as ``unit_id``."""
+    return _interned_units[unit_id]
+
+
+def _new_measure(conversion, standard):
+    measure = conversion.measure
+    m = measure.__new__(measure)
+    m.__dict__[measure.STANDARD_UNIT] = standard
+    m.__dict__["_default_unit"] = conversion.unit
+    return m
+
+
+def _fast_measurement(conversion, target, value):
+    if conversion.primary is None:
+        if conversion.scale is None:
+            standard = conversion.factor * float(value)
+        else:
+            standard = conversion.to_standard(float(value))
+        return _new_measure(target, standard)
+
+    standard = conversion.primary.factor * float(value)
+    if conversion.reference.unit != target.reference.unit:
+        standard = standard / (conversion.reference.factor / target.reference.factor)
+    reference_standard = get_conversion(
+        target.reference.measure, target.reference.measure.STANDARD_UNIT
+    ).factor
+    return target.measure(
+        primary=_new_measure(target.primary, standard),
+        reference=_new_measure(
+            target.reference, 1 * (target.reference.factor / reference_standard)
+        ),
+    )
 
 
 def get_measurement(measure, value, unit=None, original_unit=None):
     unit = unit or measure.STANDARD_UNIT
 
+    conversion = get_conversion(measure, unit)
+    target = get_conversion(measure, original_unit) if original_unit else conversion
+    if conversion.is_linear and (
+        conversion.primary is None or target.reference.is_linear
+    ):
+        return _fast_measurement(conversion, target, value)
+
     m = measure(**{unit: value})
     if original_unit:
         m.unit = original_unit
-    if isinstance(m, BidimensionalMeasure):
+    if conversion.primary is not None:
         m.reference.value = 1
     return m
+
+
+class MeasureInfo(
+    namedtuple(
+        "MeasureInfo",
+        (
+            "measure",
+            "standard_unit",
+            "default_unit",
+            "is_bidimensional",
+            "from_standard",
+        ),
+    )
+):
+    """
+    Measure details of a measurement field, resolved once.
+
+    ``from_standard`` builds the measure for a standard value, shown in
+    ``default_unit``.
+    """
+
+    __slots__ = ()
+
+
+def _standard_builder(measure, default_unit):
+    source = get_conversion(measure, measure.STANDARD_UNIT)
+    target = get_conversion(measure, default_unit)
+    if not source.is_linear:
+        return None
+
+    if target.primary is None:
+        standard_unit, unit = measure.STANDARD_UNIT, target.unit
+        factor = source.factor
+
+        def from_standard(value):
+            m = measure.__new__(measure)
+            m.__dict__[standard_unit] = factor * float(value)
+            m.__dict__["_default_unit"] = unit
+            return m
+
+        return from_standard
+
+    from measurement.base import BidimensionalMeasure
+
+    if (
+        measure.__init__ is not BidimensionalMeasure.__init__
+        or not target.reference.is_linear
+    ):
+        return None
+    # Same arithmetic as _fast_measurement, with the constants folded.
+    factor = source.primary.factor
+    divisor = source.reference.factor / target.reference.factor
+    reference_standard = 1 * (
+        target.reference.factor
+        / get_conversion(
+            target.reference.measure, target.reference.measure.STANDARD_UNIT
+        ).factor
+    )
+    primary, reference = target.primary, target.reference
+    rescale = source.reference.unit != target.reference.unit
+
+    def from_standard(value):
+        standard = factor * float(value)
+        if rescale:
+            standard = standard / divisor
+        m = measure.__new__(measure)
+        m.__dict__["primary"] = _new_measure(primary, standard)
+        m.__dict__["reference"] = _new_measure(reference, reference_standard)
+        return m
+
+    return from_standard
+
+
+@lru_cache(maxsize=None)
+def get_measure_info(measure, default_unit=None):
+    """
+    Return the :class:`MeasureInfo` of ``measure`` shown in ``default_unit``.
+
+    ``default_unit`` defaults to the standard unit. Measures that cannot be
+    built without python-measurement fall back to :func:`get_measurement`.
+    """
+    standard_unit = measure.STANDARD_UNIT
+    default_unit = default_unit or standard_unit
+    try:
+        from_standard = _standard_builder(measure, default_unit)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        from_standard = None
+    if from_standard is None:
+        from_standard = partial(get_measurement, measure, original_unit=default_unit)
+    return MeasureInfo(
+        measure,
+        standard_unit,
+        default_unit,
+        is_bidimensional(measure),
+        from_standard,
+    )
+
+
+def get_linear_converter(measure, from_unit=None, to_unit=None):
+    """
+    Return the linear conversion from ``from_unit`` to ``to_unit``.
+
+    The result is ``(scale, shift)`` so that ``value * scale + shift``
+    converts a value, or ``None`` if the units are not linear. Units default
+    to the standard unit of ``measure``.
+    """
+    source = get_conversion(measure, from_unit or measure.STANDARD_UNIT)
+    target = get_conversion(measure, to_unit or measure.STANDARD_UNIT)
+    if not (source.is_linear and target.is_linear):
+        return None
+    if target.scale is None:
+        return source.factor / target.factor, source.offset / target.factor
+    return (
+        source.factor * target.scale,
+        source.offset * target.scale + target.shift,
+    )
+
+
+def convert_many(measure, values, from_unit=None, to_unit=None):
+    """
+    Convert many numbers from ``from_unit`` to ``to_unit`` at once.
+
+    ``values`` may be any iterable of numbers or a buffer of doubles. Returns
+    an ``array('d')``, or a NumPy array when given one. No measure objects
+    are built for linear units.
+    """
+    source = get_conversion(measure, from_unit or measure.STANDARD_UNIT)
+    target = get_conversion(measure, to_unit or measure.STANDARD_UNIT)
+
+    if not (source.is_linear and target.is_linear):
+        return array(
+            "d",
+            (
+                float(
+                    getattr(get_measurement(measure, value, source.unit), target.unit)
+                )
+                for value in values
+            ),
+        )
+
+    # Go through the standard unit the same way measures do, so the results
+    # match reading the unit attribute of a measure.
+    np = _numpy()
+    if np is not None:
+        if hasattr(values, "__len__"):
+            result = np.asarray(values, dtype="d")
+        else:
+            result = np.fromiter(values, dtype="d")
+        if source.scale is None:
+            result = result * source.factor
+        else:
+            result = (result - source.shift) / source.scale
+        if target.scale is None:
+            if target.factor != 1.0:
+                result /= target.factor
+        else:
+            result *= target.scale
+            result += target.shift
+        if isinstance(values, np.ndarray):
+            return result
+        return array("d", result.tobytes())
+
+    if source.scale is None and target.scale is None:
+        factor, divisor = source.factor, target.factor
+        return array("d", (value * factor / divisor for value in values))
+    return array(
+        "d",
+        (target.from_standard(source.to_standard(value)) for value in values),
+    )
+
+
+@lru_cache(maxsize=None)
+def _load_executor(path):
+    return import_string(path)()
+
+
+def get_executor(executor=None):
+    """
+    Return the executor async helpers hand large chunks to.
+
+    ``executor`` may be an executor, a dotted path to a callable returning
+    one or ``None`` for the ``MEASUREMENT_ASYNC_EXECUTOR`` setting. Executors
+    loaded by path are shared. ``None`` means the default executor of the
+    event loop.
+    """
+    if executor is None:
+        executor = settings.MEASUREMENT_ASYNC_EXECUTOR
+    if isinstance(executor, str):
+        return _load_executor(executor)
+    return executor
+
+
+@receiver(setting_changed)
+def _reset_executors(setting, **kwargs):
+    if setting == "MEASUREMENT_ASYNC_EXECUTOR":
+        _load_executor.cache_clear()
+
+
+async def run_chunk(function, size, executor=None):
+    """
+    Call ``function`` for a chunk of ``size`` values from a coroutine.
+
+    Chunks of at least ``MEASUREMENT_ASYNC_OFFLOAD_SIZE`` values run in
+    :func:`get_executor`; smaller ones run in the event loop, which is then
+    given a chance to run other tasks.
+    """
+    import asyncio
+
+    if size < settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE:
+        result = function()
+        await asyncio.sleep(0)
+        return result
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(get_executor(executor), function)
+
+
+async def aconvert_many(
+    measure, values, from_unit=None, to_unit=None, chunk_size=10000, executor=None
+):
+    """
+    Asynchronous :func:`convert_many`.
+
+    ``values`` are converted ``chunk_size`` at a time with :func:`run_chunk`,
+    so long conversions do not block the event loop. Returns the same types
+    as :func:`convert_many`.
+    """
+    if hasattr(values, "__len__") and hasattr(values, "__getitem__"):
+        chunks = (
+            values[start : start + chunk_size]
+            for start in range(0, len(values), chunk_size)
+        )
+    else:
+        iterator = iter(values)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+
+    results = []
+    for chunk in chunks:
+        results.append(
+            await run_chunk(
+                partial(convert_many, measure, chunk, from_unit, to_unit),
+                len(chunk),
+                executor,
+            )
+        )
+
+    np = _numpy()
+    if np is not None and isinstance(values, np.ndarray):
+        return np.concatenate(results) if results else np.empty(0)
+    converted = array("d")
+    for result in results:
+        converted.extend(result)
+    return converted
+
+
+@lru_cache(maxsize=None)
+def get_scaled_factor(measure, unit, decimal_places):
+    """
+    Return the exact factor from ``unit`` to fixed-point standard units.
+
+    The factor scales to ``10 ** -decimal_places`` standard units and is a
+    :class:`~fractions.Fraction`, or ``None`` if the unit is not linear. It
+    is taken from the decimal representation of the unit's factor, so ``mi``
+    scales by exactly 1609.344 standard units.
+    """
+    conversion = get_conversion(measure, unit)
+    if not conversion.is_linear or conversion.offset:
+        return None
+    return Fraction(repr(conversion.factor)) * 10 ** decimal_places
+
+
+def _to_fraction(value):
+    if isinstance(value, float):
+        # Take floats as the decimal they were written as.
+        return Fraction(repr(value))
+    return Fraction(value)
+
+
+def to_fixed_point(measure, value, unit=None, decimal_places=6):
+    """
+    Convert ``value`` in ``unit`` to a fixed-point integer.
+
+    The result counts ``10 ** -decimal_places`` standard units and is
+    rounded half to even. Integers, decimals, fractions and numeric strings
+    are converted exactly.
+    """
+    unit = unit or measure.STANDARD_UNIT
+    factor = get_scaled_factor(measure, unit, decimal_places)
+    if factor is None:
+        value = float(get_measurement(measure, float(value), unit).standard)
+        factor = 10 ** decimal_places
+    elif type(value) is int and factor.denominator == 1:
+        return value * factor.numerator
+    return round(_to_fraction(value) * factor)
@@ -0,0 +1,353 @@
+import copy
+import operator
+from decimal import Decimal
+from functools import lru_cache
+
+from django.utils.functional import LazyObject, empty, new_method_proxy
+
+from django_measurement.utils import (
+    get_conversion,
+    get_interned_unit,
+    get_measurement,
+    intern_unit,
+    is_bidimensional,
+)
+
+# measurement.base.NUMERIC_TYPES, without importing python-measurement.
+NUMERIC_TYPES = (int, float, Decimal)
+
+
+@lru_cache(maxsize=None)
+def _unit_names(measure):
+    return frozenset(measure.get_units())
+
+
+def _is_measure_attribute(measure, name):
+    if hasattr(measure, name):
+        return True
+    if is_bidimensional(measure):
+        return name in ("primary", "reference") or name in measure.ALIAS or "__" in name
+    return name in _unit_names(measure)
+
+
+class StandardValue(float):
+    """
+    A plain number already in the standard unit of a measurement field.
+
+    Fields save it as is, where other plain numbers are taken to be in the
+    field's ``bare_unit``.
+    """
+
+    __slots__ = ()
+
+
+class LazyMeasurement(LazyObject):
+    """
+    Stand-in for a measure that is only built once it is actually used.
+
+    Holds the raw value in the standard unit of ``measure`` and defers the
+    construction of the measure object until a unit, attribute or operator
+    is first accessed. ``standard`` is answered straight from the raw value.
+    """
+
+    def __init__(self, measure, value, unit=None):
+        self.__dict__["_measure"] = measure
+        self.__dict__["_value"] = value
+        self.__dict__["_unit"] = unit
+        super(LazyMeasurement, self).__init__()
+
+    def _setup(self):
+        self._wrapped = get_measurement(
+            measure=self._measure,
+            value=self._value,
+            original_unit=self._unit,
+        )
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            # Django probes values for hooks like ``resolve_expression``;
+            # answer those without building the measure.
+            if not _is_measure_attribute(self._measure, name):
+                raise AttributeError("Unknown unit type: %s" % name)
+            self._setup()
+        return getattr(self._wrapped, name)
+
+    @property
+    def standard(self):
+        if self._wrapped is empty:
+            return self._value
+        return self._wrapped.standard
+
+    @property
+    def is_materialized(self):
+        return self._wrapped is not empty
+
+    def __repr__(self):
+        if self._wrapped is empty:
+            return "<%s: %s(%s=%s) (unevaluated)>" % (
+                type(self).__name__,
+                self._measure.__name__,
+                self._measure.STANDARD_UNIT,
+                self._value,
+            )
+        return "<%s: %r>" % (type(self).__name__, self._wrapped)
+
+    def __copy__(self):
+        if self._wrapped is empty:
+            return type(self)(self._measure, self._value, self._unit)
+        return copy.copy(self._wrapped)
+
+    def __deepcopy__(self, memo):
+        if self._wrapped is empty:
+            result = type(self)(self._measure, self._value, self._unit)
+            memo[id(self)] = result
+            return result
+        return copy.deepcopy(self._wrapped, memo)
+
+    __le__ = new_method_proxy(operator.le)
+    __ge__ = new_method_proxy(operator.ge)
+
+    __add__ = new_method_proxy(operator.add)
+    __sub__ = new_method_proxy(operator.sub)
+    __mul__ = new_method_proxy(operator.mul)
+    __rmul__ = new_method_proxy(operator.mul)
+    __truediv__ = new_method_proxy(operator.truediv)
+
+
+class CompactMeasurement:
+    """
+    Memory efficient, read-mostly stand-in for a measure.
+
+    Only stores the value in the standard unit and an interned unit id (see
+    :func:`django_measurement.utils.intern_unit`). Unit attributes,
+    comparisons and arithmetic are computed from the standard value with the
+    cached conversion factors; anything else is delegated to a full measure
+    built on demand with :meth:`to_measure`.
+    """
+
+    __slots__ = ("standard", "unit_id")
+
+    def __init__(self, standard, unit_id):
+        self.standard = standard
+        self.unit_id = unit_id
+
+    @classmethod
+    def for_unit(cls, measure, standard, unit=None):
+        return cls(standard, intern_unit(measure, unit))
+
+    @classmethod
+    def from_measure(cls, measure):
+        return cls.for_unit(type(measure), float(measure.standard), measure.unit)
+
+    @property
+    def measure(self):
+        return get_interned_unit(self.unit_id).measure
+
+    # Pretend to be the measure class, so that measures accept compact
+    # values in comparisons and arithmetic, and isinstance checks pass.
+    __class__ = measure
+
+    @property
+    def unit(self):
+        return get_interned_unit(self.unit_id).unit
+
+    @unit.setter
+    def unit(self, value):
+        self.unit_id = intern_unit(self.measure, value)
+
+    @property
+    def value(self):
+        return self._convert_to(get_interned_unit(self.unit_id))
+
+    def _convert_to(self, conversion):
+        if conversion.is_linear:
+            return conversion.from_standard(self.standard)
+        return getattr(self.to_measure(), conversion.unit)
+
+    def to_measure(self):
+        """Return the full measure this value stands for."""
+        return get_measurement(
+            measure=self.measure, value=self.standard, original_unit=self.unit
+        )
+
+    def __getattr__(self, name):
+        if name in CompactMeasurement.__slots__:
+            raise AttributeError(name)
+        measure = self.measure
+        if not _is_measure_attribute(measure, name):
+            raise AttributeError("Unknown unit type: %s" % name)
+        if not hasattr(measure, name) and name not in ("primary", "reference"):
+            return self._convert_to(get_conversion(measure, name))
+        return getattr(self.to_measure(), name)
+
+    def __reduce__(self):
+        return (
+            _unpickle_compact_measurement,
+            (self.measure, self.standard, self.unit),
+        )
+
+    def __repr__(self):
+        return "%s(%s=%s)" % (self.measure.__name__, self.unit, self.value)
+
+    def __str__(self):
+        return "%s %s" % (self.value, self.unit)
+
+    def _standard_of(self, other):
+        if isinstance(other, self.measure):
+            return other.standard
+        return None
+
+    def __eq__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            return NotImplemented
+        return self.standard == standard
+
+    def __lt__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            return NotImplemented
+        return self.standard < standard
+
+    def __le__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            return NotImplemented
+        return self.standard <= standard
+
+    def __gt__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            return NotImplemented
+        return self.standard > standard
+
+    def __ge__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            return NotImplemented
+        return self.standard >= standard
+
+    __hash__ = None
+
+    def __add__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            raise TypeError(
+                "%(class)s must be added with %(class)s"
+                % {"class": self.measure.__name__}
+            )
+        return CompactMeasurement(self.standard + standard, self.unit_id)
+
+    def __sub__(self, other):
+        standard = self._standard_of(other)
+        if standard is None:
+            raise TypeError(
+                "%(class)s must be subtracted from %(class)s"
+                % {"class": self.measure.__name__}
+            )
+        return CompactMeasurement(self.standard - standard, self.unit_id)
+
+    def __mul__(self, other):
+        if not isinstance(other, NUMERIC_TYPES):
+            raise TypeError(
+                "%(class)s must be multiplied with number"
+                % {"class": self.measure.__name__}
+            )
+        return CompactMeasurement(self.standard * other, self.unit_id)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        standard = self._standard_of(other)
+        if standard is not None:
+            return self.standard / standard
+        if not isinstance(other, NUMERIC_TYPES):
+            raise TypeError(
+                "%(class)s must be divided with number or %(class)s"
+                % {"class": self.measure.__name__}
+            )
+        return CompactMeasurement(self.standard / other, self.unit_id)
+
+    def __bool__(self):
+        return bool(self.standard)
+
+
+def _unpickle_compact_measurement(measure, standard, unit):
+    return CompactMeasurement.for_unit(measure, standard, unit)
+
+
+def _read_only(self, *args):
+    raise AttributeError("%s values are read-only." % type(self).__name__)
+
+
+def _thaw(self, memo=None):
+    # Copies are regular, mutable measures.
+    measure = self.__class__
+    m = measure.__new__(measure)
+    for name, value in self.__dict__.items():
+        m.__dict__[name] = _thaw(value) if is_frozen(value) else value
+    return m
+
+
+def _reduce_thawed(self, protocol):
+    # Pickles are regular, mutable measures too.
+    return _thaw(self).__reduce_ex__(protocol)
+
+
+@lru_cache(maxsize=None)
+def frozen_class(measure):
+    """
+    Return the read-only subclass of the measure class ``measure``.
+
+    Setting attributes raises ``AttributeError``; in-place operators return
+    a new measure instead, like they do for numbers. ``__class__`` is the
+    measure class, so arithmetic, comparisons, copies and pickling produce
+    regular measures.
+    """
+    return type(
+        "Frozen%s" % measure.__name__,
+        (measure,),
+        {
+            "__module__": __name__,
+            "__class__": property(lambda self: measure),
+            "__setattr__": _read_only,
+            "__delattr__": _read_only,
+            "__iadd__": measure.__add__,
+            "__isub__": measure.__sub__,
+            "__imul__": measure.__mul__,
+            "__itruediv__": measure.__truediv__,
+            "__copy__": _thaw,
+            "__deepcopy__": _thaw,
+            "__reduce_ex__": _reduce_thawed,
+        },
+    )
+
+
+def is_frozen(value):
+    return type(value) is not value.__class__ and type(value) is frozen_class(
+        value.__class__
+    )
+
+
+def freeze(value):
+    """
+    Return a read-only copy of the measure ``value``.
+
+    Frozen measures can be shared, e.g. between model instances, because
+    nobody can change them; ``copy.copy`` and pickling return a regular
+    measure.
+    """
+    if is_frozen(value):
+        return value
+    if isinstance(value, LazyMeasurement):
+        if value._wrapped is empty:
+            value._setup()
+        value = value._wrapped
+    elif isinstance(value, CompactMeasurement):
+        value = value.to_measure()
+    frozen = object.__new__(frozen_class(value.__class__))
+    for name, attribute in value.__dict__.items():
+        if name in ("primary", "reference"):
+            attribute = freeze(attribute)
+        frozen.__dict__[name] = attribute
+    return frozen
@@ -0,0 +1,29 @@
+import pytest
+from measurement import measures
+
+from tests.models import MeasurementTestModel
+
+
+@pytest.fixture
+def rows():
+    """Three rows of 1, 2 and 3 km, kg and 10, 20 and 30 kph and mph."""
+    for i in (1, 2, 3):
+        MeasurementTestModel.objects.create(
+            measurement_weight=measures.Weight(kg=i),
+            measurement_distance=measures.Distance(km=i),
+            measurement_distance_km=measures.Distance(km=i),
+            measurement_speed=measures.Speed(kph=i * 10),
+            measurement_speed_mph=measures.Speed(mph=i * 10),
+        )
+
+
+@pytest.fixture
+def measurement_rows():
+    """Five rows with a missing distance in the third, ordered by primary key."""
+    for i in range(5):
+        MeasurementTestModel.objects.create(
+            measurement_distance=measures.Distance(km=i) if i != 2 else None,
+            measurement_speed_mph=measures.Speed(mph=i),
+            measurement_temperature=measures.Temperature(c=i),
+        )
+    return MeasurementTestModel.objects.order_by("pk")
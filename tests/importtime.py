@@ -0,0 +1,35 @@
+"""Run ``python -X importtime`` in a fresh interpreter and parse its report."""
+import subprocess
+import sys
+
+CONFIGURE = (
+    "from django.conf import settings\n"
+    "settings.configure(INSTALLED_APPS=['django_measurement'])\n"
+)
+
+
+def import_times(*modules, setup=False):
+    """
+    Import ``modules`` in a new process with only this app installed.
+
+    Django is only set up if ``setup`` is true. Returns a mapping of every
+    imported module to its cumulative import time in microseconds.
+    """
+    code = CONFIGURE
+    if setup:
+        code += "import django\ndjango.setup()\n"
+    code += "".join("import %s\n" % module for module in modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
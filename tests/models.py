@@ -2,7 +2,8 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 from measurement import measures
 
-from django_measurement.models import MeasurementField
+from django_measurement.models import FixedPointMeasurementField, MeasurementField
+from django_measurement.querysets import MeasurementManager
 from tests.custom_measure_base import DegreePerTime, Temperature, Time
 
 
@@ -96,5 +97,83 @@ class MeasurementTestModel(models.Model):
         null=True,
     )
 
+    measurement_distance_lazy = MeasurementField(
+        measurement=measures.Distance,
+        lazy=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_speed_lazy = MeasurementField(
+        measurement=measures.Speed,
+        unit_choices=(("mi__hr", "mph"),),
+        lazy=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_distance_compact = MeasurementField(
+        measurement=measures.Distance,
+        unit_choices=(("km", "km"),),
+        compact=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_speed_compact = MeasurementField(
+        measurement=measures.Speed,
+        unit_choices=(("mi__hr", "mph"),),
+        compact=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_distance_interned = MeasurementField(
+        measurement=measures.Distance,
+        unit_choices=(("km", "km"),),
+        interned=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_speed_interned = MeasurementField(
+        measurement=measures.Speed,
+        unit_choices=(("mi__hr", "mph"),),
+        interned=2,
+        blank=True,
+        null=True,
+    )
+
+    measurement_distance_bare = MeasurementField(
+        measurement=measures.Distance,
+        bare_unit="mi",
+        blank=True,
+        null=True,
+    )
+
+    measurement_distance_stored = MeasurementField(
+        measurement=measures.Distance,
+        unit_choices=(("km", "km"), ("mi", "mi"), ("m", "m")),
+        store_unit=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_speed_stored = MeasurementField(
+        measurement=measures.Speed,
+        store_unit=True,
+        blank=True,
+        null=True,
+    )
+
+    measurement_weight_fixed = FixedPointMeasurementField(
+        measurement=measures.Weight,
+        unit_choices=(("kg", "kg"),),
+        blank=True,
+        null=True,
+    )
+
+    objects = MeasurementManager()
+
     def __str__(self):
         return self.measurement
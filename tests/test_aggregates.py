@@ -0,0 +1,97 @@
+import pytest
+from django.core.exceptions import FieldError
+from measurement import measures
+
+from django_measurement.aggregates import Avg, Max, Min, StdDev, Sum
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+class TestAggregates:
+    @pytest.mark.parametrize(
+        "aggregate, expected",
+        [
+            (Sum, measures.Weight(kg=6)),
+            (Avg, measures.Weight(kg=2)),
+            (Min, measures.Weight(kg=1)),
+            (Max, measures.Weight(kg=3)),
+        ],
+    )
+    def test_returns_measure(self, rows, aggregate, expected):
+        result = MeasurementTestModel.objects.aggregate(
+            value=aggregate("measurement_weight")
+        )["value"]
+
+        assert isinstance(result, measures.Weight)
+        assert result.standard == pytest.approx(expected.standard)
+        assert result.unit == measures.Weight.STANDARD_UNIT
+
+    def test_std_dev(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            value=StdDev("measurement_weight")
+        )["value"]
+
+        assert isinstance(result, measures.Weight)
+        assert result.kg == pytest.approx(0.816496580927726)
+
+    def test_default_unit(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            value=Sum("measurement_distance_km")
+        )["value"]
+
+        assert result.unit == "km"
+        assert result.value == pytest.approx(6.0)
+
+    def test_unit(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            value=Avg("measurement_weight", unit="lb")
+        )["value"]
+
+        assert result.unit == "lb"
+        assert result == measures.Weight(kg=2)
+
+    def test_bidimensional(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            value=Avg("measurement_speed_mph")
+        )["value"]
+
+        assert isinstance(result, measures.Speed)
+        assert result.unit == "mi__hr"
+        assert result.value == pytest.approx(20.0)
+
+    def test_empty(self):
+        result = MeasurementTestModel.objects.aggregate(
+            value=Sum("measurement_weight", unit="lb")
+        )
+
+        assert result["value"] is None
+
+    def test_annotate(self, rows):
+        row = (
+            MeasurementTestModel.objects.values("measurement_temperature")
+            .annotate(total=Sum("measurement_weight"))
+            .get()
+        )
+
+        assert row["total"] == measures.Weight(kg=6)
+
+    @pytest.mark.parametrize("unit", [None, "g"])
+    def test_fixed_point_average(self, unit):
+        for g in ("1.000001", "1.000002"):
+            MeasurementTestModel.objects.create(
+                measurement_weight_fixed=measures.Weight(g=g)
+            )
+
+        result = MeasurementTestModel.objects.aggregate(
+            value=Avg("measurement_weight_fixed", unit=unit)
+        )["value"]
+
+        assert isinstance(result, measures.Weight)
+        assert result.g == pytest.approx(1.0000015, abs=1e-9)
+
+    def test_requires_measurement_field(self, rows):
+        with pytest.raises(FieldError):
+            MeasurementTestModel.objects.aggregate(value=Sum("id"))
@@ -0,0 +1,248 @@
+import asyncio
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+from measurement import measures
+
+from django_measurement import querysets, utils
+from django_measurement.utils import aconvert_many, convert_many, get_executor
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+async_to_sync = pytest.importorskip("asgiref.sync").async_to_sync
+
+
+def run(coroutine_function, *args, **kwargs):
+    # Database calls made through sync_to_async run back in this thread.
+    return async_to_sync(coroutine_function)(*args, **kwargs)
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+async def with_heartbeat(coroutine, module, monkeypatch):
+    """
+    Await ``coroutine`` while another task counts the turns of the event loop.
+
+    Return the result, the number of turns and, for each call of
+    ``module.convert_many``, the number of turns taken before it.
+    """
+    turns = 0
+    seen = []
+    done = asyncio.Event()
+    original = module.convert_many
+
+    def convert_many(*args, **kwargs):
+        seen.append(turns)
+        return original(*args, **kwargs)
+
+    async def heartbeat():
+        nonlocal turns
+        while not done.is_set():
+            turns += 1
+            await asyncio.sleep(0)
+
+    monkeypatch.setattr(module, "convert_many", convert_many)
+    task = asyncio.ensure_future(heartbeat())
+    try:
+        result = await coroutine
+    finally:
+        done.set()
+        await task
+    return result, turns, seen
+
+
+class TestAconvertMany:
+    def test_same_as_convert_many(self):
+        values = [float(i) for i in range(25)]
+
+        result = run(
+            aconvert_many, measures.Distance, values, "mi", "km", chunk_size=10
+        )
+
+        assert isinstance(result, array)
+        assert result == convert_many(measures.Distance, values, "mi", "km")
+
+    def test_iterator(self):
+        result = run(
+            aconvert_many,
+            measures.Temperature,
+            (float(i) for i in range(7)),
+            "c",
+            "f",
+            chunk_size=3,
+        )
+
+        assert list(result) == pytest.approx([32 + 1.8 * i for i in range(7)])
+
+    def test_numpy(self):
+        np = pytest.importorskip("numpy")
+        values = np.arange(25, dtype="d")
+
+        result = run(aconvert_many, measures.Distance, values, "km", chunk_size=10)
+
+        assert isinstance(result, np.ndarray)
+        assert list(result) == list(values * 1000)
+
+    def test_empty(self):
+        assert run(aconvert_many, measures.Distance, []) == array("d")
+
+    @pytest.mark.parametrize("offload_size", [0, 10**9])
+    def test_offload(self, settings, monkeypatch, offload_size):
+        settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE = offload_size
+        threads = set()
+
+        def convert_many(*args):
+            threads.add(threading.get_ident())
+            return original(*args)
+
+        original = utils.convert_many
+        monkeypatch.setattr(utils, "convert_many", convert_many)
+
+        async def convert():
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                await aconvert_many(
+                    measures.Distance, [1.0] * 10, chunk_size=5, executor=executor
+                )
+            return threading.get_ident()
+
+        loop_thread = run(convert)
+
+        assert len(threads) == 1
+        assert (threads != {loop_thread}) is (offload_size == 0)
+
+    def test_process_pool(self, settings):
+        settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE = 0
+        values = [float(i) for i in range(10)]
+
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = run(
+                aconvert_many,
+                measures.Distance,
+                values,
+                "mi",
+                chunk_size=4,
+                executor=executor,
+            )
+
+        assert result == convert_many(measures.Distance, values, "mi")
+
+    @pytest.mark.parametrize("offload_size", [0, 10**9])
+    def test_event_loop_is_not_blocked(self, settings, monkeypatch, offload_size):
+        settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE = offload_size
+        values = [float(i) for i in range(50000)]
+
+        async def blocking():
+            return utils.convert_many(measures.Distance, values, "mi")
+
+        _, blocked, _ = run(with_heartbeat, blocking(), utils, monkeypatch)
+        result, turns, seen = run(
+            with_heartbeat,
+            aconvert_many(measures.Distance, values, "mi", chunk_size=5000),
+            utils,
+            monkeypatch,
+        )
+
+        assert result == convert_many(measures.Distance, values, "mi")
+        assert blocked == 0
+        assert len(seen) == 10
+        # The other task ran between every two chunks.
+        assert all(before < after for before, after in zip(seen, seen[1:]))
+        assert turns > seen[-1]
+
+
+class TestGetExecutor:
+    def test_default(self):
+        assert get_executor() is None
+
+    def test_instance(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        assert get_executor(executor) is executor
+
+    def test_setting(self, settings):
+        settings.MEASUREMENT_ASYNC_EXECUTOR = "concurrent.futures.ThreadPoolExecutor"
+
+        executor = get_executor()
+
+        try:
+            assert isinstance(executor, ThreadPoolExecutor)
+            assert get_executor() is executor
+
+            settings.MEASUREMENT_ASYNC_EXECUTOR = (
+                "concurrent.futures.ThreadPoolExecutor"
+            )
+            reloaded = get_executor()
+            try:
+                assert reloaded is not executor
+            finally:
+                reloaded.shutdown()
+        finally:
+            executor.shutdown()
+
+
+class TestAasUnits:
+    @pytest.mark.parametrize("offload_size", [0, 10**9])
+    def test_same_as_as_units(self, measurement_rows, settings, offload_size):
+        settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE = offload_size
+        units = dict(
+            measurement_distance="mi",
+            measurement_speed_mph="kph",
+            measurement_temperature="f",
+        )
+
+        result = run(collect, measurement_rows.aas_units("id", chunk_size=2, **units))
+
+        assert result == list(measurement_rows.as_units("id", chunk_size=2, **units))
+
+    def test_flat(self, measurement_rows):
+        result = run(
+            collect, measurement_rows.aas_units(measurement_distance="km", flat=True)
+        )
+
+        assert result == [0.0, 1.0, None, 3.0, 4.0]
+
+    def test_named(self, measurement_rows):
+        result = run(
+            collect,
+            measurement_rows.aas_units("id", "measurement_distance", named=True),
+        )
+
+        assert [row.measurement_distance for row in result] == [
+            0.0,
+            1000.0,
+            None,
+            3000.0,
+            4000.0,
+        ]
+
+    def test_arguments_are_checked_eagerly(self, measurement_rows):
+        with pytest.raises(TypeError):
+            measurement_rows.aas_units("id", "measurement_distance", flat=True)
+
+    @pytest.mark.parametrize("offload_size", [0, 10**9])
+    def test_event_loop_is_not_blocked(self, settings, monkeypatch, offload_size):
+        settings.MEASUREMENT_ASYNC_OFFLOAD_SIZE = offload_size
+        MeasurementTestModel.objects.bulk_create(
+            MeasurementTestModel(measurement_distance=measures.Distance(m=i))
+            for i in range(5000)
+        )
+        queryset = MeasurementTestModel.objects.order_by("pk")
+
+        result, turns, seen = run(
+            with_heartbeat,
+            collect(queryset.aas_units(measurement_distance="mi", chunk_size=500)),
+            querysets,
+            monkeypatch,
+        )
+
+        assert len(seen) == 10
+        assert all(before < after for before, after in zip(seen, seen[1:]))
+        assert turns > seen[-1]
+        assert result == list(queryset.as_units(measurement_distance="mi"))
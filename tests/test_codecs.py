@@ -0,0 +1,214 @@
+import json
+import pickle
+
+import pytest
+from django.core import serializers
+from django.test import override_settings
+from measurement import measures
+
+from django_measurement.codecs import (
+    BinaryCodec,
+    CompactCodec,
+    TextCodec,
+    get_codec,
+    unit_table,
+)
+from django_measurement.models import MeasurementField
+from django_measurement.values import CompactMeasurement, LazyMeasurement
+from tests.custom_measure_base import Temperature
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+VALUES = [
+    measures.Distance(km=1.5),
+    measures.Distance(mi=0.1),
+    measures.Weight(lb=-3.25),
+    measures.Speed(mi__hr=2.0),
+    measures.Speed(km__s=1e-3),
+    measures.Temperature(c=21.5),
+    Temperature(f=451.0),
+    measures.Volume(us_pint=1),
+]
+
+codecs = pytest.mark.parametrize(
+    "codec",
+    [TextCodec(), CompactCodec(), BinaryCodec()],
+    ids=lambda c: c.__class__.__name__,
+)
+
+
+def assert_same_measure(a, b):
+    assert type(a) is type(b)
+    assert a.unit == b.unit
+    assert a.standard == pytest.approx(b.standard, rel=1e-15)
+
+
+class TestRoundTrip:
+    @codecs
+    @pytest.mark.parametrize("value", VALUES, ids=repr)
+    def test_round_trip(self, codec, value):
+        decoded = codec.decode(type(value), codec.encode(value))
+
+        assert_same_measure(decoded, value)
+
+    @codecs
+    def test_round_trip_many(self, codec):
+        values = [measures.Distance(km=i) for i in range(100)] + [None]
+
+        decoded = list(codec.decode_many(measures.Distance, codec.encode_many(values)))
+
+        assert decoded[-1] is None
+        for a, b in zip(decoded[:-1], values):
+            assert_same_measure(a, b)
+
+    @codecs
+    def test_lazy_and_compact_values(self, codec):
+        lazy = LazyMeasurement(measures.Distance, 1500.0, unit="km")
+        compact = CompactMeasurement.for_unit(measures.Distance, 1500.0, "km")
+
+        for value in (lazy, compact):
+            decoded = codec.decode(measures.Distance, codec.encode(value))
+
+            assert_same_measure(decoded, measures.Distance(km=1.5))
+
+    @pytest.mark.parametrize("codec", [CompactCodec(), BinaryCodec()])
+    @pytest.mark.parametrize("value", VALUES, ids=repr)
+    def test_binary_round_trip_is_exact(self, codec, value):
+        decoded = codec.decode(type(value), codec.encode(value))
+
+        assert decoded.standard == value.standard
+
+    def test_encode_many_is_lazy(self):
+        def values():
+            yield measures.Distance(km=1)
+            raise AssertionError("consumed too far")
+
+        encoded = TextCodec().encode_many(values())
+
+        assert next(encoded) == "1.0:km"
+
+
+class TestTextCodec:
+    def test_format(self):
+        codec = TextCodec()
+
+        assert codec.encode(measures.Weight(kg=4.0)) == "4.0:kg"
+        assert codec.encode(measures.Speed(mi__hr=2.0)) == "2.0:mi__hr"
+
+    def test_alias(self):
+        codec = TextCodec()
+
+        value = codec.decode(measures.Distance, "2:mile")
+
+        assert value.unit == "mi"
+        assert value.mi == 2.0
+        assert codec.get_conversion(measures.Distance, "mile").unit == "mi"
+
+    def test_no_unit(self):
+        assert TextCodec().decode(measures.Distance, "2.0") is None
+
+    def test_invalid_value(self):
+        with pytest.raises(ValueError):
+            TextCodec().decode(measures.Distance, "two:km")
+
+    def test_invalid_unit(self):
+        with pytest.raises(AttributeError):
+            TextCodec().decode(measures.Distance, "2.0:parsec")
+
+
+class TestCompactCodec:
+    def test_payload(self):
+        standard, unit_id = CompactCodec().encode(measures.Distance(km=2))
+
+        assert standard == 2000.0
+        assert unit_table(measures.Distance)[unit_id] == "km"
+
+    def test_payload_survives_json(self):
+        codec = CompactCodec()
+        value = measures.Speed(mi__hr=30)
+
+        payload = json.loads(json.dumps(codec.encode(value)))
+
+        assert_same_measure(codec.decode(measures.Speed, payload), value)
+
+    def test_unit_ids_are_stable(self):
+        table = unit_table(measures.Distance)
+
+        assert list(table) == sorted(measures.Distance.get_units())
+        assert len(unit_table(measures.Speed)) == len(table) * len(
+            unit_table(measures.Time)
+        )
+
+
+class TestBinaryCodec:
+    def test_record_size(self):
+        assert len(BinaryCodec().encode(measures.Distance(km=2))) == 10
+
+    def test_dumps_loads(self):
+        codec = BinaryCodec()
+        values = [measures.Distance(ft=i) for i in range(1000)]
+
+        data = codec.dumps(values)
+        decoded = list(codec.loads(measures.Distance, memoryview(data)))
+
+        assert len(data) == 10 * len(values)
+        assert [v.standard for v in decoded] == [v.standard for v in values]
+        assert {v.unit for v in decoded} == {"ft"}
+
+    def test_dumps_loads_null(self):
+        codec = BinaryCodec()
+        values = [measures.Distance(km=1), None, measures.Distance(m=0)]
+
+        data = codec.dumps(values)
+
+        assert len(data) == 30
+        assert list(codec.loads(measures.Distance, data)) == values
+
+    def test_pickle(self):
+        codec = pickle.loads(pickle.dumps(BinaryCodec()))
+
+        assert codec.decode(
+            measures.Distance, codec.encode(measures.Distance(km=2))
+        ) == measures.Distance(km=2)
+
+
+class TestGetCodec:
+    def test_default(self):
+        assert isinstance(get_codec(), TextCodec)
+        assert get_codec() is get_codec()
+
+    def test_instance(self):
+        codec = CompactCodec()
+
+        assert get_codec(codec) is codec
+
+    def test_setting(self):
+        with override_settings(MEASUREMENT_CODEC="tests.test_codecs.ShoutingCodec"):
+            assert isinstance(get_codec(), ShoutingCodec)
+
+            instance = MeasurementTestModel(
+                pk=0, measurement_weight=measures.Weight(kg=4.0)
+            )
+            serialized = serializers.serialize("python", [instance])[0]
+
+        assert serialized["fields"]["measurement_weight"] == "4.0 KG"
+        assert isinstance(get_codec(), TextCodec)
+
+
+class ShoutingCodec(TextCodec):
+    separator = " "
+
+    def encode(self, value):
+        return super(ShoutingCodec, self).encode(value).upper()
+
+
+class TestField:
+    def test_to_python_string(self):
+        field = MeasurementField(measurement=measures.Distance)
+
+        value = field.to_python("1.5:km")
+
+        assert_same_measure(value, measures.Distance(km=1.5))
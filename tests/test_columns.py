@@ -0,0 +1,220 @@
+import io
+import math
+import os
+from array import array
+
+import pytest
+from django.core.management import CommandError, call_command
+from measurement import measures
+
+from django_measurement import utils
+from django_measurement.columns import (
+    HEADER,
+    ColumnReader,
+    ColumnWriter,
+    dump_columns,
+    load_columns,
+)
+from tests import custom_measure_base
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+@pytest.fixture
+def column(tmp_path):
+    path = str(tmp_path / "distance.col")
+    with open(path, "wb") as file, ColumnWriter(
+        file, measures.Distance, field="measurement_distance"
+    ) as writer:
+        writer.write([1.0, 2.5])
+        writer.write([None])
+        writer.write_measures([measures.Distance(km=1), None])
+    return path
+
+
+@pytest.fixture
+def rows():
+    for i in range(7):
+        MeasurementTestModel.objects.create(
+            measurement_distance=measures.Distance(km=i) if i != 2 else None,
+            measurement_temperature=measures.Temperature(c=i),
+            measurement_custom_temperature=custom_measure_base.Temperature(c=i),
+        )
+    return MeasurementTestModel.objects.order_by("pk")
+
+
+class TestColumnFile:
+    def test_header(self, column):
+        with ColumnReader(column) as reader:
+            assert len(reader) == 5
+            assert reader.measure is measures.Distance
+            assert reader.unit == "m"
+            assert reader.field == "measurement_distance"
+            assert reader.model is None
+            assert reader.offset % 8 == 0
+        assert os.path.getsize(column) == reader.offset + 5 * 8
+
+    def test_values(self, column):
+        with ColumnReader(column) as reader:
+            values = reader.values.tolist()
+
+        assert values[:2] == [1.0, 2.5]
+        assert math.isnan(values[2])
+        assert values[3] == 1000.0
+        assert math.isnan(values[4])
+
+    def test_zero_copy(self, column):
+        pytest.importorskip("numpy")
+        with ColumnReader(column) as reader:
+            values = reader.numpy()
+
+            assert reader.values.readonly
+            assert not values.flags.owndata
+            assert not values.flags.writeable
+            assert list(values[:2]) == [1.0, 2.5]
+            del values
+
+    def test_in_unit(self, column):
+        with ColumnReader(column) as reader:
+            km = reader.in_unit("km")
+            chunked = reader.in_unit("km", chunk_size=2)
+
+            assert len(km) == 5
+            assert km[1] == 0.0025
+            assert list(km[:2]) == [0.001, 0.0025]
+            assert list(km)[3] == 1.0
+            assert math.isnan(list(chunked)[4])
+            assert [len(chunk) for chunk in chunked.chunks()] == [2, 2, 1]
+
+    def test_chunks(self, column):
+        with ColumnReader(column) as reader:
+            assert [len(chunk) for chunk in reader.chunks(2)] == [2, 2, 1]
+
+    def test_not_a_column_file(self, tmp_path):
+        path = tmp_path / "text.col"
+        path.write_bytes(b"1.0:m\n" * 10)
+
+        with pytest.raises(ValueError):
+            ColumnReader(str(path))
+
+    def test_writer_on_stream(self):
+        file = io.BytesIO()
+        file.write(b"prefix")
+
+        with ColumnWriter(file, measures.Weight) as writer:
+            writer.write(range(3))
+
+        assert HEADER.unpack_from(file.getvalue(), 6)[3] == 3
+        assert file.getvalue().endswith(array("d", [0, 1, 2]).tobytes())
+
+
+class TestDumpAndLoad:
+    fields = [
+        "measurement_distance",
+        "measurement_temperature",
+        "measurement_custom_temperature",
+    ]
+
+    def test_round_trip(self, rows, tmp_path):
+        expected = list(rows.values_list(*self.fields))
+
+        paths = dump_columns(rows, str(tmp_path), self.fields, chunk_size=3)
+        rows.delete()
+        count = load_columns(paths, batch_size=4)
+
+        assert count == 7
+        assert list(rows.values_list(*self.fields)) == expected
+
+    def test_all_measurement_fields(self, rows, tmp_path):
+        paths = dump_columns(rows, str(tmp_path))
+
+        assert len(paths) == len(
+            [
+                field
+                for field in MeasurementTestModel._meta.concrete_fields
+                if hasattr(field, "measurement")
+            ]
+        )
+        assert os.path.basename(paths[0]) == (
+            "tests.measurementtestmodel.measurement_distance.col"
+        )
+
+    def test_standard_values(self, rows, tmp_path):
+        (path,) = dump_columns(rows, str(tmp_path), ["measurement_temperature"])
+
+        with ColumnReader(path) as reader:
+            assert reader.unit == "k"
+            assert reader.model == "tests.MeasurementTestModel"
+            assert list(reader.in_unit("c")) == pytest.approx(list(range(7)))
+            assert list(reader.values) == list(
+                utils.convert_many(measures.Temperature, range(7), "c")
+            )
+
+    def test_not_a_measurement_field(self, rows, tmp_path):
+        with pytest.raises(ValueError):
+            dump_columns(rows, str(tmp_path), ["id"])
+
+    def test_different_lengths(self, rows, tmp_path):
+        paths = dump_columns(rows, str(tmp_path), self.fields[:1])
+        paths += dump_columns(rows[:3], str(tmp_path), self.fields[1:2])
+
+        with pytest.raises(ValueError):
+            load_columns(paths)
+
+    def test_model(self, column):
+        # The file records measurement_distance, but no model.
+        with pytest.raises(ValueError):
+            load_columns([column])
+
+        assert load_columns([column], model=MeasurementTestModel) == 5
+        assert (
+            MeasurementTestModel.objects.filter(
+                measurement_distance__isnull=True
+            ).count()
+            == 2
+        )
+
+    def test_wrong_measure(self, tmp_path):
+        path = str(tmp_path / "weight.col")
+        with open(path, "wb") as file, ColumnWriter(
+            file, measures.Weight, field="measurement_distance"
+        ) as writer:
+            writer.write([1.0])
+
+        with pytest.raises(ValueError):
+            load_columns([path], model=MeasurementTestModel)
+
+
+class TestCommands:
+    def test_dump_and_load(self, rows, tmp_path):
+        expected = list(rows.values_list("measurement_distance", flat=True))
+        out = io.StringIO()
+
+        call_command(
+            "dumpcolumns",
+            "tests.MeasurementTestModel",
+            "measurement_distance",
+            output=str(tmp_path / "export"),
+            chunk_size=2,
+            stdout=out,
+        )
+        rows.delete()
+        paths = out.getvalue().split()
+        call_command("loadcolumns", *paths, stdout=out)
+
+        assert len(paths) == 1
+        assert "Created 7 rows." in out.getvalue()
+        assert list(rows.values_list("measurement_distance", flat=True)) == expected
+
+    def test_errors(self, tmp_path):
+        with pytest.raises(CommandError):
+            call_command("dumpcolumns", "tests.Unknown", output=str(tmp_path))
+        with pytest.raises(CommandError):
+            call_command(
+                "dumpcolumns", "tests.MeasurementTestModel", "id", output=str(tmp_path)
+            )
+        with pytest.raises(CommandError):
+            call_command("loadcolumns", str(tmp_path / "missing.col"))
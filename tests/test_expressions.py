@@ -0,0 +1,101 @@
+import django
+import pytest
+from django.core.exceptions import FieldError
+from django.db.models import Avg, F, Sum
+from measurement import measures
+
+from django_measurement.expressions import UnitConversion
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+class TestUnitConversion:
+    def test_annotate(self, rows):
+        values = MeasurementTestModel.objects.annotate(
+            km=UnitConversion("measurement_distance", "km")
+        ).order_by("km")
+
+        assert [row.km for row in values] == pytest.approx([1.0, 2.0, 3.0])
+
+    def test_aggregate(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            total=Sum(UnitConversion("measurement_distance", "km")),
+            speed=Avg(UnitConversion("measurement_speed", "kph")),
+        )
+
+        assert result["total"] == pytest.approx(6.0)
+        assert result["speed"] == pytest.approx(20.0)
+
+    def test_sql(self, rows):
+        queryset = MeasurementTestModel.objects.annotate(
+            km=UnitConversion("measurement_distance", "km")
+        )
+
+        assert '("tests_measurementtestmodel"."measurement_distance" * ' in str(
+            queryset.query
+        )
+
+    def test_affine_units(self):
+        for c in (-40, 0, 100):
+            MeasurementTestModel.objects.create(
+                measurement_temperature=measures.Temperature(c=c)
+            )
+        queryset = MeasurementTestModel.objects.order_by("measurement_temperature")
+
+        values = queryset.values_list(
+            UnitConversion("measurement_temperature", "f"), flat=True
+        )
+
+        assert list(values) == pytest.approx([-40.0, 32.0, 212.0])
+        assert queryset.filter(measurement_temperature__c__gt=-1).count() == 2
+
+    def test_requires_measurement_field(self, rows):
+        queryset = MeasurementTestModel.objects.annotate(km=UnitConversion("id", "km"))
+
+        with pytest.raises(FieldError):
+            list(queryset)
+
+
+class TestUnitTransform:
+    def test_filter(self, rows):
+        queryset = MeasurementTestModel.objects.filter(measurement_distance__km__gte=2)
+
+        assert queryset.count() == 2
+
+    def test_filter_alias(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__kilometer__lt=1.5
+        )
+
+        assert queryset.count() == 1
+
+    def test_order_by(self, rows):
+        queryset = MeasurementTestModel.objects.order_by("-measurement_speed__kph")
+
+        assert [row.measurement_speed.kph for row in queryset] == pytest.approx(
+            [30.0, 20.0, 10.0]
+        )
+
+    @pytest.mark.skipif(
+        django.VERSION < (3, 2), reason="F() supports transforms since Django 3.2"
+    )
+    def test_f_expression(self, rows):
+        result = MeasurementTestModel.objects.aggregate(
+            total=Sum(F("measurement_distance__mi"))
+        )
+
+        assert result["total"] == pytest.approx(measures.Distance(km=6).mi)
+
+    def test_unknown_unit(self, rows):
+        with pytest.raises(FieldError):
+            MeasurementTestModel.objects.filter(measurement_distance__parsec=1)
+
+    def test_builtin_lookups_take_precedence(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__in=[measures.Distance(km=1)]
+        )
+
+        assert queryset.count() == 1
@@ -1,11 +1,17 @@
+from unittest import mock
+
 import pytest
 from django.core import serializers
 from django.core.exceptions import ValidationError
+from django.db.migrations.state import ModelState, ProjectState
 from django.utils import module_loading
 from measurement import measures
 from measurement.measures import Distance
 
+from django_measurement import models as measurement_models
 from django_measurement.forms import MeasurementField
+from django_measurement.importers import bulk_import
+from django_measurement.values import LazyMeasurement
 from tests.custom_measure_base import DegreePerTime, Temperature, Time
 from tests.forms import (
     BiDimensionalLabelTestForm,
@@ -239,6 +245,7 @@ class TestMeasurementFormField:
             assert str(e) == '"min_value" must be a measure, got float'
 
     def test_float_casting(self, caplog):
+        measurement_models.reset_guessed_unit_counts()
         m = MeasurementTestModel(
             measurement_distance=float(2000),
             measurement_distance_km=2,
@@ -280,3 +287,284 @@ class TestMeasurementFormField:
         bi_dim_form = BiDimensionalLabelTestForm()
         assert ("c__ms", u"°C/ms") in bi_dim_form.fields["simple"].fields[1].choices
         assert ("c__Ps", u"°C/Ps") in bi_dim_form.fields["simple"].fields[1].choices
+
+
+class TestIterValues:
+    def test_iter_values(self):
+        MeasurementTestModel.objects.create(measurement_distance=Distance(km=1))
+        MeasurementTestModel.objects.create(measurement_distance=None)
+        MeasurementTestModel.objects.create(measurement_distance=Distance(km=2.5))
+        field = MeasurementTestModel._meta.get_field("measurement_distance")
+        queryset = MeasurementTestModel.objects.order_by("pk")
+
+        assert list(field.iter_values(queryset=queryset)) == [1000.0, None, 2500.0]
+        assert list(field.iter_values("km", queryset, chunk_size=2)) == [
+            1.0,
+            None,
+            2.5,
+        ]
+
+    def test_default_unit(self):
+        MeasurementTestModel.objects.create(measurement_distance_km=Distance(m=500))
+        field = MeasurementTestModel._meta.get_field("measurement_distance_km")
+
+        assert list(field.iter_values()) == [0.5]
+
+
+class TestBareNumbers:
+    def test_bare_unit(self, caplog):
+        field = measurement_models.MeasurementField(
+            measurement=measures.Distance, bare_unit="mile"
+        )
+
+        value = field.to_python(2)
+
+        assert value == Distance(mi=2)
+        assert value.unit == "mi"
+        assert not caplog.records
+
+    def test_bare_unit_saved(self, caplog):
+        obj = MeasurementTestModel.objects.create(measurement_distance_bare=5)
+        obj.refresh_from_db()
+
+        assert obj.measurement_distance_bare == Distance(mi=5)
+        assert MeasurementTestModel.objects.filter(measurement_distance_bare=5).exists()
+        assert MeasurementTestModel.objects.filter(
+            measurement_distance_bare__in=[5], measurement_distance_bare__gt_km=8
+        ).exists()
+        assert not caplog.records
+
+    def test_bare_unit_measures_and_imports(self):
+        bulk_import(
+            MeasurementTestModel,
+            [
+                {"measurement_distance_bare": 2},
+                {"measurement_distance_bare": Distance(m=3)},
+            ],
+        )
+
+        assert list(
+            MeasurementTestModel.objects.order_by("pk").values_list(
+                "measurement_distance_bare", flat=True
+            )
+        ) == [Distance(mi=2), Distance(m=3)]
+
+    def test_bare_unit_fixed_point(self):
+        field = measurement_models.FixedPointMeasurementField(
+            measurement=measures.Weight, bare_unit="kg", decimal_places=0
+        )
+
+        assert field.get_prep_value(5) == 5000
+        assert field.get_prep_value(measures.Weight(kg=5)) == 5000
+
+    def test_bare_unit_deconstruct(self):
+        field = measurement_models.MeasurementField(
+            measurement=measures.Distance, bare_unit="km"
+        )
+
+        assert field.deconstruct()[3]["bare_unit"] == "km"
+
+    def test_invalid_bare_unit(self):
+        with pytest.raises(AttributeError):
+            measurement_models.MeasurementField(
+                measurement=measures.Distance, bare_unit="parsec"
+            )
+
+    def test_guessed_unit_warned_once(self, caplog):
+        measurement_models.reset_guessed_unit_counts()
+        field = MeasurementTestModel._meta.get_field("measurement_distance_km")
+
+        for value in range(3):
+            assert field.to_python(value) == Distance(km=value)
+
+        assert len(caplog.records) == 1
+        assert measurement_models.guessed_unit_counts() == {
+            "tests.models.MeasurementTestModel.measurement_distance_km": 3
+        }
+
+        measurement_models.reset_guessed_unit_counts()
+        field.to_python(1)
+
+        assert len(caplog.records) == 2
+
+
+class TestStoreUnit:
+    def test_unit_is_kept(self, django_assert_num_queries):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2),
+            measurement_speed_stored=measures.Speed(mi__hr=30),
+        )
+
+        with django_assert_num_queries(1):
+            obj = MeasurementTestModel.objects.get(pk=obj.pk)
+            distance = obj.measurement_distance_stored
+            speed = obj.measurement_speed_stored
+
+        assert distance.unit == "mi"
+        assert distance == Distance(mi=2)
+        assert speed.unit == "mi__hr"
+        assert speed.mi__hr == pytest.approx(30)
+
+    def test_unit_column(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(m=5)
+        )
+        field = MeasurementTestModel._meta.get_field("measurement_distance_stored")
+
+        assert obj.measurement_distance_stored_unit == "m"
+        assert field.get_unit_name(Distance(mile=1)) == "mi"
+
+    def test_unit_not_in_choices(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(ft=1000)
+        )
+        obj.refresh_from_db()
+
+        assert obj.measurement_distance_stored_unit == "ft"
+        assert obj.measurement_distance_stored.unit == "ft"
+        assert obj.measurement_distance_stored == Distance(ft=1000)
+
+    def test_unit_does_not_depend_on_choices(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2)
+        )
+        field = MeasurementTestModel._meta.get_field("measurement_distance_stored")
+
+        with mock.patch.object(field, "unit_choices", (("m", "m"), ("mi", "mi"))):
+            obj = MeasurementTestModel.objects.get(pk=obj.pk)
+            assert obj.measurement_distance_stored.unit == "mi"
+
+    def test_none(self):
+        obj = MeasurementTestModel.objects.create()
+        obj.refresh_from_db()
+
+        assert obj.measurement_distance_stored is None
+        assert obj.measurement_distance_stored_unit is None
+
+    def test_change_unit(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(km=2)
+        )
+        obj.measurement_distance_stored = Distance(m=300)
+        obj.save()
+        obj = MeasurementTestModel.objects.get(pk=obj.pk)
+
+        assert obj.measurement_distance_stored.unit == "m"
+        assert obj.measurement_distance_stored.m == 300
+
+    def test_resave_without_access(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2)
+        )
+        MeasurementTestModel.objects.get(pk=obj.pk).save()
+        obj = MeasurementTestModel.objects.get(pk=obj.pk)
+
+        assert obj.measurement_distance_stored.unit == "mi"
+
+    def test_bulk_create(self):
+        MeasurementTestModel.objects.bulk_create(
+            [
+                MeasurementTestModel(measurement_distance_stored=Distance(mi=i))
+                for i in range(3)
+            ]
+        )
+
+        assert [
+            obj.measurement_distance_stored.unit
+            for obj in MeasurementTestModel.objects.all()
+        ] == ["mi"] * 3
+
+    def test_deferred(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2)
+        )
+        obj = MeasurementTestModel.objects.only("pk").get(pk=obj.pk)
+
+        assert obj.measurement_distance_stored.unit == "mi"
+
+    def test_unit_column_deferred(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2)
+        )
+        obj = MeasurementTestModel.objects.only("measurement_distance_stored").get(
+            pk=obj.pk
+        )
+
+        assert obj.measurement_distance_stored.unit == "mi"
+
+        obj.measurement_distance_stored = Distance(m=3)
+
+        assert obj.measurement_distance_stored_unit == "m"
+
+    def test_lazy(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance_stored")
+        obj = MeasurementTestModel.objects.create(
+            measurement_distance_stored=Distance(mi=2)
+        )
+        obj = MeasurementTestModel.objects.get(pk=obj.pk)
+
+        with mock.patch.object(field, "lazy", True):
+            value = obj.measurement_distance_stored
+
+        assert isinstance(value, LazyMeasurement)
+        assert not value.is_materialized
+        assert value.unit == "mi"
+
+    def test_values_list(self):
+        MeasurementTestModel.objects.create(measurement_distance_stored=Distance(mi=2))
+
+        value = MeasurementTestModel.objects.values_list(
+            "measurement_distance_stored", flat=True
+        ).get()
+
+        assert type(value) is Distance
+        assert value == Distance(mi=2)
+        assert value.unit == "km"
+        row = MeasurementTestModel.objects.values("measurement_distance_stored").get()
+        assert type(row["measurement_distance_stored"]) is Distance
+
+    def test_deconstruct(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance_stored")
+        unit_field = MeasurementTestModel._meta.get_field(
+            "measurement_distance_stored_unit"
+        )
+
+        assert field.deconstruct()[3]["store_unit"] is True
+        name, path, args, kwargs = unit_field.deconstruct()
+        assert path == "django_measurement.models.MeasurementUnitField"
+        assert unit_field.max_length == 64
+        assert kwargs == {"measurement_field": "measurement_distance_stored"}
+
+    def test_migration_state(self):
+        state = ProjectState()
+        state.add_model(ModelState.from_model(MeasurementTestModel))
+        model = state.apps.get_model("tests", "MeasurementTestModel")
+
+        names = [field.name for field in model._meta.fields]
+        assert names.count("measurement_distance_stored_unit") == 1
+
+
+class TestMeasureInfo:
+    def test_resolved_with_model(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance_km")
+
+        assert "measure_info" in field.__dict__
+        assert field.measure_info.default_unit == "km"
+        assert field.get_default_unit() == "km"
+
+    def test_unbound_field(self):
+        field = measurement_models.MeasurementField(measurement=measures.Speed)
+
+        assert field.get_default_unit() == "m__s"
+        assert field.from_db_value(2.0, None, None) == measures.Speed(m__s=2.0)
+
+    def test_measurement_class_is_resolved_on_first_use(self):
+        with pytest.warns(DeprecationWarning):
+            field = measurement_models.MeasurementField(
+                measurement_class="Distance", bare_unit="mile"
+            )
+
+        assert "measurement" not in field.__dict__
+        assert field.measurement is Distance
+        assert field.bare_unit == "mi"
+        assert field.widget_args["measurement"] is Distance
@@ -0,0 +1,153 @@
+from decimal import Decimal
+
+import pytest
+from django.db.models import BigIntegerField, ExpressionWrapper, F
+from hypothesis import given, strategies as st
+from measurement import measures
+
+from django_measurement.aggregates import Sum
+from django_measurement.expressions import UnitConversion
+from django_measurement.models import FixedPointMeasurementField
+from django_measurement.utils import to_fixed_point
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+field = FixedPointMeasurementField(measurement=measures.Distance)
+
+# Counts of micro-units that survive the trip through a float standard value.
+micro_units = st.integers(min_value=-(2**51), max_value=2**51)
+
+
+class TestToFixedPoint:
+    @given(st.integers(min_value=-(10**12), max_value=10**12))
+    def test_integers_are_exact(self, value):
+        assert to_fixed_point(measures.Distance, value, "km") == value * 10**9
+        assert to_fixed_point(measures.Distance, value, "mi") == value * 1609344000
+
+    @given(st.decimals(places=6, min_value=-(10**9), max_value=10**9))
+    def test_decimals_are_exact(self, value):
+        assert to_fixed_point(measures.Distance, value) == int(value.scaleb(6))
+
+    @given(st.decimals(places=3, min_value=-(10**6), max_value=10**6))
+    def test_decimals_in_other_units_are_exact(self, value):
+        expected = value * Decimal("1609.344") * 10**6
+
+        assert to_fixed_point(measures.Distance, value, "mi") == expected
+        assert to_fixed_point(measures.Distance, str(value), "mi") == expected
+
+    def test_floats_are_read_as_written(self):
+        assert to_fixed_point(measures.Distance, 0.1, "mi") == 160934400
+        assert to_fixed_point(measures.Distance, 1.0000005) == 1000000
+        assert to_fixed_point(measures.Distance, 1.0000015) == 1000002
+
+    def test_decimal_places(self):
+        assert to_fixed_point(measures.Weight, "1.5", "kg", decimal_places=0) == 1500
+
+    def test_nonlinear_unit(self):
+        assert to_fixed_point(measures.Temperature, 20, "c") == 293150000
+
+
+class TestField:
+    @given(micro_units)
+    def test_round_trip(self, value):
+        assert field.get_prep_value(field.from_db_value(value, None, None)) == value
+
+    @given(micro_units)
+    def test_to_decimal(self, value):
+        measure = field.from_db_value(value, None, None)
+
+        assert field.to_decimal(measure) == Decimal(value).scaleb(-6)
+
+    @given(st.decimals(places=6, min_value=-(10**6), max_value=10**6))
+    def test_prep_value_of_measures(self, value):
+        measure = measures.Distance(m=value)
+
+        assert field.get_prep_value(measure) == int(value.scaleb(6))
+
+    def test_internal_type(self):
+        assert field.get_internal_type() == "BigIntegerField"
+
+    def test_deconstruct(self):
+        field = FixedPointMeasurementField(
+            measurement=measures.Weight, decimal_places=3
+        )
+
+        name, path, args, kwargs = field.deconstruct()
+        assert path == "django_measurement.models.FixedPointMeasurementField"
+        assert kwargs["decimal_places"] == 3
+        assert "decimal_places" not in (
+            FixedPointMeasurementField(measurement=measures.Weight).deconstruct()[3]
+        )
+
+
+class TestStorage:
+    def test_save_and_load(self):
+        obj = MeasurementTestModel.objects.create(
+            measurement_weight_fixed=measures.Weight(kg=Decimal("1.234567"))
+        )
+
+        stored = MeasurementTestModel.objects.values_list(
+            ExpressionWrapper(
+                F("measurement_weight_fixed"), output_field=BigIntegerField()
+            ),
+            flat=True,
+        ).get()
+        obj.refresh_from_db()
+
+        assert stored == 1234567000
+        assert obj.measurement_weight_fixed == measures.Weight(kg=1.234567)
+        assert obj.measurement_weight_fixed.unit == "kg"
+
+    def test_lookups(self):
+        for kg in (1, 2, 3):
+            MeasurementTestModel.objects.create(
+                measurement_weight_fixed=measures.Weight(kg=kg)
+            )
+
+        queryset = MeasurementTestModel.objects.all()
+        assert queryset.filter(measurement_weight_fixed__gte_kg=2).count() == 2
+        assert (
+            queryset.filter(measurement_weight_fixed=measures.Weight(g=2000)).count()
+            == 1
+        )
+        assert queryset.filter(measurement_weight_fixed__kg__lt=1.5).count() == 1
+
+    def test_aggregates(self):
+        for kg in ("0.1", "0.2"):
+            MeasurementTestModel.objects.create(
+                measurement_weight_fixed=measures.Weight(kg=Decimal(kg))
+            )
+
+        result = MeasurementTestModel.objects.aggregate(
+            total=Sum("measurement_weight_fixed"),
+            total_lb=Sum("measurement_weight_fixed", unit="lb"),
+        )
+
+        assert result["total"] == measures.Weight(g=300)
+        assert result["total_lb"].unit == "lb"
+        assert result["total_lb"].g == pytest.approx(300)
+
+    def test_unit_conversion(self):
+        MeasurementTestModel.objects.create(
+            measurement_weight_fixed=measures.Weight(kg=2)
+        )
+
+        value = MeasurementTestModel.objects.values_list(
+            UnitConversion("measurement_weight_fixed", unit="kg"), flat=True
+        ).get()
+
+        assert value == pytest.approx(2)
+
+    def test_streaming(self):
+        MeasurementTestModel.objects.create(
+            measurement_weight_fixed=measures.Weight(kg=2)
+        )
+
+        assert list(
+            MeasurementTestModel.objects.as_units(measurement_weight_fixed="kg")
+        ) == [(2.0,)]
+        field = MeasurementTestModel._meta.get_field("measurement_weight_fixed")
+        assert list(field.iter_values("g")) == [2000.0]
@@ -0,0 +1,252 @@
+import copy
+
+import pytest
+from django import forms as django_forms
+from django.apps import apps
+from django.utils import translation
+from measurement import measures
+
+from django_measurement import forms
+from django_measurement.forms import (
+    BaseMeasurementFormSet,
+    BaseMeasurementModelFormSet,
+    MeasurementField,
+    MeasurementWidget,
+    clean_many,
+    get_unit_choices,
+)
+from django_measurement.values import CompactMeasurement, LazyMeasurement
+from tests.models import MeasurementTestModel
+
+
+class TestUnitChoicesCache:
+    def test_cached(self):
+        forms.clear_unit_choices_cache()
+
+        choices = get_unit_choices(measures.Speed, "/")
+
+        assert ("mi__hr", "mi/hr") in choices
+        assert get_unit_choices(measures.Speed, "/") is choices
+        assert MeasurementField(measures.Speed).fields[1].choices == list(choices)
+
+    def test_separator(self):
+        assert ("mi__hr", "mi per hr") in get_unit_choices(measures.Speed, " per ")
+
+    def test_language(self):
+        forms.clear_unit_choices_cache()
+
+        with translation.override("de"):
+            get_unit_choices(measures.Weight)
+        with translation.override("fr"):
+            get_unit_choices(measures.Weight)
+
+        assert len(forms._unit_choices_cache) == 2
+
+    def test_cleared_on_language_settings(self, settings):
+        get_unit_choices(measures.Weight)
+
+        settings.LANGUAGES = [("en", "English")]
+
+        assert not forms._unit_choices_cache
+
+    def test_warmed_on_ready(self):
+        forms.clear_unit_choices_cache()
+        apps.get_app_config("django_measurement").ready()
+
+        keys = {measurement for measurement, _, _ in forms._unit_choices_cache}
+        assert measures.Temperature in keys
+        assert measures.Speed in keys
+
+
+class TestMeasurementWidget:
+    def test_standard_unit(self):
+        widget = MeasurementWidget(unit_choices=get_unit_choices(measures.Distance))
+
+        assert widget.decompress(measures.Distance(km=1)) == [1000.0, "m"]
+
+    def test_fallback_unit_is_first_choice(self):
+        widget = MeasurementWidget(unit_choices=(("mi", "mi"), ("km", "km")))
+
+        for _ in range(5):
+            assert widget.decompress(measures.Distance(mi=2)) == [2.0, "mi"]
+        assert widget.fallback_unit == "mi"
+
+    def test_unit_choices_can_be_replaced(self):
+        widget = MeasurementWidget(unit_choices=(("mi", "mi"),))
+        widget.unit_choices = (("km", "km"),)
+
+        assert widget.decompress(measures.Distance(km=2)) == [2.0, "km"]
+
+    def test_empty(self):
+        widget = MeasurementWidget(unit_choices=(("km", "km"),))
+
+        assert widget.decompress(None) == [None, None]
+
+    def test_decompress_many(self):
+        values = [
+            measures.Distance(km=1),
+            None,
+            measures.Distance(mi=0.1),
+            LazyMeasurement(measures.Distance, 2.5),
+            CompactMeasurement.for_unit(measures.Distance, 0.3),
+        ]
+        widget = MeasurementWidget(unit_choices=(("mi", "mi"), ("km", "km")))
+
+        assert widget.decompress_many(values) == [
+            widget.decompress(value) for value in values
+        ]
+
+    def test_decompress_many_bidimensional_and_symbolic(self):
+        speed = MeasurementWidget(unit_choices=(("km__hr", "km/hr"),))
+        temperature = MeasurementWidget(unit_choices=(("c", "c"),))
+        speeds = [measures.Speed(mph=i) for i in range(3)]
+        temperatures = [measures.Temperature(k=i) for i in range(3)]
+
+        assert speed.decompress_many(speeds) == [speed.decompress(v) for v in speeds]
+        assert temperature.decompress_many(temperatures) == [
+            temperature.decompress(v) for v in temperatures
+        ]
+
+
+class ReadingForm(django_forms.Form):
+    distance = MeasurementField(
+        measures.Distance,
+        min_value=measures.Distance(m=0),
+        max_value=measures.Distance(km=10),
+        unit_choices=(("km", "km"), ("mi", "mi")),
+    )
+    temperature = MeasurementField(
+        measures.Temperature,
+        unit_choices=(("c", "c"), ("f", "f")),
+        required=False,
+    )
+
+
+def formset_data(rows):
+    data = {"form-TOTAL_FORMS": len(rows), "form-INITIAL_FORMS": 0}
+    for i, row in enumerate(rows):
+        for name, (value, unit) in row.items():
+            data["form-%d-%s_0" % (i, name)] = value
+            data["form-%d-%s_1" % (i, name)] = unit
+    return data
+
+
+ROWS = [
+    {"distance": ("1", "km"), "temperature": ("20", "c")},
+    {"distance": ("2.5", "mi"), "temperature": ("68", "f")},
+    {"distance": ("3", "km"), "temperature": ("", "")},
+    {"distance": ("11", "km"), "temperature": ("1", "c")},
+    {"distance": ("-1", "mi"), "temperature": ("1", "c")},
+    {"distance": ("abc", "km"), "temperature": ("1", "c")},
+    {"distance": ("1", "furlong"), "temperature": ("1", "c")},
+    {"distance": ("", ""), "temperature": ("1", "c")},
+    {"distance": ("nan", "km"), "temperature": ("1", "c")},
+]
+
+
+class TestMeasurementFormSet:
+    def formsets(self, rows, **kwargs):
+        data = formset_data(rows)
+        per_row = django_forms.formset_factory(ReadingForm, **kwargs)(data)
+        batched = django_forms.formset_factory(
+            ReadingForm, formset=BaseMeasurementFormSet, **kwargs
+        )(data)
+        return per_row, batched
+
+    def test_same_as_per_row(self):
+        per_row, batched = self.formsets(ROWS)
+
+        assert batched.is_valid() is per_row.is_valid() is False
+        assert batched.errors == per_row.errors
+        assert [form.cleaned_data for form in batched] == [
+            form.cleaned_data for form in per_row
+        ]
+        assert batched[1].cleaned_data["distance"] == measures.Distance(mi=2.5)
+        assert batched[1].cleaned_data["distance"].unit == "mi"
+
+    def test_valid_rows_skip_clean(self, monkeypatch):
+        _, batched = self.formsets(ROWS[:3])
+        cleaned = []
+        monkeypatch.setattr(
+            MeasurementField, "compress", lambda self, data: cleaned.append(data)
+        )
+
+        assert batched.is_valid()
+        assert cleaned == []
+
+    def test_invalid_rows_are_cleaned(self):
+        _, batched = self.formsets(ROWS[3:4])
+
+        assert not batched.is_valid()
+        assert batched[0].errors == {
+            "distance": [
+                "Ensure this value is less than or equal to 10.0 km.",
+            ]
+        }
+
+    def test_lazy_measurements(self):
+        data = formset_data(ROWS[:3])
+        formset_class = django_forms.formset_factory(
+            ReadingForm,
+            formset=type(
+                "LazyFormSet", (BaseMeasurementFormSet,), {"lazy_measurements": True}
+            ),
+        )
+        formset = formset_class(data)
+
+        assert formset.is_valid()
+        distance = formset[1].cleaned_data["distance"]
+        assert isinstance(distance, LazyMeasurement)
+        assert distance == measures.Distance(mi=2.5)
+        assert distance.unit == "mi"
+        assert formset[2].cleaned_data["temperature"] is None
+
+    @pytest.mark.django_db
+    def test_model_formset(self):
+        formset_class = django_forms.modelformset_factory(
+            MeasurementTestModel,
+            formset=BaseMeasurementModelFormSet,
+            fields=["measurement_distance_km"],
+        )
+        data = {"form-TOTAL_FORMS": 2, "form-INITIAL_FORMS": 0}
+        data.update(
+            {
+                "form-0-measurement_distance_km_0": "2",
+                "form-0-measurement_distance_km_1": "km",
+                "form-1-measurement_distance_km_0": "1500",
+                "form-1-measurement_distance_km_1": "km",
+            }
+        )
+        formset = formset_class(data, queryset=MeasurementTestModel.objects.none())
+
+        assert not formset.is_valid()
+        assert formset[0].cleaned_data["measurement_distance_km"] == measures.Distance(
+            km=2
+        )
+        assert "measurement_distance_km" in formset[1].errors
+
+
+class TestCleanMany:
+    def test_clean_many(self):
+        field = ReadingForm.base_fields["distance"]
+        values = [["1", "km"], ["20", "km"], ["x", "km"], ["2", "mi"]]
+
+        cleaned = clean_many([field] * len(values), values)
+
+        assert cleaned == {0: measures.Distance(km=1), 3: measures.Distance(mi=2)}
+        assert cleaned[3] == field.clean(values[3])
+
+    def test_extra_validators_fall_back(self):
+        field = MeasurementField(
+            measures.Distance, validators=[lambda value: None], required=False
+        )
+
+        assert clean_many([field], [["1", "km"]]) == {}
+
+    def test_deepcopy_copies_choices(self):
+        field = ReadingForm.base_fields["distance"]
+        copied = copy.deepcopy(field)
+
+        assert copied.fields[1].choices == field.fields[1].choices
+        assert copied.fields[1]._choices is not field.fields[1]._choices
+        assert copied.widget.widgets[1] is not field.widget.widgets[1]
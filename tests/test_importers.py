@@ -0,0 +1,110 @@
+from unittest import mock
+
+import pytest
+from measurement import measures
+
+from django_measurement.importers import BulkImporter, bulk_import
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+def saved(fieldname):
+    return list(
+        MeasurementTestModel.objects.order_by("pk").values_list(fieldname, flat=True)
+    )
+
+
+class TestBulkImport:
+    def test_units(self):
+        rows = [
+            {"measurement_distance": 1, "measurement_distance_km": "2.5"},
+            {"measurement_distance": ("3", "mi"), "measurement_distance_km": None},
+            {"measurement_distance": measures.Distance(ft=1)},
+            {"measurement_distance": ""},
+        ]
+
+        count = bulk_import(MeasurementTestModel, iter(rows))
+
+        assert count == 4
+        assert saved("measurement_distance") == [
+            measures.Distance(m=1),
+            measures.Distance(mi=3),
+            measures.Distance(ft=1),
+            None,
+        ]
+        assert saved("measurement_distance_km")[:2] == [measures.Distance(km=2.5), None]
+
+    def test_import_units(self):
+        bulk_import(
+            MeasurementTestModel,
+            [{"measurement_speed": 30, "measurement_temperature": 20}],
+            units={"measurement_speed": "mph", "measurement_temperature": "c"},
+        )
+
+        obj = MeasurementTestModel.objects.get()
+        assert obj.measurement_speed.mph == pytest.approx(30)
+        assert obj.measurement_temperature.c == pytest.approx(20)
+
+    def test_unit_columns(self):
+        rows = (
+            {"measurement_weight": str(i), "weight_unit": unit}
+            for i, unit in enumerate(["kg", "lb", "g"])
+        )
+
+        bulk_import(
+            MeasurementTestModel,
+            rows,
+            unit_columns={"measurement_weight": "weight_unit"},
+        )
+
+        assert saved("measurement_weight") == [
+            measures.Weight(kg=0),
+            measures.Weight(lb=1),
+            measures.Weight(g=2),
+        ]
+
+    def test_batches(self, django_assert_num_queries):
+        rows = ({"measurement_distance": i} for i in range(25))
+
+        with django_assert_num_queries(3):
+            count = bulk_import(MeasurementTestModel, rows, batch_size=10)
+
+        assert count == 25
+        assert [d.m for d in saved("measurement_distance")] == list(range(25))
+
+    def test_batches_are_streamed(self):
+        importer = BulkImporter(MeasurementTestModel, batch_size=2)
+
+        def rows():
+            yield {"measurement_distance": 1}
+            yield {"measurement_distance": 2}
+            raise AssertionError("consumed too far")
+
+        batch = next(importer.batches(rows()))
+
+        assert [obj.measurement_distance for obj in batch] == [1.0, 2.0]
+
+    def test_no_measures_built(self):
+        rows = (
+            {"measurement_speed_mph": i, "measurement_distance": i} for i in range(10)
+        )
+
+        with mock.patch(
+            "django_measurement.utils._new_measure", side_effect=AssertionError
+        ), mock.patch(
+            "django_measurement.importers.get_measurement", side_effect=AssertionError
+        ):
+            bulk_import(MeasurementTestModel, rows)
+
+        assert saved("measurement_speed_mph")[3] == measures.Speed(mph=3)
+
+    def test_bare_unit(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance")
+
+        with mock.patch.object(field, "bare_unit", "km"):
+            importer = BulkImporter(MeasurementTestModel)
+
+        assert importer.units["measurement_distance"] == "km"
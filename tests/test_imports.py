@@ -0,0 +1,41 @@
+import pytest
+
+from tests.importtime import import_times
+
+HEAVY_MODULES = {
+    "sympy",
+    "measurement.base",
+    "measurement.measures",
+    "numpy",
+    "django_measurement.forms",
+}
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "django_measurement.models",
+        "django_measurement.querysets",
+        "django_measurement.aggregates",
+        "django_measurement.importers",
+        "django_measurement.codecs",
+    ],
+)
+def test_heavy_modules_are_not_imported(module):
+    times = import_times(module)
+
+    assert module in times
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_app_setup():
+    times = import_times(setup=True)
+
+    assert not HEAVY_MODULES & set(times)
+
+
+def test_measures_are_imported_on_first_use():
+    times = import_times("django_measurement.models", "measurement.measures")
+
+    assert "sympy" in times
+    assert "django_measurement.forms" not in times
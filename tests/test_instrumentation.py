@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+from django.test import override_settings
+from measurement import measures
+
+from django_measurement import forms, instrumentation, utils
+from django_measurement.models import FixedPointMeasurementField, MeasurementField
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+LABEL = "tests.models.MeasurementTestModel.%s"
+
+
+@pytest.fixture
+def rows():
+    MeasurementTestModel.objects.bulk_create(
+        MeasurementTestModel(measurement_distance=measures.Distance(mi=i))
+        for i in range(1, 4)
+    )
+
+
+class TestProfile:
+    def test_from_db_value(self, rows):
+        with instrumentation.profile() as stats:
+            list(MeasurementTestModel.objects.only("measurement_distance"))
+
+        timing = stats.by_field()[LABEL % "measurement_distance"]["from_db_value"]
+        assert timing.count == 3
+        assert timing.seconds > 0
+        assert stats.by_measure()[measures.Distance]["from_db_value"].count == 3
+
+    def test_to_python_and_get_measurement(self):
+        field = MeasurementTestModel._meta.get_field("measurement_weight")
+
+        with instrumentation.profile() as stats:
+            field.to_python(2.0)
+            utils.get_measurement(measures.Speed, 1.0, "mph")
+
+        assert stats.by_field()[LABEL % "measurement_weight"]["to_python"].count == 1
+        by_measure = stats.by_measure()
+        assert by_measure[measures.Weight]["get_measurement"].count == 1
+        assert by_measure[measures.Speed]["get_measurement"].count == 1
+
+    def test_compress(self):
+        field = forms.MeasurementField(measures.Distance)
+
+        with instrumentation.profile() as stats:
+            field.clean(["2.0", "mi"])
+
+        by_measure = stats.by_measure()
+        assert by_measure[measures.Distance]["compress"].count == 1
+        assert by_measure[measures.Distance]["get_measurement"].count == 1
+
+    def test_super_calls_are_counted_once(self):
+        field = FixedPointMeasurementField(measurement=measures.Weight, name="w")
+
+        with instrumentation.profile() as stats:
+            field.from_db_value(1000000, None, None)
+
+        assert stats.by_field()["w"]["from_db_value"].count == 1
+
+    def test_nested(self):
+        with instrumentation.profile() as outer:
+            utils.get_measurement(measures.Distance, 1.0)
+            with instrumentation.profile() as inner:
+                utils.get_measurement(measures.Distance, 1.0)
+
+        assert outer.by_measure()[measures.Distance]["get_measurement"].count == 2
+        assert inner.by_measure()[measures.Distance]["get_measurement"].count == 1
+
+    def test_other_threads_are_not_recorded(self):
+        thread = threading.Thread(
+            target=lambda: utils.get_measurement(measures.Distance, 1.0)
+        )
+
+        with instrumentation.profile() as stats:
+            thread.start()
+            thread.join()
+
+        assert stats.by_measure() == {}
+
+    def test_methods_are_restored(self):
+        from_db_value = MeasurementField.__dict__["from_db_value"]
+        get_measurement = utils.get_measurement
+
+        with instrumentation.profile():
+            assert MeasurementField.__dict__["from_db_value"] is not from_db_value
+            assert utils.get_measurement is not get_measurement
+
+        assert MeasurementField.__dict__["from_db_value"] is from_db_value
+        assert utils.get_measurement is get_measurement
+
+
+class TestSetting:
+    def test_setting(self, rows):
+        instrumentation.stats.reset()
+        assert not instrumentation.is_enabled()
+
+        with override_settings(MEASUREMENT_INSTRUMENTATION=True):
+            assert instrumentation.is_enabled()
+            list(MeasurementTestModel.objects.only("measurement_distance"))
+
+        assert not instrumentation.is_enabled()
+        by_field = instrumentation.stats.by_field()
+        assert by_field[LABEL % "measurement_distance"]["from_db_value"].count == 3
+
+        instrumentation.stats.reset()
+        assert instrumentation.stats.by_field() == {}
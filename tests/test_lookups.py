@@ -0,0 +1,152 @@
+import re
+
+import pytest
+from django.core.exceptions import FieldError
+from measurement import measures
+
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+COLUMN = '"tests_measurementtestmodel"."measurement_distance"'
+
+
+def where(queryset):
+    return str(queryset.query).split(" WHERE ", 1)[1]
+
+
+def assert_plain_column(sql):
+    # Only the bare column may appear on the left hand side: no arithmetic
+    # or function calls that would have to be evaluated per row.
+    assert COLUMN in sql
+    assert "*" not in sql
+    assert not re.search(r"\w\(", sql)
+
+
+class TestUnitLookups:
+    @pytest.mark.parametrize(
+        "lookup, value, count, bound",
+        [
+            ("measurement_distance__gte_km", 2, 2, ">= 2000.0"),
+            ("measurement_distance__gt_km", 2, 1, "> 2000.0"),
+            ("measurement_distance__lte_km", 2, 2, "<= 2000.0"),
+            ("measurement_distance__lt_m", 2000, 1, "< 2000.0"),
+            ("measurement_distance__exact_km", 3, 1, "= 3000.0"),
+        ],
+    )
+    def test_comparison(self, rows, lookup, value, count, bound):
+        queryset = MeasurementTestModel.objects.filter(**{lookup: value})
+
+        assert queryset.count() == count
+        sql = where(queryset)
+        assert_plain_column(sql)
+        assert "%s %s" % (COLUMN, bound) in sql
+
+    def test_alias(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__gte_kilometer=2
+        )
+
+        assert queryset.count() == 2
+
+    def test_bidimensional(self, rows):
+        queryset = MeasurementTestModel.objects.filter(measurement_speed__gt_kph=15)
+
+        assert queryset.count() == 2
+
+    def test_measure_ignores_unit(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__gte_mi=measures.Distance(km=2)
+        )
+
+        assert queryset.count() == 2
+
+    def test_in(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__in_km=[1, 3, 5]
+        )
+
+        assert queryset.count() == 2
+        sql = where(queryset)
+        assert_plain_column(sql)
+        assert "IN (1000.0, 3000.0, 5000.0)" in sql
+
+    def test_range(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__range_km=(1.5, 3)
+        )
+
+        assert queryset.count() == 2
+        sql = where(queryset)
+        assert_plain_column(sql)
+        assert "BETWEEN 1500.0 AND 3000.0" in sql
+
+    def test_unknown_unit(self, rows):
+        with pytest.raises(FieldError):
+            MeasurementTestModel.objects.filter(measurement_distance__gte_parsec=1)
+
+    def test_unknown_operator(self, rows):
+        with pytest.raises(FieldError):
+            MeasurementTestModel.objects.filter(measurement_distance__foo_km=1)
+
+
+class TestBetween:
+    def test_measures(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__between=(
+                measures.Distance(km=1.5),
+                measures.Distance(mi=2),
+            )
+        )
+
+        assert queryset.count() == 2
+        sql = where(queryset)
+        assert_plain_column(sql)
+        assert "BETWEEN 1500.0 AND 3218.688" in sql
+
+    def test_unit(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__between_km=(0, 1)
+        )
+
+        assert queryset.count() == 1
+
+
+class TestIn:
+    def test_mixed_units(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__in=[
+                measures.Distance(km=1),
+                measures.Distance(m=2000),
+                3000.0,
+                None,
+            ]
+        )
+
+        assert queryset.count() == 3
+        sql = where(queryset)
+        assert_plain_column(sql)
+        assert "IN (1000.0, 2000.0, 3000.0)" in sql
+
+    def test_none_is_dropped(self, rows):
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__in_km=[1, None]
+        )
+
+        assert queryset.query.where.children[0].rhs == [1000.0]
+        assert queryset.count() == 1
+
+    def test_subquery(self, rows):
+        subquery = (
+            MeasurementTestModel.objects.filter(measurement_distance__gte_km=2)
+            .order_by("-measurement_distance")
+            .values("measurement_distance")
+        )
+
+        queryset = MeasurementTestModel.objects.filter(
+            measurement_distance__in=subquery
+        )
+
+        assert queryset.count() == 2
@@ -0,0 +1,112 @@
+import pickle
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from measurement import measures
+
+from django_measurement import parallel, utils
+from django_measurement.parallel import (
+    ConversionPlan,
+    convert_parallel,
+    get_conversion_plan,
+)
+from django_measurement.utils import convert_many
+
+VALUES = [i / 7 for i in range(1000)]
+
+
+class TestConversionPlan:
+    def test_linear(self):
+        plan = get_conversion_plan(measures.Distance, "mi", "km")
+
+        assert plan.is_linear
+        assert plan.measure is None
+        assert pickle.loads(pickle.dumps(plan)) == plan
+
+    def test_affine(self):
+        plan = get_conversion_plan(measures.Temperature, "c", "f")
+        values = array("d", VALUES)
+
+        plan.apply(memoryview(values))
+
+        assert not plan.is_linear
+        assert values == convert_many(measures.Temperature, VALUES, "c", "f")
+
+    @pytest.mark.parametrize("numpy", [True, False], ids=["numpy", "python"])
+    def test_apply(self, monkeypatch, numpy):
+        if not numpy:
+            monkeypatch.setattr(utils, "np", None)
+        values = array("d", VALUES)
+
+        get_conversion_plan(measures.Distance, "mi", "km").apply(memoryview(values))
+
+        assert values == convert_many(measures.Distance, VALUES, "mi", "km")
+
+    def test_apply_not_linear(self):
+        plan = ConversionPlan(None, None, None, measures.Temperature, "c", "f")
+        values = array("d", VALUES)
+
+        plan.apply(memoryview(values))
+
+        assert not plan.is_linear
+        assert values == convert_many(measures.Temperature, VALUES, "c", "f")
+
+
+class TestConvertParallel:
+    @pytest.mark.parametrize(
+        "measure, from_unit, to_unit",
+        [
+            (measures.Distance, None, "mi"),
+            (measures.Temperature, "c", "f"),
+            (measures.Speed, "mph", "kph"),
+        ],
+    )
+    def test_same_as_convert_many(self, measure, from_unit, to_unit):
+        result = convert_parallel(
+            measure, VALUES, from_unit, to_unit, workers=2, shard_size=300
+        )
+
+        assert result == convert_many(measure, VALUES, from_unit, to_unit)
+
+    def test_executor(self):
+        # Threads share the memory map just like processes do.
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            result = convert_parallel(
+                measures.Distance, VALUES, "km", shard_size=100, executor=executor
+            )
+
+        assert result == convert_many(measures.Distance, VALUES, "km")
+
+    def test_numpy(self):
+        np = pytest.importorskip("numpy")
+        values = np.array(VALUES)
+
+        result = convert_parallel(
+            measures.Distance, values[::2], "km", workers=2, shard_size=100
+        )
+
+        assert isinstance(result, np.ndarray)
+        assert list(result) == list(values[::2] * 1000)
+
+    def test_small_input_is_converted_in_process(self, monkeypatch):
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", None)
+
+        result = convert_parallel(measures.Distance, VALUES, "km")
+
+        assert result == convert_many(measures.Distance, VALUES, "km")
+
+    @pytest.mark.parametrize("shard_size", [100, None])
+    def test_generator(self, shard_size):
+        result = convert_parallel(
+            measures.Distance,
+            (value for value in VALUES),
+            "km",
+            workers=2,
+            shard_size=shard_size,
+        )
+
+        assert result == convert_many(measures.Distance, VALUES, "km")
+
+    def test_empty(self):
+        assert convert_parallel(measures.Distance, []) == array("d")
@@ -0,0 +1,98 @@
+import pytest
+
+from django_measurement.querysets import MeasurementQuerySet
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+class TestAsUnits:
+    def test_units(self, measurement_rows):
+        result = list(
+            measurement_rows.as_units(
+                measurement_distance="mi", measurement_speed_mph="kph"
+            )
+        )
+
+        expected = [
+            (
+                (
+                    None
+                    if obj.measurement_distance is None
+                    else obj.measurement_distance.mi
+                ),
+                obj.measurement_speed_mph.kph,
+            )
+            for obj in measurement_rows
+        ]
+        assert [row[0] for row in result] == [row[0] for row in expected]
+        assert [row[1] for row in result] == pytest.approx([row[1] for row in expected])
+
+    def test_default_units(self, measurement_rows):
+        result = list(
+            measurement_rows.as_units("id", "measurement_speed_mph", chunk_size=2)
+        )
+
+        assert [row[0] for row in result] == [obj.id for obj in measurement_rows]
+        assert [row[1] for row in result] == pytest.approx(list(range(5)))
+
+    def test_nonlinear_unit(self, measurement_rows):
+        result = list(measurement_rows.as_units(measurement_temperature="c", flat=True))
+
+        assert result == pytest.approx(list(range(5)))
+
+    def test_all_measurement_fields(self, measurement_rows):
+        row = next(measurement_rows.as_units(named=True))
+
+        assert row.measurement_speed_mph == 0.0
+        assert row.measurement_weight is None
+
+    def test_flat(self, measurement_rows):
+        result = list(measurement_rows.as_units(measurement_distance="km", flat=True))
+
+        assert result == [0.0, 1.0, None, 3.0, 4.0]
+
+    def test_flat_with_many_fields(self, measurement_rows):
+        with pytest.raises(TypeError):
+            measurement_rows.as_units("id", "measurement_distance", flat=True)
+
+    def test_flat_and_named(self, measurement_rows):
+        with pytest.raises(TypeError):
+            measurement_rows.as_units("measurement_distance", flat=True, named=True)
+
+    def test_filtered(self, measurement_rows):
+        result = list(
+            measurement_rows.filter(measurement_distance__gte_km=3).as_units(
+                "measurement_distance", flat=True
+            )
+        )
+
+        assert result == [3000.0, 4000.0]
+
+    def test_queryset_class(self):
+        assert isinstance(MeasurementTestModel.objects.all(), MeasurementQuerySet)
+
+
+class TestRawMeasurements:
+    def test_raw(self, measurement_rows):
+        result = list(measurement_rows.raw_measurements("id", "measurement_distance"))
+
+        assert result == [
+            (
+                obj.id,
+                (
+                    None
+                    if obj.measurement_distance is None
+                    else obj.measurement_distance.m
+                ),
+            )
+            for obj in measurement_rows
+        ]
+
+    def test_all_fields(self, measurement_rows):
+        row = next(measurement_rows.raw_measurements(named=True))
+
+        assert row.measurement_speed_mph == 0.0
+        assert row.measurement_temperature == pytest.approx(273.15)
@@ -0,0 +1,258 @@
+import sys
+from array import array
+
+import pytest
+from measurement import measures
+from sympy import S, Symbol, sqrt
+
+from django_measurement import utils
+from tests.custom_measure_base import Temperature
+
+SU = Temperature.SU
+EPSILON = sys.float_info.epsilon
+
+
+@pytest.fixture
+def conversion_cache():
+    utils.clear_conversion_cache()
+    yield
+    utils.clear_conversion_cache()
+
+
+@pytest.mark.parametrize(
+    "measure, value, unit, original_unit",
+    [
+        (measures.Distance, 2.5, "km", None),
+        (measures.Distance, 2.5, "km", "mi"),
+        (measures.Distance, 2.5, "kilometer", "MI"),
+        (measures.Weight, 3, "lb", "kg"),
+        (measures.Speed, 65.0, "mi__hr", None),
+        (measures.Speed, 65.0, "m__s", "mi__hr"),
+        (measures.Speed, 65.0, "mph", "km__hr"),
+        (measures.Temperature, 20.0, "c", None),
+        (measures.Temperature, 293.15, "k", "f"),
+        (Temperature, 20.0, "c", "k"),
+    ],
+)
+def test_get_measurement_matches_measure(measure, value, unit, original_unit):
+    expected = measure(**{unit: value})
+    if original_unit:
+        expected.unit = original_unit
+    if isinstance(expected, measures.Speed):
+        expected.reference.value = 1
+
+    m = utils.get_measurement(measure, value, unit, original_unit)
+
+    assert type(m) is measure
+    assert m.standard == expected.standard
+    assert m.unit == expected.unit
+    assert m.value == expected.value
+
+
+class TestConversionCache:
+    def test_resolves_alias(self, conversion_cache):
+        conversion = utils.get_conversion(measures.Distance, "kilometer")
+
+        assert conversion.unit == "km"
+        assert conversion.factor == 1000.0
+        assert conversion.to_standard(2.0) == 2000.0
+        assert conversion.from_standard(2000.0) == 2.0
+
+    def test_bidimensional(self, conversion_cache):
+        conversion = utils.get_conversion(measures.Speed, "kph")
+
+        assert conversion.unit == "km__hr"
+        assert conversion.primary.unit == "km"
+        assert conversion.reference.unit == "hr"
+        assert conversion.factor == 1000.0 / 3600.0
+
+    def test_affine_symbolic_units(self, conversion_cache):
+        celsius = utils.get_conversion(Temperature, "c")
+        fahrenheit = utils.get_conversion(measures.Temperature, "fahrenheit")
+
+        assert celsius.is_linear
+        assert (celsius.factor, celsius.offset) == (1.0, 273.15)
+        assert fahrenheit.unit == "f"
+        assert fahrenheit.to_standard(-40.0) == pytest.approx(233.15)
+        assert fahrenheit.from_standard(373.15) == pytest.approx(212.0)
+        assert utils.get_conversion(Temperature, "k").offset == 0.0
+
+    @pytest.mark.parametrize(
+        "expression",
+        [SU**2, SU * Symbol("other"), S(2), sqrt(SU)],
+        ids=str,
+    )
+    def test_non_affine_symbolic_units(self, expression):
+        assert utils._affine_coefficients(Temperature, expression) == (None, 0.0)
+
+    def test_counters(self, conversion_cache):
+        utils.get_measurement(measures.Weight, 1.0, "lb")
+        utils.get_measurement(measures.Weight, 2.0, "lb")
+
+        info = utils.conversion_cache_info()
+        assert info.misses == 1
+        assert info.hits == 1
+
+    def test_eviction(self, conversion_cache):
+        maxsize = utils.conversion_cache_info().maxsize
+        pairs = [
+            (measure, unit)
+            for measure in (
+                measures.Distance,
+                measures.Volume,
+                measures.Weight,
+                measures.Energy,
+                measures.Voltage,
+                measures.Time,
+                measures.Frequency,
+                measures.Pressure,
+                measures.Current,
+            )
+            for unit in measure.get_units()
+        ]
+        assert len(pairs) > maxsize
+
+        for measure, unit in pairs:
+            utils.get_conversion(measure, unit)
+
+        assert utils.conversion_cache_info().currsize == maxsize
+
+    def test_size_setting(self, settings, conversion_cache):
+        settings.MEASUREMENT_CONVERSION_CACHE_SIZE = 3
+
+        assert utils.conversion_cache_info().maxsize == 3
+        assert utils.get_conversion(measures.Weight, "lb").unit == "lb"
+
+        settings.MEASUREMENT_CONVERSION_CACHE_SIZE = 5
+
+        assert utils.conversion_cache_info().maxsize == 5
+
+
+class TestConvertMany:
+    @pytest.fixture(params=[True, False], ids=["numpy", "python"])
+    def numpy(self, request, monkeypatch):
+        if not request.param:
+            monkeypatch.setattr(utils, "np", None)
+        elif utils.np is None:
+            pytest.skip("NumPy is not installed")
+        return request.param
+
+    def test_linear(self, numpy):
+        result = utils.convert_many(measures.Distance, [1000.0, 2500.0], "m", "km")
+
+        assert isinstance(result, array)
+        assert list(result) == [1.0, 2.5]
+
+    def test_buffer_and_iterator(self, numpy):
+        values = array("d", [1.0, 2.0])
+
+        assert list(utils.convert_many(measures.Distance, values, "km")) == [
+            1000.0,
+            2000.0,
+        ]
+        assert list(
+            utils.convert_many(measures.Distance, memoryview(values), "km")
+        ) == [1000.0, 2000.0]
+        assert list(
+            utils.convert_many(measures.Distance, iter(values), "km", "km")
+        ) == [1.0, 2.0]
+
+    def test_bidimensional(self, numpy):
+        result = utils.convert_many(measures.Speed, [10.0], "m__s", "km__hr")
+
+        assert list(result) == pytest.approx([36.0])
+
+    def test_symbolic_units(self, numpy):
+        result = utils.convert_many(measures.Temperature, [273.15, 373.15], "k", "c")
+
+        assert list(result) == pytest.approx([0.0, 100.0])
+
+    @pytest.mark.parametrize("celsius", [-40, 0, 20, 37.5, 100])
+    def test_celsius_to_fahrenheit(self, numpy, celsius):
+        standard = Temperature(c=celsius).standard
+
+        result = utils.convert_many(Temperature, [standard], to_unit="f")
+
+        assert result[0] == Temperature(c=celsius).f
+
+    @pytest.mark.parametrize(
+        "fahrenheit, celsius", [(-40, -40.0), (32, 0.0), (68, 20.0), (212, 100.0)]
+    )
+    def test_fahrenheit_to_celsius(self, numpy, fahrenheit, celsius):
+        result = utils.convert_many(Temperature, [fahrenheit], "f", "c")
+
+        assert result[0] == celsius
+
+    @pytest.mark.parametrize("fahrenheit", [-40, 0, 32, 50, 68, 77, 212])
+    def test_fahrenheit_to_standard(self, numpy, fahrenheit):
+        result = utils.convert_many(Temperature, [fahrenheit], "f")
+
+        assert result[0] == Temperature(f=fahrenheit).standard
+
+    def test_fahrenheit_grid(self, numpy):
+        standard = [
+            Temperature(c=value / 4.0).standard for value in range(-400, 4001, 7)
+        ]
+
+        result = utils.convert_many(Temperature, standard, to_unit="f")
+
+        for value, converted in zip(standard, result):
+            expected = Temperature(k=value).f
+            # Two ulps of the scaled value at most.
+            assert abs(converted - expected) <= 2 * EPSILON * abs(value * 1.8)
+
+    def test_numpy_array(self):
+        np = pytest.importorskip("numpy")
+
+        result = utils.convert_many(measures.Weight, np.array([1.0, 2.0]), "kg", "g")
+
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [1000.0, 2000.0]
+
+
+class TestMeasureInfo:
+    @pytest.mark.parametrize(
+        "measure, value, unit",
+        [
+            (measures.Distance, 2500.0, "km"),
+            (measures.Distance, 2500.0, None),
+            (measures.Weight, 3.0, "lb"),
+            (measures.Speed, 29.0, "mi__hr"),
+            (measures.Speed, 29.0, "kph"),
+            (measures.Speed, 29.0, None),
+            (measures.Temperature, 293.15, "c"),
+            (Temperature, 293.15, "f"),
+        ],
+    )
+    def test_from_standard_matches_get_measurement(self, measure, value, unit):
+        expected = utils.get_measurement(measure, value, original_unit=unit)
+
+        m = utils.get_measure_info(measure, unit).from_standard(value)
+
+        assert type(m) is measure
+        assert m.standard == expected.standard
+        assert m.unit == expected.unit
+        assert m.value == expected.value
+
+    def test_resolved(self):
+        info = utils.get_measure_info(measures.Speed, "kph")
+
+        assert info.measure is measures.Speed
+        assert info.standard_unit == "m__s"
+        assert info.default_unit == "kph"
+        assert info.is_bidimensional
+        assert utils.get_measure_info(measures.Speed, "kph") is info
+
+    def test_standard_unit_default(self):
+        info = utils.get_measure_info(measures.Distance)
+
+        assert info.default_unit == "m"
+        assert not info.is_bidimensional
+
+    def test_values_are_independent(self):
+        from_standard = utils.get_measure_info(measures.Speed, "kph").from_standard
+        a, b = from_standard(1.0), from_standard(1.0)
+
+        a.unit = "mi__hr"
+
+        assert b.unit == "km__hr"
@@ -0,0 +1,476 @@
+import copy
+import pickle
+import tracemalloc
+
+import pytest
+from measurement import measures
+
+from django_measurement.models import MeasurementField
+from django_measurement.utils import get_measurement
+from django_measurement.values import (
+    CompactMeasurement,
+    LazyMeasurement,
+    freeze,
+    frozen_class,
+    is_frozen,
+)
+from tests.models import MeasurementTestModel
+
+pytestmark = [
+    pytest.mark.django_db,
+]
+
+
+class TestLazyMeasurement:
+    def test_standard_does_not_materialize(self):
+        value = LazyMeasurement(measures.Distance, 1000.0, unit="km")
+
+        assert value.standard == 1000.0
+        assert not value.is_materialized
+
+    def test_unit_access_materializes(self):
+        value = LazyMeasurement(measures.Distance, 1000.0, unit="km")
+
+        assert value.km == 1.0
+        assert value.unit == "km"
+        assert value.is_materialized
+
+    def test_arithmetic(self):
+        value = LazyMeasurement(measures.Distance, 1000.0)
+
+        assert value + measures.Distance(km=1) == measures.Distance(km=2)
+        assert value - measures.Distance(m=500) == measures.Distance(m=500)
+        assert value * 2 == measures.Distance(km=2)
+        assert 2 * value == measures.Distance(km=2)
+        assert value / 2 == measures.Distance(m=500)
+
+    def test_comparison(self):
+        value = LazyMeasurement(measures.Weight, 1.0)
+
+        assert value == measures.Weight(g=1)
+        assert measures.Weight(g=1) == value
+        assert value < measures.Weight(g=2)
+        assert value <= measures.Weight(g=1)
+        assert value > measures.Weight(mg=1)
+        assert value >= measures.Weight(g=1)
+        assert isinstance(value, measures.Weight)
+
+    def test_copy_and_pickle(self):
+        value = LazyMeasurement(measures.Distance, 5.0)
+
+        copied = copy.deepcopy(value)
+        assert isinstance(copied, LazyMeasurement)
+        assert not copied.is_materialized
+        assert copied == measures.Distance(m=5)
+
+        assert pickle.loads(pickle.dumps(value)) == measures.Distance(m=5)
+
+
+class TestLazyField:
+    def test_retrieval_is_lazy(self):
+        MeasurementTestModel.objects.create(
+            measurement_distance_lazy=measures.Distance(km=2),
+        )
+
+        value = MeasurementTestModel.objects.get().measurement_distance_lazy
+
+        assert type(value) is LazyMeasurement
+        assert not value.is_materialized
+        assert value == measures.Distance(km=2)
+        assert value.unit == "m"
+
+    def test_retrieval_of_bidimensional_measurement(self):
+        original_value = measures.Speed(mph=65)
+        MeasurementTestModel.objects.create(measurement_speed_lazy=original_value)
+
+        value = MeasurementTestModel.objects.get().measurement_speed_lazy
+
+        assert value == original_value
+        assert value.unit == "mi__hr"
+
+    def test_resave_does_not_materialize(self):
+        MeasurementTestModel.objects.create(
+            measurement_distance_lazy=measures.Distance(km=2),
+        )
+
+        instance = MeasurementTestModel.objects.get()
+        instance.save()
+        value = instance.measurement_distance_lazy
+
+        assert not value.is_materialized
+        assert MeasurementTestModel.objects.get(
+            measurement_distance_lazy=measures.Distance(km=2)
+        )
+
+    def test_setting(self, settings):
+        settings.MEASUREMENT_LAZY = True
+        MeasurementTestModel.objects.create(
+            measurement_distance=measures.Distance(km=2),
+        )
+
+        value = MeasurementTestModel.objects.get().measurement_distance
+
+        assert type(value) is LazyMeasurement
+
+    def test_field_option_overrides_setting(self, settings):
+        settings.MEASUREMENT_LAZY = True
+        field = MeasurementTestModel._meta.get_field("measurement_distance_lazy")
+        field.lazy = False
+        try:
+            MeasurementTestModel.objects.create(
+                measurement_distance_lazy=measures.Distance(km=2),
+            )
+            value = MeasurementTestModel.objects.get().measurement_distance_lazy
+        finally:
+            field.lazy = True
+
+        assert type(value) is measures.Distance
+
+    def test_deconstruct(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance_lazy")
+
+        name, path, args, kwargs = field.deconstruct()
+
+        assert kwargs["lazy"] is True
+        assert "lazy" not in (
+            MeasurementTestModel._meta.get_field("measurement_distance").deconstruct()[
+                3
+            ]
+        )
+
+
+class TestCompactMeasurement:
+    def test_unit_attributes(self):
+        value = CompactMeasurement.for_unit(measures.Distance, 1609.344, "mi")
+
+        assert value.standard == 1609.344
+        assert value.mi == 1.0
+        assert value.km == pytest.approx(1.609344)
+        assert value.value == 1.0
+        assert value.unit == "mi"
+        assert value.measure is measures.Distance
+        assert str(value) == "1.0 mi"
+        assert repr(value) == "Distance(mi=1.0)"
+
+    def test_bidimensional(self):
+        value = CompactMeasurement.from_measure(measures.Speed(mph=65))
+
+        assert value.unit == "mi__hr"
+        assert value.mph == pytest.approx(65)
+        assert value.km__hr == pytest.approx(measures.Speed(mph=65).km__hr)
+        assert value.primary.unit == "mi"
+
+    def test_symbolic_units(self):
+        value = CompactMeasurement.for_unit(measures.Temperature, 293.15, "c")
+
+        assert value.c == pytest.approx(20)
+        assert value.f == pytest.approx(68)
+
+    def test_set_unit(self):
+        value = CompactMeasurement.for_unit(measures.Distance, 1000.0)
+        value.unit = "kilometer"
+
+        assert value.unit == "km"
+        assert value.value == 1.0
+
+    def test_comparison(self):
+        value = CompactMeasurement.for_unit(measures.Weight, 1.0)
+
+        assert isinstance(value, measures.Weight)
+        assert value == measures.Weight(g=1)
+        assert measures.Weight(g=1) == value
+        assert value < measures.Weight(g=2)
+        assert measures.Weight(g=2) > value
+        assert value <= CompactMeasurement.for_unit(measures.Weight, 1.0)
+        assert value != measures.Distance(m=1)
+
+    def test_arithmetic(self):
+        value = CompactMeasurement.for_unit(measures.Distance, 1000.0, "km")
+
+        total = value + measures.Distance(km=1)
+        assert type(total) is CompactMeasurement
+        assert total == measures.Distance(km=2)
+        assert total.unit == "km"
+        assert value - measures.Distance(m=500) == measures.Distance(m=500)
+        assert value * 2 == measures.Distance(km=2)
+        assert 2 * value == measures.Distance(km=2)
+        assert value / 2 == measures.Distance(m=500)
+        assert value / measures.Distance(m=500) == 2
+        assert measures.Distance(km=1) + value == measures.Distance(km=2)
+
+        with pytest.raises(TypeError):
+            value + measures.Weight(g=1)
+        with pytest.raises(TypeError):
+            value * measures.Distance(m=1)
+
+    def test_to_measure(self):
+        value = CompactMeasurement.for_unit(measures.Speed, 10.0, "kph")
+
+        measure = value.to_measure()
+
+        assert type(measure) is measures.Speed
+        assert measure.unit == "km__hr"
+        assert measure == value
+
+    def test_pickle(self):
+        value = CompactMeasurement.for_unit(measures.Distance, 5.0, "km")
+
+        restored = pickle.loads(pickle.dumps(value))
+
+        assert type(restored) is CompactMeasurement
+        assert restored.unit == "km"
+        assert restored == value
+
+    def test_unknown_attribute(self):
+        value = CompactMeasurement.for_unit(measures.Distance, 5.0)
+
+        assert not hasattr(value, "resolve_expression")
+
+    def test_memory(self):
+        values = [float(i) for i in range(1000)]
+
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                result = [build(value) for value in values]
+                size, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(result) == len(values)
+            return size
+
+        unit_id = CompactMeasurement.for_unit(measures.Speed, 0.0, "mph").unit_id
+        full = allocated(
+            lambda value: get_measurement(measures.Speed, value, original_unit="mph")
+        )
+        compact = allocated(lambda value: CompactMeasurement(value, unit_id))
+
+        assert compact * 5 < full
+
+
+class TestCompactField:
+    def test_retrieval(self):
+        MeasurementTestModel.objects.create(
+            measurement_distance_compact=measures.Distance(km=2),
+            measurement_speed_compact=measures.Speed(mph=65),
+        )
+
+        instance = MeasurementTestModel.objects.get()
+
+        assert type(instance.measurement_distance_compact) is CompactMeasurement
+        assert instance.measurement_distance_compact.unit == "km"
+        assert instance.measurement_distance_compact.value == 2.0
+        assert instance.measurement_speed_compact == measures.Speed(mph=65)
+        assert instance.measurement_speed_compact.unit == "mi__hr"
+
+    def test_resave(self):
+        MeasurementTestModel.objects.create(
+            measurement_distance_compact=measures.Distance(km=2),
+        )
+
+        instance = MeasurementTestModel.objects.get()
+        instance.save()
+
+        assert MeasurementTestModel.objects.filter(
+            measurement_distance_compact=measures.Distance(km=2)
+        ).exists()
+
+    def test_lazy_and_compact(self):
+        with pytest.raises(TypeError):
+            MeasurementField(measurement=measures.Distance, lazy=True, compact=True)
+
+
+class TestFrozenMeasurement:
+    def test_freeze(self):
+        value = freeze(measures.Distance(km=2))
+
+        assert is_frozen(value)
+        assert isinstance(value, measures.Distance)
+        assert type(value) is frozen_class(measures.Distance)
+        assert value.__class__ is measures.Distance
+        assert value == measures.Distance(km=2)
+        assert value.unit == "km"
+        assert value.mi == measures.Distance(km=2).mi
+        assert repr(value) == "Distance(km=2.0)"
+        assert freeze(value) is value
+
+    def test_read_only(self):
+        value = freeze(measures.Distance(km=2))
+
+        for name in ("unit", "value", "standard", "km", "anything"):
+            with pytest.raises(AttributeError):
+                setattr(value, name, 1)
+        with pytest.raises(AttributeError):
+            del value.unit
+
+        assert value == measures.Distance(km=2)
+
+    def test_bidimensional(self):
+        value = freeze(measures.Speed(mph=65))
+
+        with pytest.raises(AttributeError):
+            value.primary.unit = "km"
+        with pytest.raises(AttributeError):
+            value.unit = "km__hr"
+        assert value.kph == measures.Speed(mph=65).kph
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            measures.Temperature(c=20),
+            measures.Speed(mph=65),
+            LazyMeasurement(measures.Distance, 1000.0, unit="km"),
+            CompactMeasurement.for_unit(measures.Distance, 1000.0, "km"),
+        ],
+        ids=["temperature", "speed", "lazy", "compact"],
+    )
+    def test_arithmetic_returns_regular_measures(self, value):
+        frozen = freeze(value)
+
+        total = frozen + frozen
+        assert total == value * 2
+        assert not is_frozen(total)
+        assert not is_frozen(frozen * 2)
+        assert frozen / 2 == value / 2
+
+    def test_in_place_operators(self):
+        frozen = freeze(measures.Distance(km=2))
+        value = frozen
+
+        value += measures.Distance(km=1)
+        value *= 2
+
+        assert value == measures.Distance(km=6)
+        assert not is_frozen(value)
+        assert frozen == measures.Distance(km=2)
+
+    def test_copies_are_mutable(self):
+        frozen = freeze(measures.Speed(mph=65))
+
+        for value in (copy.copy(frozen), copy.deepcopy(frozen)):
+            value.unit = "km__hr"
+            assert not is_frozen(value)
+            assert not is_frozen(value.primary)
+            assert value == frozen
+        assert frozen.unit == "mi__hr"
+
+    def test_pickle(self):
+        frozen = freeze(measures.Distance(km=2))
+
+        restored = pickle.loads(pickle.dumps(frozen))
+
+        assert not is_frozen(restored)
+        assert type(restored) is measures.Distance
+        assert restored == frozen
+        assert restored.unit == "km"
+        restored.unit = "mi"
+
+
+class TestInternedField:
+    @pytest.fixture
+    def field(self):
+        field = MeasurementTestModel._meta.get_field("measurement_distance_interned")
+        field.clear_intern_cache()
+        return field
+
+    def test_retrieval(self, field):
+        for km in (1, 2, 1, 1):
+            MeasurementTestModel.objects.create(
+                measurement_distance_interned=measures.Distance(km=km)
+            )
+
+        values = [
+            obj.measurement_distance_interned
+            for obj in MeasurementTestModel.objects.order_by("pk")
+        ]
+
+        assert values == [measures.Distance(km=km) for km in (1, 2, 1, 1)]
+        assert all(is_frozen(value) and value.unit == "km" for value in values)
+        assert values[0] is values[2] is values[3]
+        assert values[0] is not values[1]
+
+        info = field.intern_cache_info()
+        assert (info.hits, info.misses, info.currsize) == (2, 2, 2)
+        assert info.maxsize == 1024
+        assert info.hit_rate == 0.5
+
+    def test_resave(self, field):
+        MeasurementTestModel.objects.create(
+            measurement_distance_interned=measures.Distance(km=2)
+        )
+
+        instance = MeasurementTestModel.objects.get()
+        instance.measurement_distance_interned += measures.Distance(km=1)
+        instance.save()
+
+        assert MeasurementTestModel.objects.filter(
+            measurement_distance_interned=measures.Distance(km=3)
+        ).exists()
+        assert field.get_interned(2000.0) == measures.Distance(km=2)
+
+    def test_eviction(self):
+        field = MeasurementTestModel._meta.get_field("measurement_speed_interned")
+        field.clear_intern_cache()
+
+        for mph in (1, 2, 3, 1):
+            field.get_interned(measures.Speed(mph=mph).standard)
+
+        info = field.intern_cache_info()
+        assert (info.hits, info.misses, info.maxsize, info.currsize) == (0, 4, 2, 2)
+        assert field.get_interned(measures.Speed(mph=1).standard).unit == "mi__hr"
+
+    def test_units(self, field):
+        assert field.get_interned(1000.0, "mi") is field.get_interned(1000.0, "mi")
+        assert field.get_interned(1000.0, "mi").unit == "mi"
+        assert field.get_interned(1000.0).unit == "km"
+
+    def test_negative_zero(self, field):
+        field.get_interned(0.0)
+
+        assert str(field.get_interned(-0.0).value) == "-0.0"
+        assert str(field.get_interned(0.0).value) == "0.0"
+
+    def test_cache_size_setting(self, settings):
+        settings.MEASUREMENT_INTERN_CACHE_SIZE = 3
+        field = MeasurementField(measurement=measures.Distance, interned=True)
+
+        assert field.intern_cache_info().maxsize == 3
+
+    def test_deconstruct(self):
+        field = MeasurementTestModel._meta.get_field("measurement_speed_interned")
+
+        assert field.deconstruct()[3]["interned"] == 2
+
+    def test_interned_and_lazy(self):
+        with pytest.raises(TypeError):
+            MeasurementField(measurement=measures.Distance, lazy=True, interned=True)
+        with pytest.raises(TypeError):
+            MeasurementField(measurement=measures.Distance, compact=True, interned=True)
+
+    def test_memory(self, field):
+        # A low cardinality column: a sensor stuck at a handful of values.
+        MeasurementTestModel.objects.bulk_create(
+            MeasurementTestModel(
+                measurement_distance_km=measures.Distance(km=i % 5 + 1),
+                measurement_distance_interned=measures.Distance(km=i % 5 + 1),
+            )
+            for i in range(2000)
+        )
+        queryset = MeasurementTestModel.objects.all()
+
+        def allocated(name):
+            rows = queryset.values_list(name, flat=True).iterator(chunk_size=500)
+            tracemalloc.start()
+            try:
+                result = list(rows)
+                size, _ = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            assert len(result) == 2000
+            return size
+
+        full = allocated("measurement_distance_km")
+        interned = allocated("measurement_distance_interned")
+
+        assert interned * 5 < full
+        assert field.intern_cache_info().hit_rate > 0.99